@@ -0,0 +1,136 @@
+"""
+Benchmark: /voting/active for 5k concurrent students.
+
+--concurrent students (spread over every department) load their active
+elections at once, in-process, --rounds times. Reports requests/sec and
+p50/p99 latency with the active election index, and with the query it
+replaced run per request (department filter plus candidate and department
+joinedloads, in worker threads). Authentication is warmed first so both
+runs measure only the election lookup.
+
+Usage: python benchmarks/bench_active_elections.py [--students 10000] [--concurrent 5000] [--rounds 3]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# 5k requests at once would otherwise mostly queue in (or be shed by) admission control
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))] if values else 0.0
+
+
+async def run_phase(app, headers: List[Dict], rounds: int) -> Dict:
+    latencies: List[float] = []
+
+    async def one(client, h):
+        start = time.perf_counter()
+        response = await client.get("/voting/active", headers=h)
+        assert response.status_code == 200, response.text
+        latencies.append(time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(one(client, h) for h in headers))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--concurrent", type=int, default=5000, help="students requesting at once")
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    from benchmarks.bench_api import setup_database
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_active.db')}"
+        # Room for every worker thread of the per-request run
+        os.environ.setdefault("DB_POOL_SIZE", "64")
+        print(f"Generating {args.students} students...")
+        setup_database(os.environ["DATABASE_URL"], args.students, 1, 0, 0)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        from sqlalchemy import or_
+        from sqlalchemy.orm import defer, joinedload
+        from starlette.concurrency import run_in_threadpool
+
+        from database import SessionLocal
+        from main import app
+        from models import Candidate, Election, ElectionStatus, User, UserRole
+        from routers import voting
+        from routers.auth import create_access_token
+        from routers.elections import DEFAULT_CANDIDATE_FIELDS, DEPARTMENT_FIELDS, ELECTION_FIELDS
+        from services.serialization import dumps, project
+
+        with SessionLocal() as db:
+            students = (
+                db.query(User.id).filter(User.role == UserRole.STUDENT)
+                .order_by(User.department_id, User.id).limit(args.concurrent).all()
+            )
+            departments = db.query(User.department_id).distinct().count()
+            active = db.query(Election).filter(Election.status == ElectionStatus.ACTIVE).count()
+        headers = [{"Authorization": f"Bearer {create_access_token({'sub': str(s.id)})}"} for s in students]
+
+        def query_per_request(department_id):
+            """The lookup before the index: one filtered, joined query per request"""
+            with SessionLocal() as db:
+                query = db.query(Election).options(
+                    joinedload(Election.candidates).options(defer(Candidate.manifesto)),
+                    joinedload(Election.department),
+                ).filter(Election.status == ElectionStatus.ACTIVE)
+                if department_id:
+                    query = query.filter(or_(Election.department_id == None, Election.department_id == department_id))
+                payload = []
+                for election in query.all():
+                    item = project(election, ELECTION_FIELDS)
+                    item["candidates"] = [project(c, DEFAULT_CANDIDATE_FIELDS) for c in election.candidates]
+                    item["department"] = project(election.department, DEPARTMENT_FIELDS) if election.department else None
+                    payload.append(item)
+                return dumps(payload)
+
+        async def per_request(department_id, load):
+            return await run_in_threadpool(query_per_request, department_id)
+
+        print(f"{len(headers)} concurrent students in {departments} departments, {active} active elections, "
+              f"{args.rounds} rounds")
+        # Warm the authenticated-user cache (a few hundred at a time: a cold 5k burst only measures bcrypt-free
+        # user lookups queueing on one event loop)
+        for i in range(0, len(headers), 250):
+            asyncio.run(run_phase(app, headers[i:i + 250], 1))
+        print(f"{'lookup':<13} {'req/s':>8} {'p50':>10} {'p99':>10}")
+        index = voting.active_election_index
+        for name in ("per request", "index"):
+            if name == "per request":
+                index.get = per_request
+            result = asyncio.run(run_phase(app, headers, args.rounds))
+            if name == "per request":
+                del index.get
+            print(f"{name:<13} {result['rps']:>8.1f} {result['p50_ms']:>8.1f}ms {result['p99_ms']:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: vote casting under 5x overload, with and without admission control.
+
+Open-loop load, run in-process: votes arrive at --rate per second (the
+baseline), then again while admin dashboards, club browsing and election
+listings arrive on top, making --overload times the request rate. Latency is
+measured from each request's scheduled arrival, so queueing shows up.
+Reports cast p50/p99 and how much background traffic was served or shed, with
+ADMISSION_ENABLED off and on.
+
+The connection pool is sized far above the load, so the unprotected run
+measures queueing rather than pool exhaustion (see services/admission.py).
+
+Usage: python benchmarks/bench_admission.py [--casts 600] [--rate 50] [--overload 5]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+BACKGROUND_PATHS = [
+    "/dashboard/stats", "/dashboard/turnout", "/dashboard/recent-elections",
+    "/clubs/?limit=50", "/elections/?limit=50",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))] if values else 0.0
+
+
+async def run_phase(app, data: Dict, tokens: List[str], rate: float, overload: int, admin_headers) -> Dict:
+    latencies: List[float] = []
+    outcome = {"cast_errors": 0, "cast_shed": 0, "bg_ok": 0, "bg_shed": 0}
+
+    async def cast(client, i, token, scheduled):
+        response = await client.post(f"/voting/cast/{token}", json={
+            "election_id": data["election_id"],
+            "candidate_id": data["candidate_ids"][i % len(data["candidate_ids"])],
+        })
+        latencies.append(time.perf_counter() - scheduled)
+        if response.status_code == 503:
+            outcome["cast_shed"] += 1
+        elif response.status_code != 200:
+            outcome["cast_errors"] += 1
+
+    async def background(client, i):
+        response = await client.get(BACKGROUND_PATHS[i % len(BACKGROUND_PATHS)], headers=admin_headers)
+        outcome["bg_shed" if response.status_code == 503 else "bg_ok"] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        tasks = []
+        interval = 1 / (rate * overload)
+        start = time.perf_counter()
+        n = 0
+        while n // overload < len(tokens):
+            # Launch every request that is due, however far behind the loop is
+            while n // overload < len(tokens) and start + n * interval <= time.perf_counter():
+                if n % overload == 0:
+                    i = n // overload
+                    tasks.append(asyncio.create_task(cast(client, i, tokens[i], start + n * interval)))
+                else:
+                    tasks.append(asyncio.create_task(background(client, n)))
+                n += 1
+            await asyncio.sleep(max(0.0, start + n * interval - time.perf_counter()))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    outcome.update(
+        casts_per_s=len(latencies) / elapsed,
+        p50_ms=percentile(latencies, 50) * 1000,
+        p99_ms=percentile(latencies, 99) * 1000,
+    )
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--casts", type=int, default=600, help="votes cast per phase")
+    parser.add_argument("--rate", type=float, default=50, help="votes per second")
+    parser.add_argument("--overload", type=int, default=5, help="overloaded request rate as a multiple of --rate")
+    args = parser.parse_args()
+
+    from benchmarks.bench_api import ADMIN_PASSWORD, ADMIN_STUDENT_ID, setup_database
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_admission.db')}"
+        os.environ["DB_POOL_SIZE"] = "500"
+        os.environ.setdefault("ADMISSION_MAX_CONCURRENCY", "15")
+        print(f"Generating {args.students} students...")
+        data = setup_database(os.environ["DATABASE_URL"], args.students, 3 * args.casts, 0, 0)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        from config import settings
+        from main import app
+        from services.admission import admission
+
+        async def login():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+                response = await c.post("/auth/login", json={"student_id": ADMIN_STUDENT_ID, "password": ADMIN_PASSWORD})
+                return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        admin_headers = asyncio.run(login())
+        tokens = data["tokens"]
+        phases = [
+            ("baseline", True, 1),
+            (f"{args.overload}x, admission off", False, args.overload),
+            (f"{args.overload}x, admission on", True, args.overload),
+        ]
+        print(f"{args.casts} casts per phase at {args.rate:g}/s; overload adds "
+              f"{args.rate * (args.overload - 1):g} background requests/s")
+        print(f"{'phase':<20} {'cast p50':>9} {'cast p99':>9} {'casts/s':>8} {'cast 503':>9} "
+              f"{'bg served':>10} {'bg shed':>8} {'limit':>6}")
+        for i, (name, enabled, overload) in enumerate(phases):
+            settings.ADMISSION_ENABLED = enabled
+            admission.limit = float(admission.max_limit)
+            result = asyncio.run(run_phase(
+                app, data, tokens[i * args.casts:(i + 1) * args.casts], args.rate, overload, admin_headers
+            ))
+            print(f"{name:<20} {result['p50_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms {result['casts_per_s']:>8.1f} "
+                  f"{result['cast_shed']:>9} {result['bg_ok']:>10,} {result['bg_shed']:>8,} "
+                  f"{admission.limit if enabled else float('nan'):>6.1f}")
+            assert result["cast_errors"] == 0, f"{result['cast_errors']} casts failed in {name}"
+
+
+if __name__ == "__main__":
+    main()
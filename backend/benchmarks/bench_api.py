@@ -0,0 +1,340 @@
+"""
+Benchmark: end-to-end API load.
+
+Drives the real FastAPI app, either in-process over ASGI (--transport asgi) or
+through a local uvicorn server (--transport uvicorn), against a synthetic SQLite
+database built with seed_load. Runs entirely offline; emails are simulated.
+
+Scenarios: login storm, voting-token validation flood, vote cast flood,
+admin dashboard polling and send-links for whole-campus cohorts. Each reports
+throughput, p50/p95/p99 latency, errors and (in-process only) DB queries per
+request, written as JSON to --output.
+
+With --baseline the run exits non-zero when a scenario regresses beyond
+--tolerance (throughput or p95) or issues more queries per request than the
+baseline; --update-baseline rewrites the baseline from this run instead.
+
+Usage: python benchmarks/bench_api.py [--transport asgi] [--students 20000] [--concurrency 32]
+           [--baseline benchmarks/baselines/api_asgi.json] [--update-baseline] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence
+
+import httpx
+
+# Add backend directory to path
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(BACKEND_DIR)
+os.environ.setdefault("SECRET_KEY", "benchmark")
+# All requests come from one address; the limiter is measured by bench_rate_limit.py
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+# The pool is sized to --concurrency, so admission control would shed most dashboard polls;
+# it is measured under overload by bench_admission.py
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+ADMIN_STUDENT_ID = "bench-admin"
+ADMIN_PASSWORD = "bench-admin-password"
+
+
+@dataclass
+class Scenario:
+    name: str
+    requests: int
+    send: Callable  # (client, i) -> awaitable httpx.Response
+    ok: Sequence[int] = (200,)
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def setup_database(url: str, students: int, cast_voters: int, cohorts: int, seed: int) -> Dict:
+    """Build the synthetic dataset plus the elections and tokens the scenarios use"""
+    from sqlalchemy import insert
+
+    from database import create_db_engine
+    from migrate import run_migrations
+    from models import Candidate, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue
+    from routers.auth import get_password_hash
+    from seed_load import generate
+
+    engine = create_db_engine(url)
+    run_migrations(engine)
+    generate(engine, students=students, elections=6, clubs=50, seed=seed, anchor=datetime.utcnow())
+
+    now = datetime.utcnow()
+    election_id = uuid.uuid4()
+    candidate_ids = [uuid.uuid4() for _ in range(3)]
+    cohort_ids = [uuid.uuid4() for _ in range(cohorts)]
+    tokens = [f"bench-{i}-{uuid.uuid4().hex}" for i in range(cast_voters)]
+
+    with engine.begin() as conn:
+        conn.execute(insert(User.__table__).values(
+            id=uuid.uuid4(), student_id=ADMIN_STUDENT_ID, email="bench-admin@campusvote.edu",
+            password_hash=get_password_hash(ADMIN_PASSWORD), name="Bench Admin",
+            role=UserRole.ADMIN, created_at=now,
+        ))
+        # One campus-wide election for the validate/cast floods, plus fresh ones for send-links
+        elections = [{"id": election_id, "title": "Benchmark Election"}] + [
+            {"id": cohort_id, "title": f"Benchmark Cohort {i}"} for i, cohort_id in enumerate(cohort_ids)
+        ]
+        conn.execute(insert(Election.__table__), [
+            dict(e, department_id=None, status=ElectionStatus.ACTIVE, start_date=now - timedelta(hours=1),
+                 end_date=now + timedelta(days=1), batch_size=60, created_at=now)
+            for e in elections
+        ])
+        conn.execute(insert(Candidate.__table__), [
+            {"id": c, "election_id": election_id, "name": f"Bench Candidate {i}", "role": "President",
+             "vote_count": 0, "position": i}
+            for i, c in enumerate(candidate_ids)
+        ])
+        voter_ids = [
+            row[0] for row in conn.exec_driver_sql(
+                "SELECT id FROM users WHERE role = 'STUDENT' LIMIT ?", (cast_voters,)
+            ).all()
+        ]
+        conn.execute(insert(VotingQueue.__table__), [
+            {"id": uuid.uuid4(), "election_id": election_id, "user_id": uuid.UUID(bytes=user_id),
+             "status": QueueStatus.NOTIFIED, "voting_token": token, "batch_number": 1,
+             "notified_at": now, "expires_at": now + timedelta(days=1), "created_at": now}
+            for user_id, token in zip(voter_ids, tokens)
+        ])
+    engine.dispose()
+
+    return {
+        "election_id": str(election_id),
+        "candidate_ids": [str(c) for c in candidate_ids],
+        "cohort_ids": [str(c) for c in cohort_ids],
+        "tokens": tokens[:len(voter_ids)],
+    }
+
+
+def build_scenarios(data: Dict, args, admin_headers: Dict) -> List[Scenario]:
+    tokens = data["tokens"]
+    candidates = data["candidate_ids"]
+    dashboard_paths = ["/dashboard/stats", "/dashboard/turnout", "/dashboard/recent-elections"]
+
+    return [
+        Scenario(
+            "login_storm", args.logins,
+            lambda c, i: c.post("/auth/login", json={"student_id": f"L{i % args.students:07d}", "password": "password123"}),
+        ),
+        Scenario(
+            "validate_flood", len(tokens),
+            lambda c, i: c.get(f"/voting/validate/{tokens[i]}"),
+        ),
+        Scenario(
+            "cast_flood", len(tokens),
+            lambda c, i: c.post(f"/voting/cast/{tokens[i]}", json={
+                "election_id": data["election_id"], "candidate_id": candidates[i % len(candidates)],
+            }),
+        ),
+        Scenario(
+            "dashboard_polling", args.polls,
+            lambda c, i: c.get(dashboard_paths[i % len(dashboard_paths)], headers=admin_headers),
+        ),
+        Scenario(
+            "send_links", len(data["cohort_ids"]),
+            lambda c, i: c.post("/voting/send-links", headers=admin_headers, json={
+                "election_id": data["cohort_ids"][i], "batch_size": 60,
+            }),
+        ),
+    ]
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, concurrency: int,
+                       query_counter: Optional[Dict]) -> Dict:
+    latencies: List[float] = []
+    errors = 0
+    pending = iter(range(scenario.requests))
+
+    async def worker():
+        nonlocal errors
+        for i in pending:
+            start = time.perf_counter()
+            response = await scenario.send(client, i)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code not in scenario.ok:
+                errors += 1
+
+    queries_before = query_counter["count"] if query_counter else 0
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, scenario.requests) or 1)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    result = {
+        "requests": scenario.requests,
+        "errors": errors,
+        "throughput_rps": round(scenario.requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": None,
+    }
+    if query_counter and scenario.requests:
+        result["queries_per_request"] = round((query_counter["count"] - queries_before) / scenario.requests, 2)
+    return result
+
+
+def count_queries(engines) -> Dict:
+    """Count statements executed on the given engines"""
+    from sqlalchemy import event
+
+    counter = {"count": 0}
+
+    def after_cursor_execute(*_):
+        counter["count"] += 1
+
+    for engine in set(engines):
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    return counter
+
+
+def start_uvicorn(env: Dict, workers: int) -> (subprocess.Popen, str):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning", "--no-access-log"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(base_url + "/").status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def run_all(args, data: Dict) -> Dict:
+    query_counter = None
+    process = None
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.transport == "asgi":
+        import database
+        from main import app
+
+        query_counter = count_queries([database.engine, database.replica_engine])
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", limits=limits)
+    else:
+        process, base_url = start_uvicorn(dict(os.environ), args.workers)
+        client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60)
+
+    results = {}
+    try:
+        login = await client.post("/auth/login", json={"student_id": ADMIN_STUDENT_ID, "password": ADMIN_PASSWORD})
+        login.raise_for_status()
+        admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        for scenario in build_scenarios(data, args, admin_headers):
+            results[scenario.name] = await run_scenario(client, scenario, args.concurrency, query_counter)
+            print(f"{scenario.name:<18} " + "  ".join(
+                f"{key}={value}" for key, value in results[scenario.name].items()
+            ))
+    finally:
+        await client.aclose()
+        if process:
+            process.terminate()
+            process.wait()
+    return results
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Regressions of results against a stored baseline"""
+    regressions = []
+    for name, base in baseline["scenarios"].items():
+        current = results.get(name)
+        if current is None:
+            regressions.append(f"{name}: missing from this run")
+            continue
+        if current["errors"] > base["errors"]:
+            regressions.append(f"{name}: {current['errors']} errors (baseline {base['errors']})")
+        if current["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {current['throughput_rps']} rps (baseline {base['throughput_rps']})")
+        if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {current['p95_ms']} ms (baseline {base['p95_ms']})")
+        if base.get("queries_per_request") is not None and current.get("queries_per_request") is not None \
+                and current["queries_per_request"] > base["queries_per_request"] + 0.01:
+            regressions.append(
+                f"{name}: {current['queries_per_request']} queries/request (baseline {base['queries_per_request']})"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--students", type=int, default=20_000)
+    parser.add_argument("--voters", type=int, default=1000, help="tokens for the validate/cast floods")
+    parser.add_argument("--logins", type=int, default=50, help="logins in the storm (bcrypt bound)")
+    parser.add_argument("--polls", type=int, default=600, help="dashboard requests")
+    parser.add_argument("--cohorts", type=int, default=5, help="send-links requests, each for a new election")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed relative slowdown")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Must be set before the app (and its engines) is imported. Requests hold
+        # their sessions until teardown, and an async handler that waits on an
+        # exhausted pool blocks the event loop, so the pools must cover the
+        # concurrency (a request can hold both a read and a write connection).
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_api.db')}"
+        os.environ["DB_POOL_SIZE"] = str(args.concurrency)
+        os.environ["DB_MAX_OVERFLOW"] = str(args.concurrency)
+        print(f"Generating {args.students} students...")
+        data = setup_database(os.environ["DATABASE_URL"], args.students, args.voters, args.cohorts, args.seed)
+        logging.getLogger().setLevel(logging.WARNING)
+        results = asyncio.run(run_all(args, data))
+
+    report = {
+        "transport": args.transport,
+        "config": {key: getattr(args, key) for key in ("students", "voters", "logins", "polls", "cohorts", "concurrency")},
+        "scenarios": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline and args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+    elif args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark: an election opening, with and without request coalescing.
+
+--voters students validate their voting token all at once, in-process, in
+bursts of --burst concurrent requests. (/voting/active is served from the
+active election index instead; see bench_active_elections.py.)
+Reports throughput, p50/p99 latency, how many election loads ran and the
+coalescing ratio (share of requests that joined a load already in flight),
+with coalescing off (every request loads for itself, in the same worker
+threads) and on.
+
+Usage: python benchmarks/bench_coalesce.py [--students 10000] [--voters 2000] [--burst 200]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import httpx
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+
+def percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))] if values else 0.0
+
+
+async def run_phase(app, paths: List[str], burst: int) -> Dict:
+    latencies: List[float] = []
+
+    async def one(client, path):
+        start = time.perf_counter()
+        response = await client.get(path)
+        assert response.status_code == 200, response.text
+        latencies.append(time.perf_counter() - start)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        start = time.perf_counter()
+        for i in range(0, len(paths), burst):
+            await asyncio.gather(*(one(client, path) for path in paths[i:i + burst]))
+        elapsed = time.perf_counter() - start
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--voters", type=int, default=2000)
+    parser.add_argument("--burst", type=int, default=200, help="concurrent requests per burst")
+    args = parser.parse_args()
+
+    from benchmarks.bench_api import setup_database
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_coalesce.db')}"
+        print(f"Generating {args.students} students...")
+        data = setup_database(os.environ["DATABASE_URL"], args.students, args.voters, 0, 0)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        from starlette.concurrency import run_in_threadpool
+
+        import metrics
+        from main import app
+        from routers import voting
+
+        paths = [f"/voting/validate/{token}" for token in data["tokens"]]
+        flights = [voting.election_loads]
+
+        async def uncoalesced(key, load):
+            return await run_in_threadpool(load)
+
+        def counts():
+            return {
+                role: sum(metrics.coalesce_requests.value(load=f.name, role=role) for f in flights)
+                for role in ("leader", "follower")
+            }
+
+        print(f"{args.voters} voters validating their tokens, {args.burst} at a time")
+        print(f"{'coalescing':<11} {'req/s':>8} {'p50':>9} {'p99':>9} {'loads':>7} {'ratio':>6}")
+        for name in ("off", "on"):
+            before = counts()
+            if name == "off":
+                for flight in flights:
+                    flight.do = uncoalesced
+            result = asyncio.run(run_phase(app, paths, args.burst))
+            if name == "off":
+                for flight in flights:
+                    del flight.do
+                loads, ratio = len(paths), 0.0
+            else:
+                after = counts()
+                leaders = after["leader"] - before["leader"]
+                followers = after["follower"] - before["follower"]
+                loads, ratio = leaders, followers / (leaders + followers)
+            print(f"{name:<11} {result['rps']:>8.1f} {result['p50_ms']:>7.1f}ms {result['p99_ms']:>7.1f}ms "
+                  f"{loads:>7,} {ratio:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
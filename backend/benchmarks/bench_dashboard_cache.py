@@ -0,0 +1,121 @@
+"""
+Benchmark: concurrent admin dashboards with stale-while-revalidate caching.
+
+--viewers admins each load the dashboard (stats, turnout, recent elections)
+every --interval seconds for --seconds, in-process, while votes keep landing.
+Reports request latency and how many aggregations ran, with the dashboard
+cache windows set to zero (every request computes; only simultaneous ones
+share a computation) and at --ttl/--stale.
+
+Usage: python benchmarks/bench_dashboard_cache.py [--students 10000] [--viewers 50] [--seconds 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from typing import List
+
+import httpx
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+DASHBOARD_PATHS = ["/dashboard/stats", "/dashboard/turnout", "/dashboard/recent-elections"]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(pct / 100 * len(values)))] if values else 0.0
+
+
+async def run_phase(app, data, tokens, args, admin_headers):
+    latencies: List[float] = []
+    outcomes: Counter = Counter()
+    deadline = time.perf_counter() + args.seconds
+
+    async def viewer(client):
+        await asyncio.sleep(random.uniform(0, args.interval))
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            for path in DASHBOARD_PATHS:
+                sent = time.perf_counter()
+                response = await client.get(path, headers=admin_headers)
+                assert response.status_code == 200, response.text
+                latencies.append(time.perf_counter() - sent)
+                outcomes[response.headers["x-cache"]] += 1
+            await asyncio.sleep(max(0.0, args.interval - (time.perf_counter() - start)))
+
+    async def voter(client):
+        # Keep the aggregates changing, as during an election
+        for i, token in enumerate(tokens):
+            if time.perf_counter() >= deadline:
+                break
+            await client.post(f"/voting/cast/{token}", json={
+                "election_id": data["election_id"],
+                "candidate_id": data["candidate_ids"][i % len(data["candidate_ids"])],
+            })
+            await asyncio.sleep(0.05)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        await asyncio.gather(voter(client), *(viewer(client) for _ in range(args.viewers)))
+    return latencies, outcomes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=10000)
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between dashboard loads per viewer")
+    parser.add_argument("--seconds", type=float, default=20)
+    parser.add_argument("--ttl", type=float, default=10)
+    parser.add_argument("--stale", type=float, default=60)
+    args = parser.parse_args()
+
+    from benchmarks.bench_api import ADMIN_PASSWORD, ADMIN_STUDENT_ID, setup_database
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_dashboard.db')}"
+        print(f"Generating {args.students} students...")
+        votes_per_phase = int(args.seconds / 0.05) + 1
+        data = setup_database(os.environ["DATABASE_URL"], args.students, 2 * votes_per_phase, 0, 0)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        from main import app
+        from services.route_cache import clear_route_caches, route_caches
+
+        async def login():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as c:
+                response = await c.post("/auth/login", json={"student_id": ADMIN_STUDENT_ID, "password": ADMIN_PASSWORD})
+                return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        admin_headers = asyncio.run(login())
+        print(f"{args.viewers} viewers loading {len(DASHBOARD_PATHS)} endpoints every {args.interval:g}s "
+              f"for {args.seconds:g}s")
+        print(f"{'cache':<18} {'requests':>9} {'p50':>8} {'p99':>8} {'aggregations':>13} {'stale':>7}")
+        for i, (ttl, stale) in enumerate([(0, 0), (args.ttl, args.stale)]):
+            for cache in route_caches:
+                cache.ttl, cache.stale = ttl, stale
+            clear_route_caches()
+            tokens = data["tokens"][i * votes_per_phase:(i + 1) * votes_per_phase]
+            latencies, outcomes = asyncio.run(run_phase(app, data, tokens, args, admin_headers))
+            # Misses compute in the request; stale responses each set off at most one refresh
+            aggregations = sum(cache.builds for cache in route_caches)
+            label = "off (ttl 0)" if ttl == 0 else f"ttl {ttl:g}s/stale {stale:g}s"
+            print(f"{label:<18} {len(latencies):>9,} {percentile(latencies, 50) * 1000:>6.1f}ms "
+                  f"{percentile(latencies, 99) * 1000:>6.1f}ms {aggregations:>13,} {outcomes['stale']:>7,}")
+            for cache in route_caches:
+                cache.builds = 0
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: cross-worker cache invalidation latency.
+
+Starts --workers processes, each running its own InvalidationBus against a
+shared SQLite file (as uvicorn workers would), then commits --writes election
+updates from the parent at random offsets and records how long each worker
+takes to see them. Latency is bounded by the poll interval plus the poll query.
+
+Usage: python benchmarks/bench_invalidation.py [--workers 8] [--writes 50] [--poll-ms 250]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, create_db_engine
+from models import Election, ElectionStatus
+from services.invalidation import InvalidationBus
+
+
+def worker(url, poll_ms, ready, events, stop):
+    engine = create_db_engine(url)
+    bus = InvalidationBus(poll_ms)
+    worker_id = os.getpid()
+    bus.subscribe({"elections"}, lambda tables: events.put((worker_id, time.time())))
+    bus.start(engine)
+    time.sleep(2 * poll_ms / 1000 + 0.05)  # first poll is the baseline
+    ready.put(worker_id)
+    stop.wait()
+    bus.stop()
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--writes", type=int, default=50)
+    parser.add_argument("--poll-ms", type=int, default=250)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench_invalidation.db')}"
+        engine = create_db_engine(url)
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(bind=engine)
+        with SessionLocal() as db:
+            election = Election(
+                title="Bench", status=ElectionStatus.PLANNED,
+                start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+            )
+            db.add(election)
+            db.commit()
+            election_id = election.id
+
+        ctx = multiprocessing.get_context("fork" if sys.platform != "win32" else "spawn")
+        ready, events, stop = ctx.Queue(), ctx.Queue(), ctx.Event()
+        processes = [
+            ctx.Process(target=worker, args=(url, args.poll_ms, ready, events, stop))
+            for _ in range(args.workers)
+        ]
+        for p in processes:
+            p.start()
+        for _ in processes:
+            ready.get(timeout=30)
+
+        print(f"{args.workers} workers polling every {args.poll_ms} ms, {args.writes} writes")
+        latencies, worst = [], []
+        statuses = [ElectionStatus.ACTIVE, ElectionStatus.PLANNED]
+        for i in range(args.writes):
+            # Random phase relative to the workers' poll ticks
+            time.sleep(random.uniform(0, args.poll_ms / 1000))
+            with SessionLocal() as db:
+                db.get(Election, election_id).status = statuses[i % 2]
+                db.commit()
+                written = time.time()
+            seen = {}
+            while len(seen) < args.workers:
+                worker_id, at = events.get(timeout=10 + args.poll_ms / 1000)
+                seen.setdefault(worker_id, at - written)
+            latencies.extend(seen.values())
+            worst.append(max(seen.values()))
+
+        stop.set()
+        for p in processes:
+            p.join()
+        engine.dispose()
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"per-worker latency: p50 {quantiles[49] * 1000:.1f} ms, p95 {quantiles[94] * 1000:.1f} ms, "
+          f"max {max(latencies) * 1000:.1f} ms")
+    print(f"all {args.workers} workers invalidated: median {statistics.median(worst) * 1000:.1f} ms, "
+          f"max {max(worst) * 1000:.1f} ms")
+    print(f"poll load: {args.workers * 1000 / args.poll_ms:.0f} version queries/s across workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: response size and latency of club listings with pagination and projection.
+
+Usage: python benchmarks/bench_listing.py [--clubs 10000] [--members 200] [--users 20000]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from main import app
+from database import Base, get_read_db
+from models import Club, ClubMember, ClubStatus, MemberRole, User, UserRole
+from routers.auth import get_current_user
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def setup(db_url, num_clubs, members_per_club, num_users, seed=42):
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    rng = np.random.default_rng(seed)
+    now = datetime.utcnow()
+
+    user_ids = [uuid.uuid4() for _ in range(num_users)]
+    club_ids = [uuid.uuid4() for _ in range(num_clubs)]
+    with engine.begin() as conn:
+        conn.execute(User.__table__.insert(), [
+            {
+                "id": user_id,
+                "student_id": f"S{i:06d}",
+                "email": f"s{i:06d}@campusvote.edu",
+                "password_hash": "x",
+                "name": f"Student {i}",
+                "role": UserRole.STUDENT,
+                "created_at": now,
+            }
+            for i, user_id in enumerate(user_ids)
+        ])
+        conn.execute(Club.__table__.insert(), [
+            {
+                "id": club_id,
+                "name": f"Club {i:05d}",
+                "category": "tech",
+                "description": "An example club description " * 4,
+                "status": ClubStatus.ACTIVE,
+                "member_count": min(members_per_club, num_users),
+                "created_at": now,
+            }
+            for i, club_id in enumerate(club_ids)
+        ])
+        for club_id in club_ids:
+            members = rng.choice(num_users, size=min(members_per_club, num_users), replace=False)
+            conn.execute(ClubMember.__table__.insert(), [
+                {
+                    "id": uuid.uuid4(),
+                    "club_id": club_id,
+                    "user_id": user_ids[m],
+                    "role": MemberRole.MEMBER,
+                    "joined_at": now - timedelta(minutes=j),
+                }
+                for j, m in enumerate(members)
+            ])
+    return engine, club_ids
+
+
+def measure(client, url, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.text
+        size = len(response.content)
+    return size, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clubs", type=int, default=10_000)
+    parser.add_argument("--members", type=int, default=200)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench_listing.db')}"
+        print(f"Generating {args.clubs} clubs x {args.members} members...")
+        start = time.perf_counter()
+        engine, club_ids = setup(db_url, args.clubs, args.members, args.users)
+        print(f"Setup took {time.perf_counter() - start:.2f}s")
+
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_read_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: User(id=uuid.uuid4(), role=UserRole.STUDENT)
+        client = TestClient(app)
+
+        club_id = club_ids[0]
+        scenarios = [
+            ("clubs: full list", "/clubs/"),
+            ("clubs: limit=50", "/clubs/?limit=50"),
+            ("clubs: limit=50 + fields", "/clubs/?limit=50&fields=name,member_count"),
+            ("club: all members", f"/clubs/{club_id}"),
+            ("club: limit=50", f"/clubs/{club_id}?limit=50"),
+            ("club: limit=50 + fields", f"/clubs/{club_id}?limit=50&fields=role,user.name"),
+        ]
+        print(f"{'scenario':<28} {'bytes':>12} {'median':>10}")
+        for name, url in scenarios:
+            size, latency = measure(client, url, args.repeat)
+            print(f"{name:<28} {size:>12,} {latency * 1000:>8.1f}ms")
+
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
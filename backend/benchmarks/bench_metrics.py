@@ -0,0 +1,155 @@
+"""
+Benchmark: Prometheus instrumentation overhead on the vote cast path.
+
+Casts votes through the in-process app with instrumentation on and off,
+alternating rounds so drift in SQLite/WAL state hits both sides equally.
+"Off" removes RequestMetricsMiddleware and turns the vote counter and pool
+checkout histogram into no-ops. Also times the instrumentation alone around
+a no-op ASGI app, which isolates its cost from request-to-request noise.
+
+Exits non-zero if the isolated instrumentation cost exceeds --budget (percent
+of the median cast latency).
+
+Usage: python benchmarks/bench_metrics.py [--casts 3000] [--rounds 10] [--budget 2.0]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import httpx
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+
+@contextmanager
+def instrumentation(enabled: bool):
+    """Temporarily replace the cast path's metric calls with no-ops"""
+    import metrics
+
+    if enabled:
+        yield
+        return
+    originals = (metrics.votes_cast.inc, metrics.pool_checkout_wait.observe)
+    metrics.votes_cast.inc = lambda *a, **kw: None
+    metrics.pool_checkout_wait.observe = lambda *a, **kw: None
+    try:
+        yield
+    finally:
+        metrics.votes_cast.inc, metrics.pool_checkout_wait.observe = originals
+
+
+def build_apps():
+    """The app's middleware stack with and without RequestMetricsMiddleware"""
+    import metrics
+    from main import app
+
+    instrumented = app.build_middleware_stack()
+    user_middleware = app.user_middleware
+    app.user_middleware = [m for m in user_middleware if m.cls is not metrics.RequestMetricsMiddleware]
+    bare = app.build_middleware_stack()
+    app.user_middleware = user_middleware
+    return instrumented, bare
+
+
+async def cast_round(asgi_app, data, tokens) -> float:
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=asgi_app), base_url="http://bench") as client:
+        start = time.perf_counter()
+        for i, token in enumerate(tokens):
+            response = await client.post(f"/voting/cast/{token}", json={
+                "election_id": data["election_id"],
+                "candidate_id": data["candidate_ids"][i % len(data["candidate_ids"])],
+            })
+            response.raise_for_status()
+        return (time.perf_counter() - start) / len(tokens)
+
+
+async def isolated_cost(iterations: int) -> float:
+    """Seconds per request spent in the instrumentation around a no-op app"""
+    import metrics
+
+    route = type("Route", (), {"path": "/voting/cast/{token}"})()
+
+    async def noop_app(scope, receive, send):
+        scope["route"] = route
+        metrics.votes_cast.inc(election_id="bench")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/voting/cast/x"}
+    wrapped = metrics.RequestMetricsMiddleware(noop_app)
+
+    async def bare_app(scope, receive, send):
+        scope["route"] = route
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    timings = {}
+    for name, target in (("bare", bare_app), ("wrapped", wrapped)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await target(dict(scope), None, send)
+        timings[name] = (time.perf_counter() - start) / iterations
+    # Pool checkout timing adds one observe per request
+    start = time.perf_counter()
+    for _ in range(iterations):
+        metrics.pool_checkout_wait.observe(0.0001, pool="bench")
+    observe = (time.perf_counter() - start) / iterations
+    return timings["wrapped"] - timings["bare"] + observe
+
+
+async def run(args, data):
+    instrumented, bare = build_apps()
+    tokens = data["tokens"]
+    per_round = len(tokens) // (2 * args.rounds)
+    samples = {"on": [], "off": []}
+    for r in range(args.rounds):
+        # Alternate which side goes first each round
+        order = [("on", instrumented), ("off", bare)] if r % 2 == 0 else [("off", bare), ("on", instrumented)]
+        for side, (name, asgi_app) in enumerate(order):
+            offset = (2 * r + side) * per_round
+            with instrumentation(name == "on"):
+                samples[name].append(await cast_round(asgi_app, data, tokens[offset:offset + per_round]))
+    return samples, await isolated_cost(args.iterations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--casts", type=int, default=3000, help="total votes cast, split across both sides")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=100_000, help="no-op requests for the isolated cost")
+    parser.add_argument("--budget", type=float, default=2.0, help="max instrumentation cost, percent of a cast")
+    args = parser.parse_args()
+
+    from benchmarks.bench_api import setup_database
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_metrics.db')}"
+        print(f"Generating {args.students} students...")
+        data = setup_database(os.environ["DATABASE_URL"], args.students, args.casts, 0, 0)
+        logging.getLogger().setLevel(logging.WARNING)
+        samples, cost = asyncio.run(run(args, data))
+
+    on = statistics.median(samples["on"])
+    off = statistics.median(samples["off"])
+    print(f"cast latency, instrumented:   {on * 1000:.3f} ms (median of {args.rounds} rounds)")
+    print(f"cast latency, uninstrumented: {off * 1000:.3f} ms")
+    print(f"end-to-end difference:        {(on / off - 1) * 100:+.2f}% (includes run-to-run noise)")
+    share = cost / off * 100
+    print(f"isolated instrumentation:     {cost * 1e6:.2f} us/request = {share:.3f}% of a cast (budget {args.budget}%)")
+    if share > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: ranked-choice counting engine (IRV / STV) on synthetic ballots.
+
+Usage: python benchmarks/bench_ranked.py [--ballots 200000] [--candidates 15] [--seats 3]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from services.ranked_service import BLANK, build_ballot_matrix, count_irv, count_stv
+from services.tally_service import encode_choices
+
+
+def _rank(rng, num_ballots, log_weights, max_len):
+    """Plackett-Luce rankings via the Gumbel trick, truncated to random lengths"""
+    scores = log_weights + rng.gumbel(size=(num_ballots, len(log_weights)))
+    order = np.argsort(-scores, axis=1).astype(np.int32)
+    lengths = rng.integers(1, max_len + 1, size=num_ballots)
+    order[np.arange(order.shape[1]) >= lengths[:, None]] = BLANK
+    return order
+
+
+def uniform(rng, n, c):
+    return _rank(rng, n, np.zeros(c), c)
+
+
+def zipf(rng, n, c):
+    return _rank(rng, n, -np.log(np.arange(1, c + 1)), c)
+
+
+def polarized(rng, n, c):
+    bloc = np.log(np.linspace(1.0, 0.05, c))
+    half = n // 2
+    return np.vstack([_rank(rng, half, bloc, c), _rank(rng, n - half, bloc[::-1], c)])
+
+
+def truncated(rng, n, c):
+    return _rank(rng, n, -np.log(np.arange(1, c + 1)) / 2, 3)
+
+
+DISTRIBUTIONS = {
+    "uniform": uniform,
+    "zipf": zipf,
+    "polarized": polarized,
+    "truncated": truncated,
+}
+
+
+def pack(matrix):
+    """Encode a ranking matrix as stored ballots"""
+    return [encode_choices(row[row != BLANK]) for row in matrix]
+
+
+def timed(fn, *args, repeat=3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ballots", type=int, default=200_000)
+    parser.add_argument("--candidates", type=int, default=15)
+    parser.add_argument("--seats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    positions = list(range(args.candidates))
+    print(f"{args.ballots} ballots, {args.candidates} candidates, {args.seats} STV seats")
+    print(f"{'distribution':<12} {'decode':>10} {'irv':>10} {'rounds':>7} {'stv':>10} {'rounds':>7}")
+
+    for name, generate in DISTRIBUTIONS.items():
+        ballots = pack(generate(rng, args.ballots, args.candidates))
+        decode_time, matrix = timed(build_ballot_matrix, ballots, positions)
+        irv_time, irv = timed(count_irv, matrix, args.candidates)
+        stv_time, stv = timed(count_stv, matrix, args.candidates, args.seats)
+        print(
+            f"{name:<12} {decode_time * 1000:>8.1f}ms {irv_time * 1000:>8.1f}ms {len(irv['rounds']):>7} "
+            f"{stv_time * 1000:>8.1f}ms {len(stv['rounds']):>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
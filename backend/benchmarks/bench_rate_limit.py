@@ -0,0 +1,176 @@
+"""
+Benchmark: rate limiter overhead and load shedding.
+
+Overhead: times a token-bucket hit in isolation (with --keys live buckets)
+and /voting/validate end to end with limits on and off, alternating rounds.
+
+Shedding: legitimate voters (one IP each) validate and cast their tokens
+while an attacker on one IP floods /voting/validate with guessed tokens,
+replays one token, and guesses a student's password on /auth/login. Reports
+how many attack requests reached the database and how legitimate voters
+fared, with limits on and off (the unlimited run is slow: every password
+guess costs a bcrypt check).
+
+Usage: python benchmarks/bench_rate_limit.py [--voters 200] [--attack 3000] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List
+
+import httpx
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+
+def isolated_cost(keys: int, iterations: int) -> float:
+    """Seconds per MemoryBackend hit with `keys` live buckets"""
+    from services.rate_limit import MemoryBackend
+
+    backend = MemoryBackend(max_keys=keys)
+    names = [f"validate_ip:10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}" for i in range(keys)]
+    for name in names:
+        backend.take(name, 600, 60, time.monotonic())
+    start = time.perf_counter()
+    for i in range(iterations):
+        backend.take(names[i % keys], 600, 60, time.monotonic())
+    return (time.perf_counter() - start) / iterations
+
+
+async def validate_latency(app, tokens: List[str], rounds: int) -> Dict[str, float]:
+    """Median per-request validate latency with limits on and off"""
+    from config import settings
+
+    samples = {True: [], False: []}
+    per_round = len(tokens) // (2 * rounds)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for r in range(rounds):
+            for side, enabled in enumerate((r % 2 == 0, r % 2 == 1)):
+                settings.RATE_LIMIT_ENABLED = enabled
+                chunk = tokens[(2 * r + side) * per_round:(2 * r + side + 1) * per_round]
+                start = time.perf_counter()
+                for token in chunk:
+                    (await client.get(f"/voting/validate/{token}")).raise_for_status()
+                samples[enabled].append((time.perf_counter() - start) / len(chunk))
+    settings.RATE_LIMIT_ENABLED = True
+    return {"on": statistics.median(samples[True]), "off": statistics.median(samples[False])}
+
+
+async def attack_round(app, data: Dict, args) -> Dict:
+    """Legitimate voters and one attacker at once; returns per-side outcomes"""
+    from sqlalchemy import event
+
+    from database import engine, replica_engine
+
+    queries = {"count": 0}
+
+    def count(*_):
+        queries["count"] += 1
+
+    for e in {engine, replica_engine}:
+        event.listen(e, "after_cursor_execute", count)
+
+    legit_latency: List[float] = []
+    outcome = {"legit_ok": 0, "legit_limited": 0, "attack_passed": 0, "attack_limited": 0}
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def legit(i: int, token: str):
+        transport = httpx.ASGITransport(app=app, client=(f"10.1.{i >> 8 & 255}.{i & 255}", 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for request in (
+                lambda: client.get(f"/voting/validate/{token}"),
+                lambda: client.post(f"/voting/cast/{token}", json={
+                    "election_id": data["election_id"], "candidate_id": data["candidate_ids"][i % 3],
+                }),
+            ):
+                async with semaphore:
+                    start = time.perf_counter()
+                    response = await request()
+                    legit_latency.append(time.perf_counter() - start)
+                outcome["legit_limited" if response.status_code == 429 else "legit_ok"] += 1
+
+    async def attacker():
+        transport = httpx.ASGITransport(app=app, client=("203.0.113.66", 40000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            replayed = data["tokens"][0]
+            for i in range(args.attack):
+                kind = i % 3
+                async with semaphore:
+                    if kind == 0:
+                        response = await client.get(f"/voting/validate/guess-{uuid.uuid4().hex}")
+                    elif kind == 1:
+                        response = await client.get(f"/voting/validate/{replayed}")
+                    else:
+                        response = await client.post(
+                            "/auth/login", json={"student_id": "L0000001", "password": f"guess{i}"}
+                        )
+                outcome["attack_limited" if response.status_code == 429 else "attack_passed"] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(attacker(), *(legit(i, t) for i, t in enumerate(data["tokens"][1:args.voters + 1])))
+    outcome["seconds"] = time.perf_counter() - start
+    outcome["queries"] = queries["count"]
+    legit_latency.sort()
+    outcome["legit_p95_ms"] = legit_latency[int(0.95 * (len(legit_latency) - 1))] * 1000
+
+    for e in {engine, replica_engine}:
+        event.remove(e, "after_cursor_execute", count)
+    return outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--voters", type=int, default=200, help="legitimate voters per shedding run")
+    parser.add_argument("--attack", type=int, default=3000, help="attacker requests per shedding run")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=6)
+    parser.add_argument("--keys", type=int, default=100_000, help="live buckets for the isolated cost")
+    args = parser.parse_args()
+
+    from benchmarks.bench_api import setup_database
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench_rate_limit.db')}"
+        needed = 2 * args.voters + 2 + 1200
+        print(f"Generating {args.students} students...")
+        data = setup_database(os.environ["DATABASE_URL"], args.students, needed, 0, 0)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        from config import settings
+        from main import app
+        from services.rate_limit import rate_limiter
+
+        cost = isolated_cost(args.keys, 200_000)
+        latency = asyncio.run(validate_latency(app, data["tokens"][-1200:], args.rounds))
+        print(f"bucket hit ({args.keys:,} keys): {cost * 1e6:.2f} us")
+        print(f"validate latency: {latency['on'] * 1000:.3f} ms with limits, {latency['off'] * 1000:.3f} ms without "
+              f"({(latency['on'] / latency['off'] - 1) * 100:+.1f}%, includes run-to-run noise)")
+
+        print(f"\nshedding: {args.voters} voters (validate + cast) vs {args.attack} attack requests from one IP")
+        print(f"{'limits':<8} {'attack passed':>14} {'attack 429':>11} {'legit ok':>9} {'legit 429':>10} "
+              f"{'legit p95':>10} {'queries':>8} {'time':>7}")
+        voters = data["tokens"][1:]
+        for enabled in (False, True):
+            settings.RATE_LIMIT_ENABLED = enabled
+            rate_limiter.backend.clear()
+            offset = 0 if not enabled else args.voters
+            run_data = dict(data, tokens=[data["tokens"][0]] + voters[offset:offset + args.voters])
+            result = asyncio.run(attack_round(app, run_data, args))
+            print(f"{'on' if enabled else 'off':<8} {result['attack_passed']:>14,} {result['attack_limited']:>11,} "
+                  f"{result['legit_ok']:>9,} {result['legit_limited']:>10,} {result['legit_p95_ms']:>8.1f}ms "
+                  f"{result['queries']:>8,} {result['seconds']:>6.1f}s")
+
+
+if __name__ == "__main__":
+    main()
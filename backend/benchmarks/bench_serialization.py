@@ -0,0 +1,207 @@
+"""
+Benchmark: serializing a large election listing (default 1k elections x 10 candidates).
+
+Compares the old path (ORM objects -> Pydantic from_attributes models ->
+stdlib json) with Pydantic + orjson and with Core rows + orjson, the path the
+listing now uses. Each variant produces the same JSON document (candidate
+manifestos included). Also times GET /elections/ end to end with the response
+cache cleared between runs, and measures bytes on the wire for the summary
+listing and the listing with manifestos, uncompressed, gzip and brotli.
+
+Usage: python benchmarks/bench_serialization.py [--elections 1000] [--candidates 10] [--repeat 5]
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import joinedload, selectinload, sessionmaker
+
+from main import app
+from database import Base, get_read_db
+from models import Candidate, Department, Election, ElectionStatus, User, UserRole
+from routers.auth import get_current_user
+from routers.elections import (
+    CANDIDATE_FIELDS, ELECTION_FIELDS, _load_election_page, election_list_cache,
+)
+from schemas import ElectionWithCandidates
+from services import compression
+
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+MANIFESTO = "We will extend library hours, fund more clubs and publish every budget line. " * 6
+
+
+def setup(db_url, num_elections, candidates_per_election):
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    departments = [
+        {"id": uuid.uuid4(), "code": f"D{i}", "name": f"Department {i}", "total_students": 500}
+        for i in range(10)
+    ]
+    elections = [
+        {
+            "id": uuid.uuid4(),
+            "title": f"Student Council Election {i}",
+            "department_id": departments[i % len(departments)]["id"] if i % 3 else None,
+            "status": ElectionStatus.ACTIVE,
+            "start_date": now,
+            "end_date": now + timedelta(days=1),
+            "batch_size": 60,
+            "created_at": now - timedelta(seconds=i),
+        }
+        for i in range(num_elections)
+    ]
+    with engine.begin() as conn:
+        conn.execute(Department.__table__.insert(), departments)
+        conn.execute(Election.__table__.insert(), elections)
+        conn.execute(Candidate.__table__.insert(), [
+            {
+                "id": uuid.uuid4(),
+                "election_id": e["id"],
+                "name": f"Candidate {j}",
+                "role": "President" if j < 5 else "Treasurer",
+                "photo_url": f"https://cdn.campusvote.edu/photos/{j}.jpg",
+                "manifesto": MANIFESTO,
+                "vote_count": j * 7,
+                "position": j,
+            }
+            for e in elections
+            for j in range(candidates_per_election)
+        ])
+    return engine
+
+
+def load_orm(db):
+    return db.query(Election).options(
+        selectinload(Election.candidates), joinedload(Election.department)
+    ).order_by(Election.created_at.desc(), Election.id.desc()).all()
+
+
+def orm_pydantic_json(db):
+    models = [ElectionWithCandidates.model_validate(e) for e in load_orm(db)]
+    return json.dumps(jsonable_encoder(models)).encode()
+
+
+def orm_pydantic_orjson(db):
+    adapter = TypeAdapter(List[ElectionWithCandidates])
+    return orjson.dumps(adapter.dump_python(adapter.validate_python(load_orm(db), from_attributes=True), mode="json"))
+
+
+FULL_FIELDS = ELECTION_FIELDS + ["department"] + [f"candidates.{f}" for f in CANDIDATE_FIELDS]
+
+
+def core_orjson(db):
+    body, _ = _load_election_page(db, None, None, None, FULL_FIELDS)
+    return body
+
+
+def time_variant(SessionLocal, fn, repeat):
+    timings = []
+    body = b""
+    for _ in range(repeat):
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            body = fn(db)
+            timings.append(time.perf_counter() - start)
+        finally:
+            db.close()
+    return statistics.median(timings), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--elections", type=int, default=1000)
+    parser.add_argument("--candidates", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench_serialization.db')}"
+        print(f"Generating {args.elections} elections x {args.candidates} candidates...")
+        engine = setup(db_url, args.elections, args.candidates)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        variants = [
+            ("ORM + Pydantic + json", orm_pydantic_json),
+            ("ORM + Pydantic + orjson", orm_pydantic_orjson),
+            ("Core rows + orjson", core_orjson),
+        ]
+        results = []
+        for name, fn in variants:
+            results.append((name, *time_variant(SessionLocal, fn, args.repeat)))
+
+        reference = json.loads(results[0][2])
+        print(f"{'variant':<28} {'bytes':>12} {'median':>10} {'speedup':>8}")
+        for name, latency, body in results:
+            assert json.loads(body) == reference, f"{name} produced different JSON"
+            print(f"{name:<28} {len(body):>12,} {latency * 1000:>8.1f}ms {results[0][1] / latency:>7.1f}x")
+
+        def override_get_db():
+            db = SessionLocal()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_read_db] = override_get_db
+        app.dependency_overrides[get_current_user] = lambda: User(id=uuid.uuid4(), role=UserRole.STUDENT)
+        client = TestClient(app)
+        timings = []
+        for _ in range(args.repeat):
+            election_list_cache.clear()
+            start = time.perf_counter()
+            response = client.get("/elections/")
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200
+        print(f"{'GET /elections/ (uncached)':<28} {len(response.content):>12,} "
+              f"{statistics.median(timings) * 1000:>8.1f}ms")
+
+        print_wire_sizes(client)
+
+        app.dependency_overrides.clear()
+        engine.dispose()
+
+
+def print_wire_sizes(client):
+    """Bytes on the wire for GET /elections/ per representation and Accept-Encoding"""
+    encodings = ["identity", "gzip"] + (["br"] if compression.brotli is not None else [])
+    listings = [
+        ("summary (default)", {}),
+        ("with manifestos", {"fields": ",".join(FULL_FIELDS)}),
+    ]
+    baseline = None
+    print(f"\n{'GET /elections/':<28} {'encoding':>10} {'wire bytes':>12} {'vs full':>8} {'time':>9}")
+    for name, params in reversed(listings):
+        for encoding in encodings:
+            start = time.perf_counter()
+            response = client.get("/elections/", params=params, headers={"Accept-Encoding": encoding})
+            elapsed = time.perf_counter() - start
+            assert response.status_code == 200
+            wire = response.num_bytes_downloaded
+            baseline = baseline or wire
+            print(f"{name:<28} {encoding:>10} {wire:>12,} {wire / baseline:>7.1%} {elapsed * 1000:>7.1f}ms")
+    if compression.brotli is None:
+        print("(brotli not installed; pip install brotli to measure br)")
+
+
+if __name__ == "__main__":
+    main()
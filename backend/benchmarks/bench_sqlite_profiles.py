@@ -0,0 +1,157 @@
+"""
+Benchmark: concurrent vote casting under each SQLite profile.
+
+Writer threads call the cast_vote endpoint directly (one session each) while
+reader threads poll the dashboard stats, so lock contention is real.
+Reports votes/sec, lock errors and dashboard reads/sec per profile.
+
+Usage: python benchmarks/bench_sqlite_profiles.py [--voters 2000] [--writers 16] [--readers 4]
+"""
+import argparse
+import asyncio
+import concurrent.futures
+import os
+import secrets
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from fastapi import HTTPException
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, create_db_engine
+from models import Candidate, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue
+from routers.dashboard import get_dashboard_stats
+from routers.voting import cast_vote
+from schemas import VoteCreate
+
+PROFILES = ["default", "tuned"]
+
+
+def setup(SessionLocal, num_voters):
+    db = SessionLocal()
+    election = Election(
+        title="Benchmark Election",
+        status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(),
+        end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db.add(election)
+    db.flush()
+    candidates = [
+        Candidate(election_id=election.id, name=f"Candidate {i}", role="President", position=i)
+        for i in range(4)
+    ]
+    db.add_all(candidates)
+
+    tokens = []
+    for i in range(num_voters):
+        user = User(
+            id=uuid.uuid4(),
+            student_id=f"student_{i}",
+            email=f"student_{i}@example.com",
+            name=f"Student {i}",
+            role=UserRole.STUDENT,
+            password_hash="x",
+        )
+        db.add(user)
+        token = secrets.token_urlsafe(16)
+        db.add(VotingQueue(
+            election_id=election.id,
+            user_id=user.id,
+            status=QueueStatus.NOTIFIED,
+            voting_token=token,
+        ))
+        tokens.append(token)
+    db.commit()
+    ids = (election.id, [c.id for c in candidates])
+    db.close()
+    return ids, tokens
+
+
+def run_profile(profile, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", sqlite_profile=profile)
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        (election_id, candidate_ids), tokens = setup(SessionLocal, args.voters)
+
+        counts = {"ok": 0, "rejected": 0, "locked": 0, "reads": 0, "read_errors": 0}
+        lock = threading.Lock()
+        done = threading.Event()
+
+        def vote(i, token):
+            db = SessionLocal()
+            try:
+                data = VoteCreate(election_id=election_id, candidate_id=candidate_ids[i % len(candidate_ids)])
+                asyncio.run(cast_vote(token, data, db))
+                outcome = "ok"
+            except HTTPException:
+                outcome = "rejected"
+            except OperationalError:
+                db.rollback()
+                outcome = "locked"
+            finally:
+                db.close()
+            with lock:
+                counts[outcome] += 1
+
+        def read():
+            while not done.is_set():
+                db = SessionLocal()
+                try:
+                    asyncio.run(get_dashboard_stats(db=db, admin=None))
+                    outcome = "reads"
+                except OperationalError:
+                    outcome = "read_errors"
+                finally:
+                    db.close()
+                with lock:
+                    counts[outcome] += 1
+
+        readers = [threading.Thread(target=read) for _ in range(args.readers)]
+        for reader in readers:
+            reader.start()
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=args.writers) as executor:
+            list(executor.map(vote, range(len(tokens)), tokens))
+        elapsed = time.perf_counter() - start
+        done.set()
+        for reader in readers:
+            reader.join()
+        engine.dispose()
+
+    return {
+        "votes_per_sec": counts["ok"] / elapsed,
+        "reads_per_sec": counts["reads"] / elapsed,
+        **counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--voters", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.voters} voters, {args.writers} writer threads, {args.readers} dashboard readers")
+    print(f"{'profile':<10} {'votes/s':>9} {'ok':>7} {'locked':>7} {'rejected':>9} {'reads/s':>9} {'read errs':>10}")
+    for profile in PROFILES:
+        r = run_profile(profile, args)
+        print(
+            f"{profile:<10} {r['votes_per_sec']:>9.1f} {r['ok']:>7} {r['locked']:>7} "
+            f"{r['rejected']:>9} {r['reads_per_sec']:>9.1f} {r['read_errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
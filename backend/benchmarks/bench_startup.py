@@ -0,0 +1,115 @@
+"""
+Benchmark: worker cold start.
+
+Measures, in a fresh interpreter, the time to import the app (via
+`python -X importtime`) and the time until the first request is answered.
+Also compares the old per-worker schema step (Base.metadata.create_all, which
+reflects every table) with the check of alembic_version, each on a fresh
+engine against an already migrated database.
+
+Usage: python benchmarks/bench_startup.py [--runs 50]
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from database import Base, check_schema_version, create_db_engine
+from migrate import run_migrations
+
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Imported lazily by the app; a cold start should not load them
+LAZY_MODULES = ("resend", "jose", "bcrypt", "numpy")
+
+COLD_START_SCRIPT = """
+import json, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    client.get("/")
+answered = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_request_ms": (answered - start) * 1000}))
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure_cold_start(database_url: str) -> dict:
+    """
+    Start a fresh interpreter against a migrated database and report import and
+    time-to-first-request in ms, plus every module imported on the way.
+    """
+    env = dict(os.environ, DATABASE_URL=database_url)
+    env.setdefault("SECRET_KEY", "benchmark")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", COLD_START_SCRIPT],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2)) / 1000
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["modules"] = cumulative
+    return timings
+
+
+def time_step(url, step, runs):
+    timings = []
+    for _ in range(runs):
+        engine = create_db_engine(url)
+        start = time.perf_counter()
+        step(engine)
+        timings.append(time.perf_counter() - start)
+        engine.dispose()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench_startup.db')}"
+        engine = create_db_engine(url)
+        start = time.perf_counter()
+        run_migrations(engine)
+        print(f"One-shot migration to head: {(time.perf_counter() - start) * 1000:.1f} ms")
+        engine.dispose()
+
+        cold = measure_cold_start(url)
+        print(f"Import app: {cold['import_ms']:.0f} ms, first request answered at {cold['first_request_ms']:.0f} ms")
+        slowest = sorted(cold["modules"].items(), key=lambda item: item[1], reverse=True)[:10]
+        for module, ms in slowest:
+            print(f"  {module:<40} {ms:>8.1f} ms cumulative")
+        loaded = [m for m in LAZY_MODULES if m in cold["modules"]]
+        print(f"Lazy modules loaded at startup: {', '.join(loaded) or 'none'}")
+
+        steps = [
+            ("create_all (before)", lambda e: Base.metadata.create_all(bind=e)),
+            ("schema version check (after)", check_schema_version),
+        ]
+        print(f"{'startup step':<30} {'median ms':>10} {'p95 ms':>10}")
+        for name, step in steps:
+            timings = sorted(time_step(url, step, args.runs))
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{name:<30} {statistics.median(timings) * 1000:>10.2f} {p95 * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
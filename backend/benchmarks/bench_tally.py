@@ -0,0 +1,159 @@
+"""
+Benchmark: vectorized multi-role tally vs per-role GROUP BY queries.
+
+Usage: python benchmarks/bench_tally.py [--ballots 500000] [--roles 4] [--candidates 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models import Ballot, Candidate, Election, ElectionStatus, GUID
+from services.tally_service import count_positions, encode_choices
+
+# Normalized layout used as the GROUP BY baseline: one row per (ballot, role)
+bench_metadata = MetaData()
+ballot_selections = Table(
+    "bench_ballot_selections",
+    bench_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("election_id", GUID(), nullable=False, index=True),
+    Column("role", String(100), nullable=False),
+    Column("candidate_id", GUID(), nullable=False),
+)
+
+
+def setup(db_url, num_ballots, num_roles, per_role, seed=42):
+    engine = create_engine(db_url)
+    Base.metadata.create_all(bind=engine)
+    bench_metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+
+    election = Election(
+        title="Benchmark Election",
+        status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(),
+        end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db.add(election)
+    db.flush()
+
+    candidates = []
+    for r in range(num_roles):
+        for c in range(per_role):
+            candidates.append(Candidate(
+                election_id=election.id,
+                name=f"Candidate {r}-{c}",
+                role=f"Role {r}",
+                position=len(candidates),
+            ))
+    db.add_all(candidates)
+    db.commit()
+    election_id = election.id
+    candidate_rows = [(c.id, c.role) for c in candidates]
+    db.close()
+
+    # Skewed choices: each role picks its candidates with a Zipf-like distribution
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, per_role + 1)
+    weights /= weights.sum()
+    picks = rng.choice(per_role, size=(num_ballots, num_roles), p=weights)
+    positions = picks + np.arange(num_roles) * per_role
+
+    chunk = 50_000
+    with engine.begin() as conn:
+        for start in range(0, num_ballots, chunk):
+            block = positions[start:start + chunk]
+            conn.execute(Ballot.__table__.insert(), [
+                {
+                    "id": uuid.uuid4(),
+                    "election_id": election_id,
+                    "user_id": uuid.uuid4(),
+                    "choices": encode_choices(row),
+                }
+                for row in block
+            ])
+            conn.execute(ballot_selections.insert(), [
+                {
+                    "election_id": election_id,
+                    "role": candidate_rows[p][1],
+                    "candidate_id": candidate_rows[p][0],
+                }
+                for row in block for p in row
+            ])
+
+    roles = sorted({role for _, role in candidate_rows})
+    return engine, election_id, roles, len(candidate_rows)
+
+
+def bench_vectorized(engine, election_id, num_positions):
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        ballots = conn.execute(
+            select(Ballot.choices).where(Ballot.election_id == election_id)
+        ).scalars().all()
+        counts = count_positions(ballots, num_positions)
+        return time.perf_counter() - start, counts
+
+
+def bench_group_by(engine, election_id, roles):
+    with engine.connect() as conn:
+        start = time.perf_counter()
+        results = {}
+        for role in roles:
+            results[role] = conn.execute(
+                select(ballot_selections.c.candidate_id, func.count())
+                .where(
+                    ballot_selections.c.election_id == election_id,
+                    ballot_selections.c.role == role,
+                )
+                .group_by(ballot_selections.c.candidate_id)
+            ).all()
+        return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ballots", type=int, default=500_000)
+    parser.add_argument("--roles", type=int, default=4)
+    parser.add_argument("--candidates", type=int, default=5, help="Candidates per role")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_url = f"sqlite:///{os.path.join(tmp, 'bench_tally.db')}"
+        print(f"Generating {args.ballots} ballots ({args.roles} roles x {args.candidates} candidates)...")
+        start = time.perf_counter()
+        engine, election_id, roles, num_positions = setup(db_url, args.ballots, args.roles, args.candidates)
+        print(f"Setup took {time.perf_counter() - start:.2f}s")
+
+        vectorized = min(bench_vectorized(engine, election_id, num_positions)[0] for _ in range(args.repeat))
+        group_by = min(bench_group_by(engine, election_id, roles)[0] for _ in range(args.repeat))
+
+        # Both paths must agree
+        _, counts = bench_vectorized(engine, election_id, num_positions)
+        _, grouped = bench_group_by(engine, election_id, roles)
+        assert int(counts.sum()) == sum(n for rows in grouped.values() for _, n in rows)
+
+        print(f"Vectorized single-pass tally: {vectorized * 1000:.1f} ms")
+        print(f"Per-role GROUP BY queries:    {group_by * 1000:.1f} ms")
+        print(f"Speedup: {group_by / vectorized:.2f}x")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: CHAR(36) GUID storage vs 16-byte BLOB storage on SQLite.
+
+Reports table/index size (via dbstat) and the time to hydrate rows with
+three GUID columns, mirroring the votes table.
+
+Usage: python benchmarks/bench_uuid.py [--rows 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+# Add backend directory to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+from sqlalchemy import Column, Index, MetaData, Table, create_engine, select
+from sqlalchemy.types import CHAR, TypeDecorator
+
+from models import GUID
+
+
+class LegacyGUID(TypeDecorator):
+    """The previous string-based GUID implementation"""
+    impl = CHAR
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        return dialect.type_descriptor(CHAR(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is not None:
+            return str(value)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None:
+            return uuid.UUID(value)
+        return value
+
+
+def votes_table(metadata, name, guid_type):
+    table = Table(
+        name,
+        metadata,
+        Column("id", guid_type(), primary_key=True),
+        Column("election_id", guid_type(), nullable=False),
+        Column("user_id", guid_type(), nullable=False),
+        Column("candidate_id", guid_type(), nullable=False),
+    )
+    Index(f"uq_{name}_election_user", table.c.election_id, table.c.user_id, unique=True)
+    return table
+
+
+def storage_bytes(conn, table_name):
+    """(table bytes, index bytes) from the dbstat virtual table"""
+    rows = conn.exec_driver_sql(
+        "SELECT m.type, SUM(s.pgsize) FROM dbstat s JOIN sqlite_master m ON s.name = m.name "
+        "WHERE m.tbl_name = ? GROUP BY m.type",
+        (table_name,),
+    ).all()
+    sizes = dict(rows)
+    return sizes.get("table", 0), sizes.get("index", 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench_uuid.db')}")
+        metadata = MetaData()
+        tables = {
+            "CHAR(36)": votes_table(metadata, "votes_char36", LegacyGUID),
+            "BLOB(16)": votes_table(metadata, "votes_blob16", GUID),
+        }
+        metadata.create_all(engine)
+
+        elections = [uuid.uuid4() for _ in range(10)]
+        candidates = [uuid.uuid4() for _ in range(50)]
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "election_id": elections[i % len(elections)],
+                "user_id": uuid.uuid4(),
+                "candidate_id": candidates[i % len(candidates)],
+            }
+            for i in range(args.rows)
+        ]
+        with engine.begin() as conn:
+            for table in tables.values():
+                conn.execute(table.insert(), rows)
+
+        print(f"{args.rows} rows, 4 GUID columns, PK + unique (election_id, user_id)")
+        print(f"{'storage':<10} {'table':>12} {'indexes':>12} {'hydrate':>10}")
+        with engine.connect() as conn:
+            try:
+                sizes = {label: storage_bytes(conn, table.name) for label, table in tables.items()}
+            except Exception:
+                sizes = {label: (0, 0) for label in tables}
+
+            for label, table in tables.items():
+                best = float("inf")
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    result = conn.execute(select(table)).all()
+                    best = min(best, time.perf_counter() - start)
+                    assert len(result) == args.rows and isinstance(result[0].id, uuid.UUID)
+                table_bytes, index_bytes = sizes[label]
+                print(f"{label:<10} {table_bytes:>12,} {index_bytes:>12,} {best * 1000:>8.1f}ms")
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,70 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./campusvote.db"
     
+    # Read replica for read-only endpoints (dashboard, listings); defaults to the primary
+    DATABASE_REPLICA_URL: Optional[str] = None
+    
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800  # seconds
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite: serve get_read_db from a separate mode=ro pool on the same file
+    SQLITE_READ_WRITE_SPLIT: bool = True
+    
+    # SQLite tuning ("tuned" applies the pragmas below, "default" leaves SQLite defaults)
+    SQLITE_PROFILE: str = "tuned"
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # bytes
+    SQLITE_CACHE_SIZE: int = -64000  # negative = KiB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    
+    # Debug mode adds X-DB-Query-Count / X-DB-Query-Time-Ms headers to every response
+    DEBUG: bool = False
+    
+    # Serve Prometheus metrics at GET /metrics
+    METRICS_ENABLED: bool = True
+    
+    # Sampling profiler: keep collapsed-stack profiles of requests slower than
+    # PROFILER_SLOW_MS, plus a random PROFILER_SAMPLE_RATE fraction of all requests
+    PROFILER_ENABLED: bool = False
+    PROFILER_SLOW_MS: int = 1000
+    PROFILER_SAMPLE_RATE: float = 0.0
+    PROFILER_INTERVAL_MS: int = 5
+    PROFILER_DIR: str = "./profiles"
+    PROFILER_MAX_PROFILES: int = 50
+    
+    # How often each worker checks table versions for writes made by other
+    # workers and clears its in-process caches (0 = only this worker's writes)
+    CACHE_INVALIDATION_POLL_MS: int = 250
+    
+    # How long a request waits for a load it shares with identical concurrent
+    # requests (token validation, active elections) before giving up with 503
+    COALESCE_TIMEOUT_MS: int = 5000
+    
+    # Admin dashboard aggregates: served from cache for TTL seconds, then
+    # served stale for up to STALE seconds more while one refresh runs
+    DASHBOARD_CACHE_TTL_SECONDS: int = 10
+    DASHBOARD_CACHE_STALE_SECONDS: int = 60
+    
+    # Admission control: shed low-priority requests under load (see services/admission.py).
+    # Off by default: with the default pool of 15, background routes (dashboards, clubs,
+    # profiles) are shed from 6 concurrent requests, default routes queue from 9, login from 12
+    ADMISSION_ENABLED: bool = False
+    ADMISSION_MAX_CONCURRENCY: Optional[int] = None  # default: DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_MIN_CONCURRENCY: int = 4
+    ADMISSION_TARGET_LATENCY_MS: int = 500  # vote casting latency the limit adapts to
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 5000
+    
+    # Compress (br/gzip) responses of at least this many bytes
+    COMPRESSION_MIN_BYTES: int = 1024
+    
+    # Browser cache lifetime for candidate manifestos, seconds
+    MANIFESTO_MAX_AGE: int = 3600
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = [
         "http://localhost:5173",
@@ -20,6 +84,26 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     
+    # Threads for bcrypt hashing (login, register); caps CPU spent on password checks
+    BCRYPT_WORKERS: int = 4
+    
+    # Rate limits ("count/second|minute|hour|day"). Per-IP limits are generous
+    # because campus networks put many students behind one address.
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_LOGIN_PER_IP: str = "300/minute"
+    RATE_LIMIT_LOGIN_PER_STUDENT: str = "10/minute"
+    RATE_LIMIT_VALIDATE_PER_IP: str = "600/minute"
+    RATE_LIMIT_VALIDATE_PER_TOKEN: str = "30/minute"
+    RATE_LIMIT_CAST_PER_IP: str = "600/minute"
+    RATE_LIMIT_CAST_PER_TOKEN: str = "10/minute"
+    RATE_LIMIT_MAX_KEYS: int = 100_000  # per worker, least recently used evicted
+    # Share buckets between workers (requires the redis package)
+    RATE_LIMIT_REDIS_URL: Optional[str] = None
+    
+    # Idempotency-Key records for vote casting: retention, and per-worker LRU size
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+    
     # Admin Seed
     ADMIN_EMAIL: str = "admin@campusvote.edu"
     ADMIN_STUDENT_ID: str = "admin"
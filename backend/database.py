@@ -1,16 +1,174 @@
 """Database configuration and session management"""
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, Mapping, Optional
 
+from sqlalchemy import create_engine, event, Insert, Update, Delete
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
+
+import metrics
 from config import settings
 
-# Handle SQLite vs PostgreSQL connection args
-connect_args = {}
-if settings.DATABASE_URL.startswith("sqlite"):
-    connect_args = {"check_same_thread": False}
 
-engine = create_engine(settings.DATABASE_URL, connect_args=connect_args)
+def sqlite_pragmas(profile: Optional[str] = None) -> Dict[str, object]:
+    """PRAGMA settings applied to every new SQLite connection for a profile"""
+    profile = profile or settings.SQLITE_PROFILE
+    if profile == "default":
+        return {}
+    if profile != "tuned":
+        raise ValueError(f"Unknown SQLite profile: {profile}")
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def apply_sqlite_pragmas(engine, pragmas: Dict[str, object]):
+    """Run the given PRAGMAs on each connection as the pool opens it"""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited, labelled by the pool's logging name"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.pool_checkout_wait.observe(
+                time.perf_counter() - start, pool=self._orig_logging_name or "primary"
+            )
+
+
+def pool_options(url: str, name: str = "primary") -> Dict[str, object]:
+    """Connection pool settings from Settings (in-memory SQLite keeps its single-connection pool)"""
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    if ":memory:" not in url and url.rstrip("/") != "sqlite:":
+        options["poolclass"] = TimedQueuePool
+        options["pool_logging_name"] = name
+        options["pool_size"] = settings.DB_POOL_SIZE
+        options["max_overflow"] = settings.DB_MAX_OVERFLOW
+    return options
+
+
+def sqlite_file_path(url: str) -> Optional[str]:
+    """Path of the database file for file-backed SQLite URLs, None otherwise"""
+    if not url.startswith("sqlite:///") or ":memory:" in url:
+        return None
+    path = url[len("sqlite:///"):].split("?", 1)[0]
+    return path or None
+
+
+def create_reader_engine(url: str, sqlite_profile: Optional[str] = None, **kwargs):
+    """
+    Read-only engine on a SQLite file: every pooled connection is opened with
+    mode=ro, so readers never take the write lock.
+    """
+    path = os.path.abspath(sqlite_file_path(url))
+    engine = create_engine(
+        f"sqlite:///file:{path}?mode=ro&uri=true",
+        connect_args={"check_same_thread": False},
+        **kwargs
+    )
+    # journal_mode can only be changed by the writer
+    pragmas = sqlite_pragmas(sqlite_profile)
+    pragmas.pop("journal_mode", None)
+    apply_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def create_db_engine(url: str, sqlite_profile: Optional[str] = None, **kwargs):
+    """Create an engine, applying the SQLite profile for sqlite URLs"""
+    if url.startswith("sqlite"):
+        # Handle SQLite vs PostgreSQL connection args
+        connect_args = {"check_same_thread": False}
+        connect_args.update(kwargs.pop("connect_args", {}))
+        engine = create_engine(url, connect_args=connect_args, **kwargs)
+        apply_sqlite_pragmas(engine, sqlite_pragmas(sqlite_profile))
+        return engine
+    return create_engine(url, **kwargs)
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from the replica and writes to the primary.
+    Once it has flushed or executed a write, every later statement goes to the
+    primary too, so a session always reads its own writes.
+    """
+
+    def __init__(self, *args, primary=None, replica=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.primary = primary
+        self.replica = replica or primary
+        self.wrote = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, (Insert, Update, Delete)):
+            self.wrote = True
+        return self.primary if self.wrote else self.replica
+
+
+# Alembic revision this code expects; bump together with each new migration
+SCHEMA_VERSION = "0005"
+
+
+def check_schema_version(engine) -> None:
+    """Fail fast unless the database is migrated to SCHEMA_VERSION (see migrate.py)"""
+    try:
+        with engine.connect() as conn:
+            current = conn.exec_driver_sql("SELECT version_num FROM alembic_version").scalar()
+    except (OperationalError, ProgrammingError):
+        # No alembic_version table yet
+        current = None
+    if current != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at {current or 'no version'}, expected {SCHEMA_VERSION}. "
+            "Run `python migrate.py` first."
+        )
+
+
+engine = create_db_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL))
+if settings.DATABASE_REPLICA_URL:
+    replica_engine = create_db_engine(
+        settings.DATABASE_REPLICA_URL, **pool_options(settings.DATABASE_REPLICA_URL, "replica")
+    )
+elif settings.SQLITE_READ_WRITE_SPLIT and sqlite_file_path(settings.DATABASE_URL):
+    # Separate read-only pool on the same file; writes stay on `engine`
+    replica_engine = create_reader_engine(settings.DATABASE_URL, **pool_options(settings.DATABASE_URL, "replica"))
+else:
+    replica_engine = engine
+
+# Serializes request writers so contention queues here instead of in SQLITE_BUSY retries.
+# Only SQLite needs it; other databases take concurrent writers.
+write_lock = asyncio.Lock()
+SERIALIZE_WRITES = engine.dialect.name == "sqlite"
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False,
+    primary=engine, replica=replica_engine
+)
 Base = declarative_base()
 
 
@@ -21,3 +179,45 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """Dependency for read-mostly endpoints: replica reads, primary writes"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def dependency_session(dependency: Callable = get_read_db, overrides: Optional[Mapping] = None):
+    """
+    A session from a (sync) session dependency, for loads that outlive or are
+    shared between requests. Pass app.dependency_overrides so tests' sessions apply.
+    """
+    sessions = (overrides or {}).get(dependency, dependency)()
+    try:
+        yield next(sessions)
+    finally:
+        sessions.close()
+
+
+@asynccontextmanager
+async def write_access():
+    """Hold the single-writer lock, on SQLite only. Keep slow non-database work outside it."""
+    if not SERIALIZE_WRITES:
+        yield
+        return
+    async with write_lock:
+        yield
+
+
+async def get_write_db():
+    """Dependency for endpoints that write: holds the write access for the request"""
+    db = SessionLocal()
+    try:
+        async with write_access():
+            yield db
+    finally:
+        db.close()
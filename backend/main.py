@@ -2,13 +2,23 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.orm import Session
 
-from database import engine, Base
-from routers import auth_router, elections_router, voting_router, clubs_router, dashboard_router
-from seed import seed_demo_data
+import metrics
+from database import engine, check_schema_version, get_read_db
+from routers import (
+    auth_router, elections_router, voting_router, clubs_router, dashboard_router, profiles_router
+)
 from config import settings
+from services.admission import AdmissionMiddleware
+from services.compression import CompressionMiddleware
+from services.invalidation import invalidation_bus
+from services.profiler import ProfilerMiddleware
+from services.query_stats import QueryStatsMiddleware
+from services.queue_service import queue_depth_by_status
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -17,41 +27,68 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    logger.info("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    
-    logger.info("Seeding demo data...")
-    seed_demo_data()
+    # Migrations run separately (python migrate.py); workers only verify the version
+    check_schema_version(engine)
+    # Picks up writes from other workers and clears this worker's caches
+    invalidation_bus.start(engine)
     
     yield
     
     logger.info("Shutting down...")
+    invalidation_bus.stop()
 
 
 app = FastAPI(
     title="CampusVote API",
     description="Campus Election Dashboard System",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
 )
 
+# Innermost, so shed requests still get CORS headers and show up in metrics
+app.add_middleware(AdmissionMiddleware)
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.BACKEND_CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    allow_headers=["Content-Type", "Authorization"],
+    allow_headers=["Content-Type", "Authorization", "If-None-Match", "Idempotency-Key"],
+    expose_headers=["ETag", "X-Next-Cursor", "Idempotent-Replayed", "Age", "X-Cache"],
 )
 
+# Per-request query counts and timings
+app.add_middleware(QueryStatsMiddleware)
+
+# Slow-request profiles (no-op unless PROFILER_ENABLED)
+app.add_middleware(ProfilerMiddleware)
+
+# Compress large JSON/text bodies
+app.add_middleware(CompressionMiddleware)
+
+# Outermost, so latency covers every other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.RequestMetricsMiddleware)
+
 # Include routers
 app.include_router(auth_router)
 app.include_router(elections_router)
 app.include_router(voting_router)
 app.include_router(clubs_router)
 app.include_router(dashboard_router)
+app.include_router(profiles_router)
 
 
 @app.get("/")
 async def root():
     return {"message": "CampusVote API", "docs": "/docs"}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics(db: Session = Depends(get_read_db)):
+        """Prometheus metrics in the text exposition format"""
+        for status, count in queue_depth_by_status(db).items():
+            metrics.queue_depth.set(count, status=status.value)
+        return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
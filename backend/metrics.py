@@ -0,0 +1,245 @@
+"""
+Prometheus metrics, rendered in the text exposition format by GET /metrics.
+
+Kept dependency-free: counters, gauges and histograms are plain dicts keyed
+by label values, guarded by one lock each. Gauges can also be computed at
+scrape time from a callback (queue depth, worker pool usage).
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, tuned for sub-millisecond to multi-second requests
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def set_function(self, function: Callable[[], Dict[LabelValues, float]]) -> None:
+        """Compute the gauge at scrape time; `function` returns {label values tuple: value}"""
+        self._function = function
+
+    def samples(self):
+        if self._function is not None:
+            items = list(self._function().items())
+        else:
+            with self._lock:
+                items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [non-cumulative bucket counts..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self):
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+        lines = []
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound)) if bound != float("inf") else "+Inf"}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(m.render() for m in self._metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+request_duration = REGISTRY.register(Histogram(
+    "campusvote_http_request_duration_seconds", "HTTP request latency by route", ["method", "route", "status"]
+))
+requests_in_flight = REGISTRY.register(Gauge(
+    "campusvote_http_requests_in_flight", "HTTP requests currently being handled"
+))
+pool_checkout_wait = REGISTRY.register(Histogram(
+    "campusvote_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection", ["pool"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+))
+votes_cast = REGISTRY.register(Counter(
+    "campusvote_votes_cast_total", "Votes and ranked ballots cast", ["election_id"]
+))
+emails_sent = REGISTRY.register(Counter(
+    "campusvote_emails_sent_total", "Voting emails sent (or logged in simulation mode)"
+))
+email_failures = REGISTRY.register(Counter(
+    "campusvote_email_failures_total", "Voting emails that failed to send"
+))
+queue_depth = REGISTRY.register(Gauge(
+    "campusvote_voting_queue_depth", "Voting queue entries by status", ["status"]
+))
+bcrypt_workers = REGISTRY.register(Gauge(
+    "campusvote_bcrypt_pool_workers", "Password hashing worker threads", ["state"]
+))
+rate_limited = REGISTRY.register(Counter(
+    "campusvote_rate_limited_total", "Requests rejected with 429 by a rate limit", ["limit"]
+))
+admission_in_flight = REGISTRY.register(Gauge(
+    "campusvote_admission_in_flight", "Requests admitted and running, by route class", ["route_class"]
+))
+admission_limit = REGISTRY.register(Gauge(
+    "campusvote_admission_concurrency_limit", "Current adaptive concurrency limit"
+))
+admission_rejected = REGISTRY.register(Counter(
+    "campusvote_admission_rejected_total", "Requests shed with 503 by admission control", ["route_class"]
+))
+route_cache_requests = REGISTRY.register(Counter(
+    "campusvote_route_cache_requests_total", "Cached route responses by outcome (hit, stale, miss)",
+    ["route", "result"]
+))
+coalesce_requests = REGISTRY.register(Counter(
+    "campusvote_coalesce_requests_total",
+    "Callers of coalesced loads: leaders ran the load, followers shared one in flight", ["load", "role"]
+))
+coalesce_timeouts = REGISTRY.register(Counter(
+    "campusvote_coalesce_timeouts_total", "Callers that gave up waiting on a coalesced load", ["load"]
+))
+
+
+class RequestMetricsMiddleware:
+    """Records in-flight requests and per-route latency"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.dec()
+            path = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            request_duration.observe(
+                time.perf_counter() - start, method=scope.get("method", ""), route=path, status=status
+            )
@@ -0,0 +1,55 @@
+"""
+Apply database migrations. Run once per deploy, before starting the API workers.
+
+Databases created by the old create_all-at-startup code have tables but no
+alembic_version; they get their GUID columns converted, are stamped at the
+baseline revision and then upgraded like any other database.
+
+Usage: python migrate.py [revision]   (defaults to head)
+"""
+import logging
+import os
+import sys
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from migrate_guids import migrate_guids
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_REVISION = "0001"
+
+
+def alembic_config(connection=None) -> Config:
+    config = Config(os.path.join(BASE_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BASE_DIR, "migrations"))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    return config
+
+
+def is_legacy_database(engine) -> bool:
+    """True for databases built by create_all, before migrations were tracked"""
+    tables = set(inspect(engine).get_table_names())
+    return "users" in tables and "alembic_version" not in tables
+
+
+def run_migrations(engine, revision: str = "head") -> None:
+    """Bring the database at `engine` up to `revision`"""
+    if is_legacy_database(engine):
+        logger.info("Adopting existing database into migration history...")
+        migrate_guids(engine)
+        with engine.begin() as conn:
+            command.stamp(alembic_config(conn), BASELINE_REVISION)
+    with engine.begin() as conn:
+        command.upgrade(alembic_config(conn), revision)
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    run_migrations(engine, sys.argv[1] if len(sys.argv) > 1 else "head")
@@ -0,0 +1,128 @@
+"""
+Convert GUID columns from CHAR(36) strings to native storage.
+
+PostgreSQL columns become native UUID; SQLite tables are rebuilt with
+16-byte BLOB keys. Safe to re-run: already converted databases are skipped.
+
+Usage: python migrate_guids.py
+"""
+import logging
+import uuid
+
+from sqlalchemy import inspect
+from sqlalchemy.types import String
+
+from database import Base
+from models import GUID
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 10_000
+
+
+def guid_columns(table):
+    return [c.name for c in table.columns if isinstance(c.type, GUID)]
+
+
+def needs_migration(engine) -> bool:
+    """True if GUID columns are still stored as strings"""
+    inspector = inspect(engine)
+    if not inspector.has_table("users"):
+        return False
+    column = next(c for c in inspector.get_columns("users") if c["name"] == "id")
+    return isinstance(column["type"], String)
+
+
+def _to_bytes(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return uuid.UUID(str(value)).bytes
+
+
+def migrate_sqlite(engine):
+    """Rebuild every existing table with BLOB GUIDs, copying rows in batches"""
+    existing = set(inspect(engine).get_table_names())
+    tables = [t for t in Base.metadata.sorted_tables if t.name in existing]
+
+    with engine.begin() as conn:
+        old_columns = {}
+        for table in tables:
+            old_columns[table.name] = [c["name"] for c in inspect(conn).get_columns(table.name)]
+            conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "_old_{table.name}"')
+
+        # Free index names so the new tables can reuse them
+        old_indexes = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name LIKE '\\_old\\_%' ESCAPE '\\' AND sql IS NOT NULL"
+        ).scalars().all()
+        for name in old_indexes:
+            conn.exec_driver_sql(f'DROP INDEX "{name}"')
+
+        Base.metadata.create_all(bind=conn, tables=tables)
+
+        for table in tables:
+            columns = [c.name for c in table.columns if c.name in old_columns[table.name]]
+            guids = set(guid_columns(table))
+            column_list = ", ".join(f'"{c}"' for c in columns)
+            placeholders = ", ".join("?" for _ in columns)
+            result = conn.exec_driver_sql(f'SELECT {column_list} FROM "_old_{table.name}"')
+            copied = 0
+            while True:
+                rows = result.fetchmany(BATCH_SIZE)
+                if not rows:
+                    break
+                converted = [
+                    tuple(_to_bytes(v) if c in guids else v for c, v in zip(columns, row))
+                    for row in rows
+                ]
+                conn.exec_driver_sql(
+                    f'INSERT INTO "{table.name}" ({column_list}) VALUES ({placeholders})',
+                    converted
+                )
+                copied += len(rows)
+            conn.exec_driver_sql(f'DROP TABLE "_old_{table.name}"')
+            logger.info(f"Migrated {copied} rows in {table.name}")
+
+
+def migrate_postgresql(engine):
+    """Convert GUID columns in place; foreign keys are dropped and restored around the change"""
+    inspector = inspect(engine)
+    existing = set(inspector.get_table_names())
+    tables = [t for t in Base.metadata.sorted_tables if t.name in existing]
+    foreign_keys = [(t.name, fk) for t in tables for fk in inspector.get_foreign_keys(t.name)]
+
+    with engine.begin() as conn:
+        for table_name, fk in foreign_keys:
+            conn.exec_driver_sql(f'ALTER TABLE "{table_name}" DROP CONSTRAINT "{fk["name"]}"')
+        for table in tables:
+            for column in guid_columns(table):
+                conn.exec_driver_sql(
+                    f'ALTER TABLE "{table.name}" ALTER COLUMN "{column}" TYPE uuid USING "{column}"::uuid'
+                )
+        for table_name, fk in foreign_keys:
+            local = ", ".join(f'"{c}"' for c in fk["constrained_columns"])
+            remote = ", ".join(f'"{c}"' for c in fk["referred_columns"])
+            conn.exec_driver_sql(
+                f'ALTER TABLE "{table_name}" ADD CONSTRAINT "{fk["name"]}" '
+                f'FOREIGN KEY ({local}) REFERENCES "{fk["referred_table"]}" ({remote})'
+            )
+        logger.info(f"Converted GUID columns in {len(tables)} tables")
+
+
+def migrate_guids(engine) -> bool:
+    """Run the GUID storage migration if needed. Returns True if anything changed."""
+    if not needs_migration(engine):
+        logger.info("GUID columns already use native storage, skipping...")
+        return False
+    if engine.dialect.name == "postgresql":
+        migrate_postgresql(engine)
+    else:
+        migrate_sqlite(engine)
+    return True
+
+
+if __name__ == "__main__":
+    from database import engine
+
+    logging.basicConfig(level=logging.INFO)
+    migrate_guids(engine)
@@ -0,0 +1,109 @@
+"""Baseline schema: users, departments, elections, candidates, votes, voting queue, clubs
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from models.user import GUID
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "departments",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("code", sa.String(20), nullable=False, unique=True),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("total_students", sa.Integer()),
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("student_id", sa.String(50), nullable=False),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("password_hash", sa.String(255), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("role", sa.Enum("ADMIN", "STUDENT", name="userrole")),
+        sa.Column("department_id", GUID(), sa.ForeignKey("departments.id")),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_index("ix_users_student_id", "users", ["student_id"], unique=True)
+    op.create_table(
+        "elections",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("department_id", GUID(), sa.ForeignKey("departments.id")),
+        sa.Column("status", sa.Enum("PLANNED", "ACTIVE", "FINISHED", name="electionstatus")),
+        sa.Column("start_date", sa.DateTime(), nullable=False),
+        sa.Column("end_date", sa.DateTime(), nullable=False),
+        sa.Column("batch_size", sa.Integer()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_table(
+        "candidates",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("election_id", GUID(), sa.ForeignKey("elections.id"), nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("role", sa.String(100), nullable=False),
+        sa.Column("photo_url", sa.String(500)),
+        sa.Column("manifesto", sa.Text()),
+        sa.Column("vote_count", sa.Integer()),
+    )
+    op.create_table(
+        "votes",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("election_id", GUID(), sa.ForeignKey("elections.id"), nullable=False),
+        sa.Column("user_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("candidate_id", GUID(), sa.ForeignKey("candidates.id"), nullable=False),
+        sa.Column("voted_at", sa.DateTime()),
+        sa.UniqueConstraint("election_id", "user_id", name="uq_election_user_vote"),
+    )
+    op.create_table(
+        "voting_queue",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("election_id", GUID(), sa.ForeignKey("elections.id"), nullable=False),
+        sa.Column("user_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("status", sa.Enum("PENDING", "NOTIFIED", "VOTED", "EXPIRED", name="queuestatus")),
+        sa.Column("voting_token", sa.String(255), nullable=False, unique=True),
+        sa.Column("batch_number", sa.Integer()),
+        sa.Column("notified_at", sa.DateTime()),
+        sa.Column("expires_at", sa.DateTime()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_table(
+        "clubs",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("name", sa.String(255), nullable=False, unique=True),
+        sa.Column("category", sa.String(100)),
+        sa.Column("description", sa.Text()),
+        sa.Column("status", sa.Enum("ACTIVE", "INACTIVE", name="clubstatus")),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    op.create_table(
+        "club_members",
+        sa.Column("id", GUID(), primary_key=True),
+        sa.Column("club_id", GUID(), sa.ForeignKey("clubs.id"), nullable=False),
+        sa.Column("user_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "role",
+            sa.Enum("PRESIDENT", "VICE_PRESIDENT", "SECRETARY", "TREASURER", "MEMBER", name="memberrole")
+        ),
+        sa.Column("joined_at", sa.DateTime()),
+    )
+
+
+def downgrade():
+    for table in (
+        "club_members", "clubs", "voting_queue", "votes",
+        "candidates", "elections", "users", "departments",
+    ):
+        op.drop_table(table)
+    for enum in ("memberrole", "clubstatus", "queuestatus", "electionstatus", "userrole"):
+        sa.Enum(name=enum).drop(op.get_bind(), checkfirst=True)
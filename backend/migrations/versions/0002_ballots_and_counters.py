@@ -0,0 +1,97 @@
+"""Packed ballots, ranked elections, candidate positions, club member counts, table versions
+
+Databases created by create_all before migrations existed may already have some
+of these, so each step only runs when its table or column is missing. Adopted
+databases get their columns from the current models (migrate.py rebuilds the
+tables before stamping), so the backfills run either way.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from models.user import GUID
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def _columns(inspector, table):
+    return {c["name"] for c in inspector.get_columns(table)}
+
+
+def _backfill_candidate_positions(bind):
+    """
+    Number candidates without a ballot position per election, after any
+    positions already taken, in insertion order where the database keeps one
+    (SQLite rowid), else by id.
+    """
+    order = "rowid" if bind.dialect.name == "sqlite" else "id"
+    taken = dict(bind.execute(sa.text(
+        "SELECT election_id, max(position) + 1 FROM candidates WHERE position IS NOT NULL GROUP BY election_id"
+    )).all())
+    update = sa.text("UPDATE candidates SET position = :position WHERE id = :id")
+    for candidate_id, election_id in bind.execute(sa.text(
+        f"SELECT id, election_id FROM candidates WHERE position IS NULL ORDER BY {order}"
+    )).all():
+        position = taken.get(election_id, 0)
+        taken[election_id] = position + 1
+        bind.execute(update, {"position": position, "id": candidate_id})
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+
+    if "position" not in _columns(inspector, "candidates"):
+        with op.batch_alter_table("candidates") as batch:
+            batch.add_column(sa.Column("position", sa.Integer()))
+
+    if "vote_type" not in _columns(inspector, "elections"):
+        vote_type = sa.Enum("PLURALITY", "RANKED", name="votetype")
+        vote_type.create(op.get_bind(), checkfirst=True)
+        with op.batch_alter_table("elections") as batch:
+            batch.add_column(sa.Column("vote_type", vote_type, server_default="PLURALITY"))
+
+    if "member_count" not in _columns(inspector, "clubs"):
+        with op.batch_alter_table("clubs") as batch:
+            batch.add_column(sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE clubs SET member_count = "
+        "(SELECT count(*) FROM club_members WHERE club_members.club_id = clubs.id)"
+    )
+    _backfill_candidate_positions(op.get_bind())
+
+    if "ballots" not in tables:
+        op.create_table(
+            "ballots",
+            sa.Column("id", GUID(), primary_key=True),
+            sa.Column("election_id", GUID(), sa.ForeignKey("elections.id"), nullable=False),
+            sa.Column("user_id", GUID(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("choices", sa.LargeBinary(), nullable=False),
+            sa.Column("cast_at", sa.DateTime()),
+            sa.UniqueConstraint("election_id", "user_id", name="uq_election_user_ballot"),
+        )
+
+    if "table_versions" not in tables:
+        op.create_table(
+            "table_versions",
+            sa.Column("name", sa.String(100), primary_key=True),
+            sa.Column("version", sa.Integer(), nullable=False),
+        )
+
+
+def downgrade():
+    op.drop_table("table_versions")
+    op.drop_table("ballots")
+    with op.batch_alter_table("clubs") as batch:
+        batch.drop_column("member_count")
+    with op.batch_alter_table("elections") as batch:
+        batch.drop_column("vote_type")
+    sa.Enum(name="votetype").drop(op.get_bind(), checkfirst=True)
+    with op.batch_alter_table("candidates") as batch:
+        batch.drop_column("position")
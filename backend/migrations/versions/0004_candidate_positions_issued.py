@@ -0,0 +1,48 @@
+"""Per-election counter of issued candidate ballot positions
+
+Backfilled from the highest position held by a candidate or recorded on a
+ballot, so positions of candidates removed before this revision are not
+handed out again either.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19
+"""
+import struct
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    # Adopted create_all databases already have the column (see migrate.py), but still need the backfill
+    if "positions_issued" not in {c["name"] for c in sa.inspect(bind).get_columns("elections")}:
+        with op.batch_alter_table("elections") as batch:
+            batch.add_column(sa.Column("positions_issued", sa.Integer(), nullable=False, server_default="0"))
+
+    issued = {
+        election_id: top + 1
+        for election_id, top in bind.execute(sa.text(
+            "SELECT election_id, max(position) FROM candidates "
+            "WHERE position IS NOT NULL GROUP BY election_id"
+        ))
+    }
+    # Ballot choices are little-endian uint16 positions (as services/tally_service.py wrote them at this revision)
+    for election_id, choices in bind.execute(sa.text("SELECT election_id, choices FROM ballots")):
+        positions = struct.unpack(f"<{len(choices) // 2}H", choices)
+        issued[election_id] = max(issued.get(election_id, 0), max(positions, default=-1) + 1)
+
+    update = sa.text("UPDATE elections SET positions_issued = :issued WHERE id = :id")
+    for election_id, count in issued.items():
+        bind.execute(update, {"issued": count, "id": election_id})
+
+
+def downgrade():
+    with op.batch_alter_table("elections") as batch:
+        batch.drop_column("positions_issued")
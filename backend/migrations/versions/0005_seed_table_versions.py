@@ -0,0 +1,34 @@
+"""Seed a table_versions row for every tracked table
+
+Bumps then only ever update an existing row; before, the first write to a
+table inserted its row, and two workers doing that at once on a fresh
+PostgreSQL database collided on the primary key.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# models.table_version.TRACKED_TABLES at this revision
+TRACKED_TABLES = ("candidates", "departments", "elections", "users")
+
+
+def upgrade():
+    bind = op.get_bind()
+    seeded = {name for (name,) in bind.execute(sa.text("SELECT name FROM table_versions"))}
+    insert = sa.text("INSERT INTO table_versions (name, version) VALUES (:name, 0)")
+    for name in TRACKED_TABLES:
+        if name not in seeded:
+            bind.execute(insert, {"name": name})
+
+
+def downgrade():
+    # Nothing to undo: code at earlier revisions works with the rows in place
+    pass
@@ -1,18 +1,24 @@
 """Models package"""
 from models.user import User, UserRole, GUID
 from models.department import Department
-from models.election import Election, ElectionStatus
+from models.election import Election, ElectionStatus, VoteType
 from models.candidate import Candidate
 from models.vote import Vote
+from models.ballot import Ballot
 from models.voting_queue import VotingQueue, QueueStatus
 from models.club import Club, ClubMember, ClubStatus, MemberRole
+from models.table_version import TableVersion, TRACKED_TABLES, get_versions
+from models.idempotency import IdempotencyRecord
 
 __all__ = [
     "User", "UserRole", "GUID",
     "Department",
-    "Election", "ElectionStatus",
+    "Election", "ElectionStatus", "VoteType",
     "Candidate",
     "Vote",
+    "Ballot",
     "VotingQueue", "QueueStatus",
     "Club", "ClubMember", "ClubStatus", "MemberRole",
+    "TableVersion", "TRACKED_TABLES", "get_versions",
+    "IdempotencyRecord",
 ]
@@ -0,0 +1,29 @@
+"""Ballot model for multi-choice voting"""
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, LargeBinary, UniqueConstraint
+from sqlalchemy.orm import relationship
+
+from database import Base
+from models.user import GUID
+
+
+class Ballot(Base):
+    __tablename__ = "ballots"
+    
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    election_id = Column(GUID(), ForeignKey("elections.id"), nullable=False)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    # Packed little-endian uint16 candidate positions, one per role
+    choices = Column(LargeBinary, nullable=False)
+    cast_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Ensure one ballot per user per election
+    __table_args__ = (
+        UniqueConstraint('election_id', 'user_id', name='uq_election_user_ballot'),
+    )
+    
+    # Relationships
+    election = relationship("Election", back_populates="ballots")
+    user = relationship("User", back_populates="ballots")
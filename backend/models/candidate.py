@@ -17,6 +17,7 @@ class Candidate(Base):
     photo_url = Column(String(500), nullable=True)
     manifesto = Column(Text, nullable=True)
     vote_count = Column(Integer, default=0)
+    position = Column(Integer, nullable=True)  # Stable index used in packed ballots
     
     # Relationships
     election = relationship("Election", back_populates="candidates")
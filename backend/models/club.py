@@ -3,7 +3,7 @@ import uuid
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Enum, Text, Integer, event, update
 from sqlalchemy.orm import relationship
 
 from database import Base
@@ -32,13 +32,11 @@ class Club(Base):
     description = Column(Text, nullable=True)
     status = Column(Enum(ClubStatus), default=ClubStatus.ACTIVE)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Denormalized count of club_members rows, kept in sync by the ClubMember events below
+    member_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     members = relationship("ClubMember", back_populates="club", cascade="all, delete-orphan")
-    
-    @property
-    def member_count(self):
-        return len(self.members)
 
 
 class ClubMember(Base):
@@ -53,3 +51,22 @@ class ClubMember(Base):
     # Relationships
     club = relationship("Club", back_populates="members")
     user = relationship("User", back_populates="club_memberships")
+
+
+def _adjust_member_count(connection, club_id, delta):
+    clubs = Club.__table__
+    connection.execute(
+        update(clubs)
+        .where(clubs.c.id == club_id)
+        .values(member_count=clubs.c.member_count + delta)
+    )
+
+
+@event.listens_for(ClubMember, "after_insert")
+def _member_added(mapper, connection, target):
+    _adjust_member_count(connection, target.club_id, 1)
+
+
+@event.listens_for(ClubMember, "after_delete")
+def _member_removed(mapper, connection, target):
+    _adjust_member_count(connection, target.club_id, -1)
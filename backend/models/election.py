@@ -16,6 +16,11 @@ class ElectionStatus(str, PyEnum):
     FINISHED = "finished"
 
 
+class VoteType(str, PyEnum):
+    PLURALITY = "plurality"
+    RANKED = "ranked"
+
+
 class Election(Base):
     __tablename__ = "elections"
     
@@ -25,11 +30,15 @@ class Election(Base):
     status = Column(Enum(ElectionStatus), default=ElectionStatus.PLANNED)
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=False)
+    vote_type = Column(Enum(VoteType), default=VoteType.PLURALITY, server_default=VoteType.PLURALITY.name)
     batch_size = Column(Integer, default=60)  # For load balancing
+    # Ballot positions handed out so far, including to removed candidates; positions are never reused
+    positions_issued = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationships
     department = relationship("Department", back_populates="elections")
     candidates = relationship("Candidate", back_populates="election", cascade="all, delete-orphan")
     votes = relationship("Vote", back_populates="election")
+    ballots = relationship("Ballot", back_populates="election")
     voting_queue = relationship("VotingQueue", back_populates="election")
@@ -0,0 +1,19 @@
+"""Stored responses for retried requests carrying an Idempotency-Key"""
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, LargeBinary, String
+
+from database import Base
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+    
+    # Keys are scoped to the voting token, so one voter can't read another's response
+    voting_token = Column(String(255), primary_key=True)
+    key = Column(String(255), primary_key=True)
+    # SHA-256 of the request body; a key reused for a different body is rejected
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False, default=200)
+    body = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
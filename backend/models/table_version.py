@@ -0,0 +1,76 @@
+"""Table version counters used for cache validation"""
+from sqlalchemy import Column, String, Integer, event, inspect, update, insert
+from sqlalchemy.orm import Session
+
+from database import Base
+
+
+# Tables whose writes invalidate cached responses
+TRACKED_TABLES = {"elections", "candidates", "departments", "users"}
+
+# Counter columns no cached payload includes. A flush that changes only these
+# (every vote bumps candidates.vote_count) leaves the table's version alone, so
+# votes neither contend on its table_versions row nor invalidate caches.
+COUNTER_COLUMNS = {
+    "candidates": {"vote_count"},
+    "elections": {"positions_issued"},
+}
+
+# session.info key collecting the tracked tables a transaction wrote to
+TOUCHED_TABLES_KEY = "touched_tables"
+
+
+class TableVersion(Base):
+    __tablename__ = "table_versions"
+    
+    name = Column(String(100), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def get_versions(db: Session, names) -> tuple:
+    """Current version of each named table, in the given order (0 if never written)"""
+    rows = dict(
+        db.query(TableVersion.name, TableVersion.version)
+        .filter(TableVersion.name.in_(names))
+        .all()
+    )
+    return tuple(rows.get(name, 0) for name in names)
+
+
+@event.listens_for(TableVersion.__table__, "after_create")
+def seed_table_versions(table, connection, **kw):
+    """Give every tracked table its row up front, so bumps never have to insert one (migration 0005 does the same)"""
+    connection.execute(insert(table), [{"name": name, "version": 0} for name in sorted(TRACKED_TABLES)])
+
+
+def _changes_cached_columns(obj) -> bool:
+    counters = COUNTER_COLUMNS.get(getattr(obj, "__tablename__", None))
+    if not counters:
+        return True
+    return any(
+        attr.key not in counters and attr.history.has_changes()
+        for attr in inspect(obj).attrs
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def bump_table_versions(session, flush_context):
+    """Bump the version of every tracked table touched by this flush, in the same transaction"""
+    touched = set()
+    for obj in list(session.new) + list(session.deleted) + [
+        o for o in session.dirty if session.is_modified(o) and _changes_cached_columns(o)
+    ]:
+        table = getattr(obj, "__tablename__", None)
+        if table in TRACKED_TABLES:
+            touched.add(table)
+    if not touched:
+        return
+    session.info.setdefault(TOUCHED_TABLES_KEY, set()).update(touched)
+
+    conn = session.connection()
+    for name in sorted(touched):
+        conn.execute(
+            update(TableVersion.__table__)
+            .where(TableVersion.__table__.c.name == name)
+            .values(version=TableVersion.__table__.c.version + 1)
+        )
@@ -14,25 +14,35 @@ class UserRole(str, PyEnum):
     STUDENT = "student"
 
 
-# Custom GUID type for cross-database UUID support
-from sqlalchemy.types import TypeDecorator, CHAR
+# Custom GUID type for cross-database UUID support:
+# native UUID on PostgreSQL, 16-byte BLOB everywhere else
+from sqlalchemy.types import TypeDecorator, BINARY, LargeBinary
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
 
 class GUID(TypeDecorator):
-    impl = CHAR
+    impl = BINARY
     cache_ok = True
 
     def load_dialect_impl(self, dialect):
-        return dialect.type_descriptor(CHAR(36))
+        if dialect.name == "postgresql":
+            return dialect.type_descriptor(PG_UUID(as_uuid=True))
+        if dialect.name == "sqlite":
+            return dialect.type_descriptor(LargeBinary(16))
+        return dialect.type_descriptor(BINARY(16))
 
     def process_bind_param(self, value, dialect):
-        if value is not None:
-            return str(value)
-        return value
+        if value is None:
+            return value
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(str(value))
+        if dialect.name == "postgresql":
+            return value
+        return value.bytes
 
     def process_result_value(self, value, dialect):
-        if value is not None:
-            return uuid.UUID(value)
-        return value
+        if value is None or value.__class__ is uuid.UUID:
+            return value
+        return uuid.UUID(bytes=value)
 
 
 class User(Base):
@@ -50,5 +60,6 @@ class User(Base):
     # Relationships
     department = relationship("Department", back_populates="users")
     votes = relationship("Vote", back_populates="user")
+    ballots = relationship("Ballot", back_populates="user")
     club_memberships = relationship("ClubMember", back_populates="user")
     voting_queue_entries = relationship("VotingQueue", back_populates="user")
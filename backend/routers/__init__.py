@@ -4,6 +4,7 @@ from routers.elections import router as elections_router
 from routers.voting import router as voting_router
 from routers.clubs import router as clubs_router
 from routers.dashboard import router as dashboard_router
+from routers.profiles import router as profiles_router
 
 __all__ = [
     "auth_router",
@@ -11,4 +12,5 @@ __all__ = [
     "voting_router",
     "clubs_router",
     "dashboard_router",
+    "profiles_router",
 ]
@@ -1,29 +1,56 @@
 """Authentication router"""
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Union
+from uuid import UUID
 
-import bcrypt
 from fastapi import APIRouter, Depends, HTTPException, status
-from jose import JWTError, jwt
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from config import settings
-from database import get_db
+from database import get_db, write_access
 from models import User, UserRole
 from schemas import UserLogin, Token, UserCreate, UserResponse, UserWithDepartment
+from services.hashing_pool import hashing_pool
+from services.invalidation import invalidation_bus
+from services.rate_limit import rate_limit, rate_limiter
+from services.response_cache import ResponseCache
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 security = HTTPBearer()
 
+# Authenticated users by id, so token checks skip the users query.
+# Cleared on any write to users, in every worker (see services/invalidation.py).
+principal_cache = ResponseCache(max_entries=10_000)
+invalidation_bus.subscribe({"users"}, lambda tables: principal_cache.clear())
 
-def get_password_hash(password: str) -> bytes:
+# Columns kept in cached principals; the password hash stays out of memory
+PRINCIPAL_COLUMNS = [
+    attr.key for attr in inspect(User).column_attrs if attr.key != "password_hash"
+]
+
+
+def _principal_snapshot(user: User) -> User:
+    """Detached copy of `user` that sessions can adopt without a query"""
+    snapshot = User(**{key: getattr(user, key) for key in PRINCIPAL_COLUMNS})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+# bcrypt and jose are imported on first use so workers start without loading them
+
+
+def get_password_hash(password: str) -> str:
     """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    import bcrypt
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
 
 
 def verify_password(plain_password: str, hashed_password: Union[str, bytes]) -> bool:
     """Verify password against hash"""
+    import bcrypt
     if isinstance(hashed_password, str):
         hashed_password = hashed_password.encode()
     return bcrypt.checkpw(plain_password.encode(), hashed_password)
@@ -34,6 +61,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
     to_encode.update({"exp": expire})
+    from jose import jwt
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -47,18 +75,24 @@ async def get_current_user(
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    from jose import JWTError, jwt
     try:
         token = credentials.credentials
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        user_id = UUID(payload.get("sub"))
+    except (JWTError, TypeError, ValueError):
         raise credentials_exception
     
+    cached = principal_cache.get(user_id)
+    if cached is not None:
+        # Attach a copy to this request's session; unloaded attributes lazy-load from it
+        return db.merge(cached, load=False)
+
+    generation = principal_cache.generation
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
+    principal_cache.set(user_id, _principal_snapshot(user), generation)
     return user
 
 
@@ -72,11 +106,13 @@ async def get_admin_user(current_user: User = Depends(get_current_user)) -> User
     return current_user
 
 
-@router.post("/login", response_model=Token)
+@router.post("/login", response_model=Token, dependencies=[Depends(rate_limit("login_ip", "RATE_LIMIT_LOGIN_PER_IP"))])
 async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     """Login with student ID and password"""
+    # Per account as well, so guessing one student's password is slow from any number of IPs
+    await rate_limiter.check(f"login_student:{user_data.student_id.lower()}", settings.RATE_LIMIT_LOGIN_PER_STUDENT)
     user = db.query(User).filter(User.student_id == user_data.student_id).first()
-    if not user or not verify_password(user_data.password, user.password_hash):
+    if not user or not await hashing_pool.run(verify_password, user_data.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials"
@@ -94,17 +130,25 @@ async def register(user_data: UserCreate, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Student ID already registered")
     if db.query(User).filter(User.email == user_data.email).first():
         raise HTTPException(status_code=400, detail="Email already registered")
-    
+    db.commit()  # hand the connection back to the pool while hashing
+
+    # Hash before taking write access, so other writes don't queue behind bcrypt
     user = User(
         student_id=user_data.student_id,
         email=user_data.email,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await hashing_pool.run(get_password_hash, user_data.password),
         name=user_data.name,
         role=UserRole.STUDENT,
         department_id=user_data.department_id
     )
-    db.add(user)
-    db.commit()
+    async with write_access():
+        db.add(user)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Registered concurrently by another request since the checks above
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Student ID or email already registered")
     db.refresh(user)
     return user
 
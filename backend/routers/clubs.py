@@ -1,82 +1,137 @@
 """Clubs router"""
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
 
-from database import get_db
+from database import get_read_db, get_write_db
 from models import Club, ClubMember, User, MemberRole
-from schemas import ClubCreate, ClubResponse, ClubWithMembers, ClubMemberResponse
+from schemas import ClubCreate, ClubResponse, ClubWithMembers
 from routers.auth import get_current_user, get_admin_user
+from services.pagination import encode_cursor, decode_cursor, keyset_after, parse_datetime, parse_uuid
+from services.projection import parse_fields, nested_fields
+from services.serialization import json_response, project
 
 router = APIRouter(prefix="/clubs", tags=["Clubs"])
 
 
+# Fields available to `fields=` projection
+CLUB_FIELDS = ["id", "name", "category", "description", "status", "member_count"]
+MEMBER_FIELDS = ["id", "user_id", "role", "joined_at"]
+USER_FIELDS = ["id", "student_id", "email", "name", "department_id", "role", "created_at"]
+ALLOWED_MEMBER_FIELDS = MEMBER_FIELDS + ["user"] + [f"user.{f}" for f in USER_FIELDS]
+DEFAULT_MEMBER_FIELDS = MEMBER_FIELDS + ["user"]
+
+
+def _page(rows, limit, sort_key):
+    """Trim a limit+1 result to one page, returning (rows, next_cursor)"""
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(*sort_key(rows[-1]))
+    return rows, None
+
+
+def _page_response(payload, next_cursor):
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return json_response(payload, headers=headers)
+
+
 @router.get("/", response_model=List[ClubResponse])
 async def get_clubs(
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all clubs"""
-    clubs_with_counts = (
-        db.query(Club, func.count(ClubMember.id).label("member_count"))
-        .outerjoin(Club.members)
-        .group_by(Club.id)
-        .all()
-    )
-    return [
-        ClubResponse(
-            id=club.id,
-            name=club.name,
-            category=club.category,
-            description=club.description,
-            status=club.status,
-            member_count=count
-        )
-        for club, count in clubs_with_counts
-    ]
+    """
+    Get clubs ordered by name.
+    Pass `limit` to paginate (next cursor in X-Next-Cursor); `fields` selects columns.
+    """
+    selected = parse_fields(fields, CLUB_FIELDS, CLUB_FIELDS)
+
+    # name is the pagination key, so it is always fetched
+    columns = [getattr(Club, f) for f in selected if f != "name"]
+    query = db.query(Club.name, *columns)
+    if cursor:
+        name, club_id = decode_cursor(cursor)
+        query = query.filter(keyset_after((Club.name, Club.id), (name, parse_uuid(club_id))))
+    query = query.order_by(Club.name, Club.id)
+    if limit:
+        query = query.limit(limit + 1)
+
+    rows, next_cursor = _page(query.all(), limit, lambda row: (row.name, row.id))
+    payload = [project(row, selected) for row in rows]
+    return _page_response(payload, next_cursor)
 
 
 @router.get("/{club_id}", response_model=ClubWithMembers)
 async def get_club(
     club_id: UUID,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get club by ID with members"""
-    club = db.query(Club).options(
-        joinedload(Club.members).joinedload(ClubMember.user)
-    ).filter(Club.id == club_id).first()
-    
+    """
+    Get club by ID with members ordered by join date.
+    `limit`/`cursor` paginate the members; `fields` selects member columns, e.g. `fields=role,user.name`.
+    """
+    selected = parse_fields(fields, ALLOWED_MEMBER_FIELDS, DEFAULT_MEMBER_FIELDS)
+    member_fields = [f for f in selected if f in MEMBER_FIELDS]
+    user_fields = nested_fields(selected, "user", USER_FIELDS)
+
+    club = db.query(Club).filter(Club.id == club_id).first()
     if not club:
         raise HTTPException(status_code=404, detail="Club not found")
-    
-    return ClubWithMembers(
-        id=club.id,
-        name=club.name,
-        category=club.category,
-        description=club.description,
-        status=club.status,
-        member_count=club.member_count,
-        members=[
-            ClubMemberResponse(
-                id=m.id,
-                user_id=m.user_id,
-                role=m.role,
-                joined_at=m.joined_at,
-                user=m.user
+
+    # Core rows: members and their users come back as plain tuples
+    stmt = select(
+        ClubMember.id.label("_id"), ClubMember.joined_at.label("_joined_at"),
+        *(getattr(ClubMember, f) for f in member_fields)
+    ).where(ClubMember.club_id == club_id)
+    if user_fields is not None:
+        stmt = stmt.add_columns(
+            *(getattr(User, f).label(f"user__{f}") for f in user_fields)
+        ).outerjoin(User, User.id == ClubMember.user_id)
+    if cursor:
+        joined_at, member_id = decode_cursor(cursor)
+        stmt = stmt.where(keyset_after(
+            (ClubMember.joined_at, ClubMember.id),
+            (parse_datetime(joined_at), parse_uuid(member_id))
+        ))
+    stmt = stmt.order_by(ClubMember.joined_at, ClubMember.id)
+    if limit:
+        stmt = stmt.limit(limit + 1)
+
+    members, next_cursor = _page(db.execute(stmt).all(), limit, lambda m: (m._joined_at, m._id))
+    payload = {
+        "id": club.id,
+        "name": club.name,
+        "category": club.category,
+        "description": club.description,
+        "status": club.status,
+        "member_count": club.member_count,
+        "members": [],
+    }
+    for member in members:
+        item = project(member, member_fields)
+        if user_fields is not None:
+            item["user"] = (
+                {f: getattr(member, f"user__{f}") for f in user_fields}
+                if member.user__id is not None else None
             )
-            for m in club.members
-        ]
-    )
+        payload["members"].append(item)
+    return _page_response(payload, next_cursor)
 
 
 @router.post("/", response_model=ClubResponse)
 async def create_club(
     club_data: ClubCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Create new club (Admin only)"""
@@ -100,14 +155,14 @@ async def create_club(
         category=club.category,
         description=club.description,
         status=club.status,
-        member_count=0
+        member_count=club.member_count
     )
 
 
 @router.delete("/{club_id}")
 async def delete_club(
     club_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Delete club (Admin only)"""
@@ -125,7 +180,7 @@ async def add_member(
     club_id: UUID,
     user_id: UUID,
     role: MemberRole = MemberRole.MEMBER,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Add member to club (Admin only)"""
@@ -154,7 +209,7 @@ async def add_member(
 async def remove_member(
     club_id: UUID,
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Remove member from club (Admin only)"""
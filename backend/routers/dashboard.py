@@ -2,19 +2,28 @@
 from typing import List
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy import func, select, union_all
 
-from database import get_db
-from models import User, UserRole, Election, ElectionStatus, Club, Vote, Department
-from schemas import DashboardStats, DepartmentTurnout, RecentElection
+from database import get_read_db
+from models import User, UserRole, Election, ElectionStatus, Club, Vote, Ballot, Department
+from schemas import DashboardStats, DepartmentTurnout, RecentElection, RouteQueryStats
+from config import settings
 from routers.auth import get_admin_user
+from services.query_stats import route_metrics
+from services.route_cache import cached_route
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
+# Aggregates may lag by up to the TTL (plus the stale window while refreshing)
+dashboard_cache = cached_route(
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS, stale=settings.DASHBOARD_CACHE_STALE_SECONDS
+)
+
 
 @router.get("/stats", response_model=DashboardStats)
+@dashboard_cache
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_admin_user)
 ):
     """Get dashboard KPI stats (Admin only)"""
@@ -22,13 +31,15 @@ async def get_dashboard_stats(
     stmt = select(
         select(func.count(User.id)).filter(User.role == UserRole.STUDENT).scalar_subquery(),
         select(func.count(Election.id)).filter(Election.status == ElectionStatus.ACTIVE).scalar_subquery(),
-        select(func.count(Club.id)).scalar_subquery()
+        select(func.count(Club.id)).scalar_subquery(),
+        select(func.count(Vote.id)).scalar_subquery(),
+        select(func.count(Ballot.id)).scalar_subquery()
     )
     result = db.execute(stmt).one()
-    total_students, active_elections, registered_clubs = result
+    total_students, active_elections, registered_clubs, single_votes, ballots = result
     
-    # Calculate overall voter turnout
-    total_votes = db.query(Vote).count()
+    # Calculate overall voter turnout: single-choice votes plus multi-role and ranked ballots
+    total_votes = single_votes + ballots
 
     # Calculate eligible voters per election
     eligible_elections = db.query(Election).filter(
@@ -62,8 +73,9 @@ async def get_dashboard_stats(
 
 
 @router.get("/turnout", response_model=List[DepartmentTurnout])
+@dashboard_cache
 async def get_department_turnout(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_admin_user)
 ):
     """Get voter turnout by department (Admin only)"""
@@ -81,11 +93,12 @@ async def get_department_turnout(
     # Convert to dict for O(1) lookup
     student_counts = {dept_id: count for dept_id, count in student_counts_query}
 
-    # Batch query for vote counts
+    # Batch query for vote counts (a voter casts either a vote or a ballot per election)
+    voters = union_all(select(Vote.user_id), select(Ballot.user_id)).subquery()
     vote_counts_query = db.query(
         User.department_id,
-        func.count(Vote.id)
-    ).select_from(Vote).join(User).group_by(User.department_id).all()
+        func.count()
+    ).select_from(voters).join(User, User.id == voters.c.user_id).group_by(User.department_id).all()
 
     # Convert to dict
     vote_counts = {dept_id: count for dept_id, count in vote_counts_query}
@@ -103,9 +116,14 @@ async def get_department_turnout(
     return result
 
 
+# Recent elections only change when elections are written
 @router.get("/recent-elections", response_model=List[RecentElection])
+@cached_route(
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS, stale=settings.DASHBOARD_CACHE_STALE_SECONDS,
+    invalidate_on={"elections"},
+)
 async def get_recent_elections(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     admin: User = Depends(get_admin_user)
 ):
     """Get recent elections (Admin only)"""
@@ -113,7 +131,7 @@ async def get_recent_elections(
         Election.created_at.desc()
     ).limit(5).all()
     
-    return [
+    result = [
         RecentElection(
             id=e.id,
             title=e.title,
@@ -123,3 +141,11 @@ async def get_recent_elections(
         )
         for e in elections
     ]
+    return result
+
+
+@router.get("/query-stats", response_model=List[RouteQueryStats])
+async def get_query_stats(admin: User = Depends(get_admin_user)):
+    """SQL statement counts and timings per route since startup, heaviest first (Admin only)"""
+    stats = [RouteQueryStats(route=route, **entry) for route, entry in route_metrics.snapshot().items()]
+    return sorted(stats, key=lambda s: s.db_ms, reverse=True)
@@ -1,35 +1,184 @@
 """Elections router"""
+import hashlib
+from collections import defaultdict
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Header, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session, joinedload
 
-from database import get_db
-from models import Election, ElectionStatus, Candidate, User
+from config import settings
+from database import get_db, get_read_db, get_write_db
+from models import Election, ElectionStatus, VoteType, Candidate, Department, User, get_versions
 from schemas import (
-    ElectionCreate, ElectionWithCandidates, ElectionListItem,
-    CandidateCreate, CandidateResponse
+    ElectionCreate, ElectionWithCandidates, ElectionSummary, ElectionListItem,
+    CandidateCreate, CandidateResponse, CandidateManifesto, ElectionResults, RankedResults
 )
 from routers.auth import get_current_user, get_admin_user
+from services.tally_service import next_candidate_position, tally_election
+from services.pagination import encode_cursor, decode_cursor, keyset_after, parse_datetime, parse_uuid
+from services.invalidation import invalidation_bus
+from services.response_cache import ResponseCache, etag_matches
+from services.projection import parse_fields, nested_fields
+from services.serialization import dumps, project
 
 router = APIRouter(prefix="/elections", tags=["Elections"])
 
 
-@router.get("/", response_model=List[ElectionWithCandidates])
+# Tables an election listing is built from; any write to them changes the ETag
+ELECTION_LIST_TABLES = ("elections", "candidates", "departments")
+election_list_cache = ResponseCache(max_entries=128)
+# Keys carry the versions, so this only drops entries that can no longer be hit
+invalidation_bus.subscribe(ELECTION_LIST_TABLES, lambda tables: election_list_cache.clear())
+
+# Fields available to `fields=` projection on the election listing
+ELECTION_FIELDS = [
+    "id", "title", "department_id", "status", "vote_type",
+    "start_date", "end_date", "batch_size", "created_at",
+]
+# Vote counts are left out: votes do not bump table versions (see COUNTER_COLUMNS), and /results has the tallies
+CANDIDATE_FIELDS = ["id", "election_id", "name", "role", "photo_url", "manifesto"]
+# Manifestos are only shown on the ballot page, so listings leave them out unless asked
+DEFAULT_CANDIDATE_FIELDS = [f for f in CANDIDATE_FIELDS if f != "manifesto"]
+DEPARTMENT_FIELDS = ["id", "code", "name", "total_students"]
+ALLOWED_ELECTION_FIELDS = (
+    ELECTION_FIELDS + ["candidates", "department"]
+    + [f"candidates.{f}" for f in CANDIDATE_FIELDS]
+    + [f"department.{f}" for f in DEPARTMENT_FIELDS]
+)
+DEFAULT_ELECTION_FIELDS = ELECTION_FIELDS + ["candidates", "department"]
+
+
+# Candidates are fetched for this many elections per IN (...) query
+CANDIDATE_BATCH = 500
+
+
+def _load_election_page(db: Session, status, limit, cursor, selected):
+    """
+    Query and serialize one page of elections, returning (body, next_cursor).
+    Works on Core rows and encodes with orjson: no ORM hydration, no Pydantic.
+    """
+    election_fields = [f for f in selected if f in ELECTION_FIELDS]
+    candidate_fields = nested_fields(selected, "candidates", DEFAULT_CANDIDATE_FIELDS)
+    department_fields = nested_fields(selected, "department", DEPARTMENT_FIELDS)
+
+    # id and created_at are always needed (candidates, cursor), selected or not
+    stmt = select(
+        Election.id.label("_id"), Election.created_at.label("_created_at"),
+        *(getattr(Election, f) for f in election_fields)
+    )
+    if department_fields is not None:
+        stmt = stmt.add_columns(
+            *(getattr(Department, f).label(f"department__{f}") for f in department_fields)
+        ).outerjoin(Department, Department.id == Election.department_id)
+    if status:
+        stmt = stmt.where(Election.status == status)
+    if cursor:
+        created_at, election_id = decode_cursor(cursor)
+        stmt = stmt.where(keyset_after(
+            (Election.created_at, Election.id),
+            (parse_datetime(created_at), parse_uuid(election_id)),
+            descending=True
+        ))
+    stmt = stmt.order_by(Election.created_at.desc(), Election.id.desc())
+
+    next_cursor = None
+    if limit:
+        rows = db.execute(stmt.limit(limit + 1)).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]._created_at, rows[-1]._id)
+    else:
+        rows = db.execute(stmt).all()
+
+    candidates = defaultdict(list)
+    if candidate_fields is not None and rows:
+        ids = [row._id for row in rows]
+        columns = [getattr(Candidate, f) for f in candidate_fields]
+        for i in range(0, len(ids), CANDIDATE_BATCH):
+            candidate_rows = db.execute(
+                select(Candidate.election_id.label("_election_id"), *columns)
+                .where(Candidate.election_id.in_(ids[i:i + CANDIDATE_BATCH]))
+            )
+            for row in candidate_rows:
+                candidates[row._election_id].append(project(row, candidate_fields))
+
+    payload = []
+    for row in rows:
+        item = project(row, election_fields)
+        if candidate_fields is not None:
+            item["candidates"] = candidates.get(row._id, [])
+        if department_fields is not None:
+            item["department"] = (
+                {f: getattr(row, f"department__{f}") for f in department_fields}
+                if row.department__id is not None else None
+            )
+        payload.append(item)
+    return dumps(payload), next_cursor
+
+
+@router.get("/", response_model=List[ElectionSummary])
 async def get_elections(
     status: Optional[ElectionStatus] = None,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all elections, optionally filtered by status"""
-    query = db.query(Election).options(
-        joinedload(Election.candidates),
-        joinedload(Election.department)
-    )
-    if status:
-        query = query.filter(Election.status == status)
-    return query.order_by(Election.created_at.desc()).all()
+    """
+    Get elections, optionally filtered by status.
+    Pass `limit` to paginate; the next page's cursor is returned in X-Next-Cursor.
+    `fields` selects columns, e.g. `fields=title,status,candidates.name`.
+    """
+    selected = parse_fields(fields, ALLOWED_ELECTION_FIELDS, DEFAULT_ELECTION_FIELDS)
+
+    versions = get_versions(db, ELECTION_LIST_TABLES)
+    # Each filter, page and projection is a different representation, so the query is part of the ETag
+    query = hashlib.sha256(repr((status and status.value, limit, cursor, selected)).encode()).hexdigest()[:16]
+    etag = '"elections-' + "-".join(str(v) for v in versions) + f'-{query}"'
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    key = (status, limit, cursor, tuple(selected), versions)
+    cached = election_list_cache.get(key)
+    if cached is None:
+        cached = _load_election_page(db, status, limit, cursor, selected)
+        election_list_cache.set(key, cached)
+    body, next_cursor = cached
+
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/candidates/{candidate_id}/manifesto", response_model=CandidateManifesto)
+async def get_candidate_manifesto(
+    candidate_id: UUID,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Get a candidate's manifesto. Listings leave manifestos out; clients fetch
+    them here, and browsers and proxies cache them by candidate id.
+    """
+    row = db.execute(
+        select(Candidate.id, Candidate.manifesto).where(Candidate.id == candidate_id)
+    ).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    digest = hashlib.sha256((row.manifesto or "").encode()).hexdigest()[:16]
+    headers = {
+        "ETag": f'"manifesto-{digest}"',
+        "Cache-Control": f"public, max-age={settings.MANIFESTO_MAX_AGE}",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=dumps(project(row, ["id", "manifesto"])), media_type="application/json", headers=headers)
 
 
 @router.get("/{election_id}", response_model=ElectionWithCandidates)
@@ -48,10 +197,46 @@ async def get_election(
     return election
 
 
+@router.get("/{election_id}/results", response_model=ElectionResults)
+async def get_election_results(
+    election_id: UUID,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """Get per-role results for an election (Admin only)"""
+    election = db.query(Election).options(
+        joinedload(Election.candidates)
+    ).filter(Election.id == election_id).first()
+    if not election:
+        raise HTTPException(status_code=404, detail="Election not found")
+    return tally_election(db, election)
+
+
+@router.get("/{election_id}/ranked-results", response_model=RankedResults)
+async def get_ranked_results(
+    election_id: UUID,
+    seats: int = Query(1, ge=1),
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_admin_user)
+):
+    """Count a ranked election: IRV for one seat, STV for several (Admin only)"""
+    # Loads numpy; kept out of worker startup
+    from services.ranked_service import count_ranked_election
+
+    election = db.query(Election).options(
+        joinedload(Election.candidates)
+    ).filter(Election.id == election_id).first()
+    if not election:
+        raise HTTPException(status_code=404, detail="Election not found")
+    if election.vote_type != VoteType.RANKED:
+        raise HTTPException(status_code=400, detail="Election is not ranked")
+    return count_ranked_election(db, election, seats)
+
+
 @router.post("/", response_model=ElectionWithCandidates)
 async def create_election(
     election_data: ElectionCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Create new election with candidates (Admin only)"""
@@ -59,21 +244,24 @@ async def create_election(
         title=election_data.title,
         department_id=election_data.department_id,
         status=election_data.status,
+        vote_type=election_data.vote_type,
         start_date=election_data.start_date,
         end_date=election_data.end_date,
-        batch_size=election_data.batch_size
+        batch_size=election_data.batch_size,
+        positions_issued=len(election_data.candidates)
     )
     db.add(election)
     db.flush()
     
     # Add candidates
-    for cand_data in election_data.candidates:
+    for position, cand_data in enumerate(election_data.candidates):
         candidate = Candidate(
             election_id=election.id,
             name=cand_data.name,
             role=cand_data.role,
             photo_url=cand_data.photo_url,
-            manifesto=cand_data.manifesto
+            manifesto=cand_data.manifesto,
+            position=position
         )
         db.add(candidate)
     
@@ -86,7 +274,7 @@ async def create_election(
 async def update_election_status(
     election_id: UUID,
     new_status: ElectionStatus = Query(...),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Update election status (Admin only)"""
@@ -102,7 +290,7 @@ async def update_election_status(
 @router.delete("/{election_id}")
 async def delete_election(
     election_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Delete election (Admin only)"""
@@ -120,11 +308,11 @@ async def delete_election(
 async def add_candidate(
     election_id: UUID,
     candidate_data: CandidateCreate,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Add candidate to election (Admin only)"""
-    election = db.query(Election).filter(Election.id == election_id).first()
+    election = db.query(Election).filter(Election.id == election_id).with_for_update().first()
     if not election:
         raise HTTPException(status_code=404, detail="Election not found")
     
@@ -133,7 +321,8 @@ async def add_candidate(
         name=candidate_data.name,
         role=candidate_data.role,
         photo_url=candidate_data.photo_url,
-        manifesto=candidate_data.manifesto
+        manifesto=candidate_data.manifesto,
+        position=next_candidate_position(db, election)
     )
     db.add(candidate)
     db.commit()
@@ -145,7 +334,7 @@ async def add_candidate(
 async def remove_candidate(
     election_id: UUID,
     candidate_id: UUID,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user)
 ):
     """Remove candidate from election (Admin only)"""
@@ -0,0 +1,26 @@
+"""Slow-request profiles router"""
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from models import User
+from schemas import ProfileInfo
+from routers.auth import get_admin_user
+from services.profiler import profiler
+
+router = APIRouter(prefix="/profiles", tags=["Profiling"])
+
+
+@router.get("/", response_model=List[ProfileInfo])
+async def list_profiles(admin: User = Depends(get_admin_user)):
+    """List stored slow-request profiles, newest first (Admin only)"""
+    return profiler.list_profiles()
+
+
+@router.get("/{name}")
+async def download_profile(name: str, admin: User = Depends(get_admin_user)):
+    """Download a profile in collapsed-stack format, e.g. for flamegraph.pl or speedscope (Admin only)"""
+    path = profiler.profile_path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=name)
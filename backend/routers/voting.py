@@ -2,41 +2,66 @@
 
 import secrets
 from datetime import datetime, timedelta
-from typing import List
+from typing import Callable, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Header, Request, Response
+from sqlalchemy import exists, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, defer, joinedload
 
+import metrics
 from config import settings
-from database import get_db
+from database import dependency_session, get_db, get_read_db, get_write_db, write_access
 from models import (
     Election,
     ElectionStatus,
+    VoteType,
     User,
     UserRole,
     Vote,
+    Ballot,
     Candidate,
     VotingQueue,
     QueueStatus,
 )
 from schemas import (
-    VoteCreate, VoteResponse, SendVotingLinksRequest, 
-    SendVotingLinksResponse, ElectionWithCandidates,
+    VoteCreate, VoteResponse, BallotCreate, BallotResponse, SendVotingLinksRequest, 
+    SendVotingLinksResponse, ElectionSummary,
     TokenValidationResponse
 )
 from routers.auth import get_current_user, get_admin_user
+from routers.elections import ELECTION_FIELDS, CANDIDATE_FIELDS, DEFAULT_CANDIDATE_FIELDS, DEPARTMENT_FIELDS
+from services.active_elections import Elections, active_election_index
+from services.coalesce import SingleFlight
 from services.email_service import send_voting_emails, send_voting_emails_bg
+from services.idempotency import idempotency_store, request_hash
 from services.queue_service import create_voting_queue_entries
+from services.rate_limit import path_param, rate_limit
+from services.serialization import dumps, project
+from services.tally_service import encode_choices
 
 router = APIRouter(prefix="/voting", tags=["Voting"])
 
+# Checked before the write lock is taken, so floods are turned away cheaply
+validate_limits = [
+    Depends(rate_limit("validate_ip", "RATE_LIMIT_VALIDATE_PER_IP")),
+    Depends(rate_limit("validate_token", "RATE_LIMIT_VALIDATE_PER_TOKEN", path_param("token"))),
+]
+cast_limits = [
+    Depends(rate_limit("cast_ip", "RATE_LIMIT_CAST_PER_IP")),
+    Depends(rate_limit("cast_token", "RATE_LIMIT_CAST_PER_TOKEN", path_param("token"))),
+]
+
+# Voters opening the same election at once share one load and one serialized body
+election_loads = SingleFlight("election")
+
 
 @router.post("/send-links", response_model=SendVotingLinksResponse)
 async def send_voting_links(
     request: SendVotingLinksRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
     admin: User = Depends(get_admin_user),
 ):
     """Send voting links to students (Admin only)"""
@@ -74,9 +99,25 @@ async def send_voting_links(
     )
 
 
-@router.get("/validate/{token}", response_model=TokenValidationResponse)
-async def validate_voting_token(token: str, db: Session = Depends(get_db)):
+def _load_election(election_id: UUID, overrides) -> Optional[bytes]:
+    """Serialized election with candidates and department, as token validation returns it"""
+    with dependency_session(get_read_db, overrides) as db:
+        election = db.query(Election).options(
+            joinedload(Election.candidates), joinedload(Election.department)
+        ).filter(Election.id == election_id).first()
+        if election is None:
+            return None
+        payload = project(election, ELECTION_FIELDS)
+        # Loaded fresh for each validation, so unlike the cached listings it can carry vote counts
+        payload["candidates"] = [project(c, CANDIDATE_FIELDS + ["vote_count"]) for c in election.candidates]
+        payload["department"] = project(election.department, DEPARTMENT_FIELDS) if election.department else None
+        return dumps(payload)
+
+
+@router.get("/validate/{token}", response_model=TokenValidationResponse, dependencies=validate_limits)
+async def validate_voting_token(token: str, request: Request, db: Session = Depends(get_db)):
     """Validate a voting token and return election info"""
+    # From the primary: a lagging replica would reject a voter who was just queued
     queue_entry = (
         db.query(VotingQueue).filter(VotingQueue.voting_token == token).first()
     )
@@ -90,23 +131,42 @@ async def validate_voting_token(token: str, db: Session = Depends(get_db)):
     if queue_entry.status == QueueStatus.EXPIRED or (
         queue_entry.expires_at and queue_entry.expires_at < datetime.utcnow()
     ):
-        queue_entry.status = QueueStatus.EXPIRED
-        db.commit()
+        # Only this rare path writes, so only it waits for the write lock
+        async with write_access():
+            queue_entry.status = QueueStatus.EXPIRED
+            db.commit()
         raise HTTPException(status_code=400, detail="Voting token expired")
-    
-    election = db.query(Election).options(
-        joinedload(Election.candidates)
-    ).filter(Election.id == queue_entry.election_id).first()
-    
-    return {
-        "election": election,
-        "valid": True
-    }
+
+    # The hottest read on voting day: serialized once per load, shared by concurrent voters.
+    # End this request's transaction first, so waiting requests hold no connections.
+    election_id = queue_entry.election_id
+    db.commit()
+    election = await election_loads.do(
+        election_id, lambda: _load_election(election_id, request.app.dependency_overrides)
+    )
+    if election is None:
+        raise HTTPException(status_code=404, detail="Election not found")
+    return Response(content=b'{"election":' + election + b',"valid":true}', media_type="application/json")
 
 
-@router.post("/cast/{token}", response_model=VoteResponse)
-async def cast_vote(token: str, vote_data: VoteCreate, db: Session = Depends(get_db)):
-    """Cast a vote using voting token"""
+@router.post("/cast/{token}", response_model=VoteResponse, dependencies=cast_limits)
+async def cast_vote(
+    token: str,
+    vote_data: VoteCreate,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_write_db),
+):
+    """
+    Cast a vote using voting token.
+    Retries carrying the same Idempotency-Key get the original response back.
+    """
+    body_hash = None
+    if idempotency_key:
+        body_hash = request_hash(vote_data.model_dump_json().encode())
+        replay = idempotency_store.lookup(db, token, idempotency_key, body_hash)
+        if replay:
+            return replay
+
     queue_entry = (
         db.query(VotingQueue).filter(VotingQueue.voting_token == token).first()
     )
@@ -126,6 +186,10 @@ async def cast_vote(token: str, vote_data: VoteCreate, db: Session = Depends(get
     if queue_entry.election_id != vote_data.election_id:
         raise HTTPException(status_code=400, detail="Election mismatch")
 
+    election = db.query(Election).filter(Election.id == vote_data.election_id).first()
+    if election and election.vote_type == VoteType.RANKED:
+        raise HTTPException(status_code=400, detail="Election requires a ranked ballot")
+
     # Verify candidate belongs to election
     candidate = (
         db.query(Candidate)
@@ -138,18 +202,12 @@ async def cast_vote(token: str, vote_data: VoteCreate, db: Session = Depends(get
     if not candidate:
         raise HTTPException(status_code=400, detail="Invalid candidate")
 
-    # Check for existing vote
-    existing_vote = (
-        db.query(Vote)
-        .filter(
-            Vote.election_id == vote_data.election_id,
-            Vote.user_id == queue_entry.user_id,
-        )
-        .first()
-    )
-    if existing_vote:
+    if _has_voted(db, vote_data.election_id, queue_entry.user_id):
         raise HTTPException(status_code=400, detail="Already voted in this election")
 
+    if not _claim_queue_entry(db, queue_entry):
+        return _replay_or_reject(db, token, idempotency_key, body_hash, "Vote already cast")
+
     # Cast vote
     vote = Vote(
         election_id=vote_data.election_id,
@@ -160,38 +218,206 @@ async def cast_vote(token: str, vote_data: VoteCreate, db: Session = Depends(get
 
     # Update candidate vote count
     candidate.vote_count = Candidate.vote_count + 1
-    
-    # Update queue status
-    queue_entry.status = QueueStatus.VOTED
 
-    db.commit()
-    db.refresh(vote)
-    return vote
+    if not idempotency_key:
+        db.commit()
+        metrics.votes_cast.inc(election_id=vote_data.election_id)
+        db.refresh(vote)
+        return vote
+
+    return _commit_idempotent(
+        db, token, idempotency_key, body_hash,
+        lambda: dumps(VoteResponse.model_validate(vote).model_dump(mode="json")),
+        vote_data.election_id,
+    )
 
 
-@router.get("/active", response_model=List[ElectionWithCandidates])
-async def get_active_elections_for_student(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+@router.post("/ballot/{token}", response_model=BallotResponse, dependencies=cast_limits)
+async def cast_ballot(
+    token: str,
+    ballot_data: BallotCreate,
+    idempotency_key: Optional[str] = Header(None),
+    db: Session = Depends(get_write_db),
 ):
-    """Get active elections for current student based on department"""
-    query = (
-        db.query(Election)
-        .options(joinedload(Election.candidates), joinedload(Election.department))
-        .filter(Election.status == ElectionStatus.ACTIVE)
+    """
+    Cast a multi-role or ranked ballot using voting token.
+    Retries carrying the same Idempotency-Key get the original response back.
+    """
+    body_hash = None
+    if idempotency_key:
+        body_hash = request_hash(ballot_data.model_dump_json().encode())
+        replay = idempotency_store.lookup(db, token, idempotency_key, body_hash)
+        if replay:
+            return replay
+
+    queue_entry = (
+        db.query(VotingQueue).filter(VotingQueue.voting_token == token).first()
     )
 
-    # Filter by department for students
-    if current_user.role == UserRole.STUDENT and current_user.department_id:
-        from sqlalchemy import or_
+    if not queue_entry:
+        raise HTTPException(status_code=404, detail="Invalid voting token")
+
+    if queue_entry.status == QueueStatus.VOTED:
+        raise HTTPException(status_code=400, detail="Vote already cast")
+
+    if queue_entry.expires_at and queue_entry.expires_at < datetime.utcnow():
+        queue_entry.status = QueueStatus.EXPIRED
+        db.commit()
+        raise HTTPException(status_code=400, detail="Voting token expired")
+
+    if queue_entry.election_id != ballot_data.election_id:
+        raise HTTPException(status_code=400, detail="Election mismatch")
+
+    if not ballot_data.candidate_ids:
+        raise HTTPException(status_code=400, detail="Empty ballot")
+    if len(set(ballot_data.candidate_ids)) != len(ballot_data.candidate_ids):
+        raise HTTPException(status_code=400, detail="Duplicate candidate")
+
+    # Verify candidates belong to election, keeping the submitted order (ranking)
+    candidates_by_id = {
+        c.id: c
+        for c in db.query(Candidate).filter(
+            Candidate.id.in_(ballot_data.candidate_ids),
+            Candidate.election_id == ballot_data.election_id,
+        )
+    }
+    candidates = [candidates_by_id.get(cid) for cid in ballot_data.candidate_ids]
+    if any(c is None or c.position is None for c in candidates):
+        raise HTTPException(status_code=400, detail="Invalid candidate")
+
+    # Plurality ballots carry at most one candidate per role
+    election = db.query(Election).filter(Election.id == ballot_data.election_id).first()
+    ranked = election.vote_type == VoteType.RANKED
+    if not ranked and len({c.role for c in candidates}) != len(candidates):
+        raise HTTPException(status_code=400, detail="Only one candidate per role allowed")
+
+    if _has_voted(db, ballot_data.election_id, queue_entry.user_id):
+        raise HTTPException(status_code=400, detail="Already voted in this election")
+
+    if not _claim_queue_entry(db, queue_entry):
+        return _replay_or_reject(db, token, idempotency_key, body_hash, "Vote already cast")
 
-        query = query.filter(
-            or_(
-                Election.department_id == None,  # All-department elections
-                Election.department_id == current_user.department_id,
+    ballot = Ballot(
+        election_id=ballot_data.election_id,
+        user_id=queue_entry.user_id,
+        choices=encode_choices([c.position for c in candidates]),
+    )
+    db.add(ballot)
+
+    # Update candidate vote counts (first preferences for ranked ballots)
+    for candidate in candidates[:1] if ranked else candidates:
+        candidate.vote_count = Candidate.vote_count + 1
+
+    def response() -> BallotResponse:
+        return BallotResponse(
+            id=ballot.id,
+            election_id=ballot.election_id,
+            user_id=ballot.user_id,
+            candidate_ids=[c.id for c in candidates],
+            cast_at=ballot.cast_at,
+        )
+
+    if idempotency_key:
+        return _commit_idempotent(
+            db, token, idempotency_key, body_hash,
+            lambda: dumps(response().model_dump(mode="json")),
+            ballot_data.election_id,
+        )
+
+    db.commit()
+    metrics.votes_cast.inc(election_id=ballot_data.election_id)
+    db.refresh(ballot)
+    return response()
+
+
+def _has_voted(db: Session, election_id, user_id) -> bool:
+    """Whether the user already has a vote or a ballot in the election (one query)"""
+    return db.query(or_(
+        exists().where(Vote.election_id == election_id, Vote.user_id == user_id),
+        exists().where(Ballot.election_id == election_id, Ballot.user_id == user_id),
+    )).scalar()
+
+
+def _claim_queue_entry(db: Session, queue_entry: VotingQueue) -> bool:
+    """
+    Mark the token used, unless a concurrent cast or ballot already has.
+
+    The status check and the write are one statement, so on PostgreSQL the
+    second of two racing requests waits for the first and then finds nothing
+    to claim, rather than both committing on a status read before either wrote.
+    """
+    return bool(db.execute(
+        update(VotingQueue)
+        .where(VotingQueue.id == queue_entry.id, VotingQueue.status != QueueStatus.VOTED)
+        .values(status=QueueStatus.VOTED)
+    ).rowcount)
+
+
+def _replay_or_reject(db: Session, token: str, key: Optional[str], body_hash: Optional[str], detail: str) -> Response:
+    """The stored response if a concurrent request with the same key got there first, else a 400"""
+    replay = key and idempotency_store.lookup(db, token, key, body_hash)
+    if replay:
+        return replay
+    raise HTTPException(status_code=400, detail=detail)
+
+
+def _commit_idempotent(db: Session, token: str, key: str, body_hash: str, render: Callable[[], bytes],
+                       election_id) -> Response:
+    """
+    Commit a cast together with its idempotency record and return the stored response.
+    `render` serializes the response once the flush has assigned ids and timestamps.
+    """
+    try:
+        # A concurrent cast that committed first makes the flush fail, not just the commit
+        db.flush()
+        body = render()
+        cache_key, entry = idempotency_store.store(db, token, key, body_hash, body)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return _replay_or_reject(db, token, key, body_hash, "Already voted in this election")
+    idempotency_store.remember(cache_key, entry)
+    metrics.votes_cast.inc(election_id=election_id)
+    return Response(content=body, media_type="application/json")
+
+
+def _load_active_elections(overrides) -> Elections:
+    """Every active election, paired with its department id (None if campus-wide)"""
+    with dependency_session(get_read_db, overrides) as db:
+        elections = (
+            db.query(Election)
+            .options(
+                joinedload(Election.candidates).options(defer(Candidate.manifesto)),
+                joinedload(Election.department),
             )
+            .filter(Election.status == ElectionStatus.ACTIVE)
+            .all()
         )
+        result = []
+        for election in elections:
+            item = project(election, ELECTION_FIELDS)
+            item["candidates"] = [project(c, DEFAULT_CANDIDATE_FIELDS) for c in election.candidates]
+            item["department"] = project(election.department, DEPARTMENT_FIELDS) if election.department else None
+            result.append((election.department_id, item))
+        return result
 
-    return query.all()
+
+@router.get("/active", response_model=List[ElectionSummary])
+async def get_active_elections_for_student(
+    request: Request, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+):
+    """Get active elections for current student based on department"""
+    # Students see campus-wide elections plus their department's; others see all
+    department_id = None
+    if current_user.role == UserRole.STUDENT and current_user.department_id:
+        department_id = current_user.department_id
+    # Authentication's transaction is done; don't hold its connection if the index is rebuilt
+    db.commit()
+
+    body = await active_election_index.get(
+        department_id, lambda: _load_active_elections(request.app.dependency_overrides)
+    )
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/queue-status/{election_id}")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 from uuid import UUID
 from pydantic import BaseModel, EmailStr
 
@@ -66,7 +66,7 @@ class DepartmentResponse(DepartmentBase):
 
 
 # Election schemas
-from models.election import ElectionStatus
+from models.election import ElectionStatus, VoteType
 
 
 class CandidateBase(BaseModel):
@@ -93,6 +93,7 @@ class ElectionBase(BaseModel):
     title: str
     department_id: Optional[UUID] = None
     status: ElectionStatus = ElectionStatus.PLANNED
+    vote_type: VoteType = VoteType.PLURALITY
     start_date: datetime
     end_date: datetime
     batch_size: int = 60
@@ -115,6 +116,32 @@ class ElectionWithCandidates(ElectionResponse):
     department: Optional[DepartmentResponse] = None
 
 
+class CandidateSummary(BaseModel):
+    """Candidate without the manifesto or vote count, for listings"""
+    id: UUID
+    election_id: UUID
+    name: str
+    role: str
+    photo_url: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class CandidateManifesto(BaseModel):
+    id: UUID
+    manifesto: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ElectionSummary(ElectionResponse):
+    """Election listing entry; manifestos are fetched per candidate"""
+    candidates: List[CandidateSummary] = []
+    department: Optional[DepartmentResponse] = None
+
+
 class ElectionListItem(BaseModel):
     id: UUID
     title: str
@@ -144,6 +171,53 @@ class VoteResponse(BaseModel):
         from_attributes = True
 
 
+# Ballot schemas
+class BallotCreate(BaseModel):
+    election_id: UUID
+    candidate_ids: List[UUID]
+
+
+class BallotResponse(BaseModel):
+    id: UUID
+    election_id: UUID
+    user_id: UUID
+    candidate_ids: List[UUID]
+    cast_at: datetime
+
+
+class CandidateTally(BaseModel):
+    id: UUID
+    name: str
+    votes: int
+
+
+class RoleTally(BaseModel):
+    role: str
+    total: int
+    candidates: List[CandidateTally]
+
+
+class ElectionResults(BaseModel):
+    election_id: UUID
+    total_ballots: int
+    roles: List[RoleTally]
+
+
+class RankedRound(BaseModel):
+    counts: Dict[UUID, float]
+    elected: List[UUID] = []
+    eliminated: Optional[UUID] = None
+
+
+class RankedResults(BaseModel):
+    election_id: UUID
+    seats: int
+    total_ballots: int
+    exhausted: int
+    winners: List[UUID]
+    rounds: List[RankedRound]
+
+
 # Voting Queue schemas
 from models.voting_queue import QueueStatus
 
@@ -244,5 +318,26 @@ class RecentElection(BaseModel):
     status: ElectionStatus
 
 
+class RouteQueryStats(BaseModel):
+    route: str
+    requests: int
+    queries: int
+    db_ms: float
+    avg_queries: float
+    avg_db_ms: float
+    max_queries: int
+    slowest_ms: float
+    slowest_statement: Optional[str] = None
+
+
+class ProfileInfo(BaseModel):
+    name: str
+    method: str
+    route: str
+    duration_ms: int
+    created_at: datetime
+    size_bytes: int
+
+
 # Forward references
 UserWithDepartment.model_rebuild()
@@ -1,4 +1,8 @@
-"""Seed demo data for development"""
+"""
+Seed demo data for development. Run after migrations:
+
+    python migrate.py && python seed.py
+"""
 import os
 import secrets
 import string
@@ -108,7 +112,8 @@ def seed_demo_data():
                 status=ElectionStatus.ACTIVE,
                 start_date=now - timedelta(days=1),
                 end_date=now + timedelta(days=7),
-                batch_size=60
+                batch_size=60,
+                positions_issued=2
             ),
             Election(
                 title="CSE Office Bearer 2026",
@@ -116,7 +121,8 @@ def seed_demo_data():
                 status=ElectionStatus.ACTIVE,
                 start_date=now - timedelta(days=1),
                 end_date=now + timedelta(days=5),
-                batch_size=60
+                batch_size=60,
+                positions_issued=2
             ),
             Election(
                 title="ECE Department Election 2026",
@@ -124,7 +130,8 @@ def seed_demo_data():
                 status=ElectionStatus.ACTIVE,
                 start_date=now,
                 end_date=now + timedelta(days=1),
-                batch_size=60
+                batch_size=60,
+                positions_issued=1
             ),
             Election(
                 title="CSE Department Representative",
@@ -132,7 +139,8 @@ def seed_demo_data():
                 status=ElectionStatus.FINISHED,
                 start_date=now - timedelta(days=8),
                 end_date=now - timedelta(days=1),
-                batch_size=60
+                batch_size=60,
+                positions_issued=0
             ),
         ]
         for election in elections:
@@ -148,7 +156,8 @@ def seed_demo_data():
                 role="President",
                 photo_url="https://i.pravatar.cc/150?u=michael",
                 manifesto="A campus for everyone. Better facilities, more events.",
-                vote_count=0
+                vote_count=0,
+                position=0
             ),
             Candidate(
                 election_id=elections[0].id,
@@ -156,7 +165,8 @@ def seed_demo_data():
                 role="President",
                 photo_url="https://i.pravatar.cc/150?u=sarah",
                 manifesto="Innovation and inclusion. Let's build the future together.",
-                vote_count=0
+                vote_count=0,
+                position=1
             ),
             # CSE Office Bearer
             Candidate(
@@ -165,7 +175,8 @@ def seed_demo_data():
                 role="Secretary",
                 photo_url="https://i.pravatar.cc/150?u=priya",
                 manifesto="Better labs, more hackathons, industry connections.",
-                vote_count=0
+                vote_count=0,
+                position=0
             ),
             Candidate(
                 election_id=elections[1].id,
@@ -173,7 +184,8 @@ def seed_demo_data():
                 role="Secretary",
                 photo_url="https://i.pravatar.cc/150?u=raj",
                 manifesto="Student welfare first. More coding competitions.",
-                vote_count=0
+                vote_count=0,
+                position=1
             ),
             # ECE Department Election
             Candidate(
@@ -182,7 +194,8 @@ def seed_demo_data():
                 role="President",
                 photo_url="https://i.pravatar.cc/150?u=surya",
                 manifesto="No manifesto provided.",
-                vote_count=0
+                vote_count=0,
+                position=0
             ),
         ]
         for candidate in candidates:
@@ -218,7 +231,8 @@ def seed_demo_data():
 
 
 if __name__ == "__main__":
-    from database import Base, engine
-    print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    from database import check_schema_version, engine
+
+    logging.basicConfig(level=logging.INFO)
+    check_schema_version(engine)
     seed_demo_data()
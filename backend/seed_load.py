@@ -0,0 +1,312 @@
+"""
+Generate a large synthetic dataset for load testing. Run after migrations:
+
+    python migrate.py && python seed_load.py --students 100000 --elections 10 --clubs 200 --seed 42
+
+Rows are built column by column and written with bulk executemany, and every
+synthetic student shares one bcrypt hash of LOAD_PASSWORD computed once per run.
+The same --seed and --anchor always produce the same rows. Turnout, candidate
+popularity, vote timing and club sizes are skewed rather than uniform.
+"""
+import argparse
+import base64
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+import numpy as np
+from sqlalchemy import insert, select, update
+
+from models import (
+    GUID, Candidate, Club, ClubMember, ClubStatus, Department, Election, ElectionStatus,
+    MemberRole, QueueStatus, TableVersion, TRACKED_TABLES, User, UserRole, Vote, VotingQueue,
+)
+
+logger = logging.getLogger(__name__)
+
+LOAD_PASSWORD = "password123"
+CHUNK_SIZE = 50_000
+
+# (code, name, relative enrolment)
+DEPARTMENTS = [
+    ("CSE", "Computer Science & Engineering", 450),
+    ("ECE", "Electronics & Communication Engineering", 400),
+    ("MECH", "Mechanical Engineering", 350),
+    ("CIVIL", "Civil Engineering", 300),
+    ("ARTS", "Arts & Humanities", 200),
+    ("SCI", "Basic Sciences", 150),
+]
+ROLES = ["President", "Vice President", "Secretary", "Treasurer"]
+CLUB_CATEGORIES = ["Technical", "Cultural", "Sports", "Literary", "Social Service"]
+CLUB_ROLES = [MemberRole.PRESIDENT, MemberRole.VICE_PRESIDENT, MemberRole.SECRETARY, MemberRole.TREASURER]
+QUEUE_STATUSES = [QueueStatus.VOTED, QueueStatus.EXPIRED, QueueStatus.NOTIFIED, QueueStatus.PENDING]
+
+
+def _uuids(rng: np.random.Generator, n: int) -> List[uuid.UUID]:
+    raw = rng.bytes(16 * n)
+    return [uuid.UUID(bytes=raw[i:i + 16], version=4) for i in range(0, 16 * n, 16)]
+
+
+def _tokens(rng: np.random.Generator, n: int) -> List[str]:
+    raw = rng.bytes(24 * n)
+    return [base64.urlsafe_b64encode(raw[i:i + 24]).decode() for i in range(0, 24 * n, 24)]
+
+
+def _columns(*names) -> Dict[str, list]:
+    return {name: [] for name in names}
+
+
+def _insert(conn, model, columns: Dict[str, list]) -> int:
+    """
+    Bulk insert column lists. Bind processors are applied per column up front and
+    the compiled INSERT goes straight to the driver's executemany, skipping
+    SQLAlchemy's per-row parameter handling.
+    """
+    table = model.__table__
+    names = list(columns)
+    count = len(columns[names[0]])
+    if not count:
+        return 0
+
+    dialect = conn.dialect
+    processed = {}
+    for name in names:
+        values = columns[name]
+        if isinstance(table.c[name].type, GUID) and dialect.name != "postgresql":
+            # Same 16 bytes GUID would bind, without the per-value type checks
+            processed[name] = [None if v is None else v.int.to_bytes(16, "big") for v in values]
+            continue
+        processor = table.c[name].type.bind_processor(dialect)
+        processed[name] = [processor(v) for v in values] if processor else values
+
+    compiled = insert(table).compile(dialect=dialect, column_keys=names)
+    # Columns left out get their scalar Python-side default, as Core would render it
+    for name in compiled.binds:
+        if name not in processed:
+            processor = table.c[name].type.bind_processor(dialect)
+            value = table.c[name].default.arg
+            processed[name] = [processor(value) if processor else value] * count
+    if compiled.positional:
+        order = compiled.positiontup
+        params = list(zip(*(processed[name] for name in order)))
+        # Inserting in primary key order keeps B-tree writes sequential
+        key = order.index("id")
+        params.sort(key=lambda row: row[key])
+    else:
+        params = [dict(zip(names, row)) for row in zip(*(processed[name] for name in names))]
+    for start in range(0, count, CHUNK_SIZE):
+        conn.exec_driver_sql(str(compiled), params[start:start + CHUNK_SIZE])
+    return count
+
+
+def _departments(conn, rng, students: int):
+    """Department ids and each synthetic student's department index"""
+    weights = np.array([w for _, _, w in DEPARTMENTS], dtype=np.float64)
+    assignment = rng.choice(len(DEPARTMENTS), size=students, p=weights / weights.sum())
+    sizes = np.bincount(assignment, minlength=len(DEPARTMENTS))
+
+    existing = dict(conn.execute(select(Department.code, Department.id)).all())
+    ids = []
+    for (code, name, _), size in zip(DEPARTMENTS, sizes.tolist()):
+        if code in existing:
+            conn.execute(
+                update(Department).where(Department.id == existing[code])
+                .values(total_students=Department.total_students + size)
+            )
+            ids.append(existing[code])
+        else:
+            department_id = uuid.UUID(bytes=rng.bytes(16), version=4)
+            conn.execute(insert(Department.__table__).values(
+                id=department_id, code=code, name=name, total_students=size
+            ))
+            ids.append(department_id)
+    return ids, assignment
+
+
+def _election_window(rng, status, anchor):
+    if status == ElectionStatus.FINISHED:
+        start = anchor - timedelta(days=int(rng.integers(10, 300)))
+        return start, start + timedelta(days=int(rng.integers(1, 4)))
+    if status == ElectionStatus.ACTIVE:
+        start = anchor - timedelta(hours=int(rng.integers(1, 48)))
+        return start, anchor + timedelta(days=int(rng.integers(1, 6)))
+    start = anchor + timedelta(days=int(rng.integers(5, 60)))
+    return start, start + timedelta(days=int(rng.integers(1, 4)))
+
+
+def generate(engine, students: int, elections: int, clubs: int, seed: int = 0,
+             anchor: datetime = None, batch_size: int = 60) -> Dict[str, int]:
+    """Insert a synthetic dataset and return the number of rows written per table"""
+    from routers.auth import get_password_hash
+
+    rng = np.random.default_rng(seed)
+    anchor = anchor or datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    password_hash = get_password_hash(LOAD_PASSWORD)
+    counts = {}
+
+    with engine.begin() as conn:
+        department_ids, assignment = _departments(conn, rng, students)
+
+        # Students
+        user_ids = _uuids(rng, students)
+        joined_days = rng.integers(0, 4 * 365, size=students).tolist()
+        counts["users"] = _insert(conn, User, {
+            "id": user_ids,
+            "student_id": [f"L{i:07d}" for i in range(students)],
+            "email": [f"l{i:07d}@load.campusvote.edu" for i in range(students)],
+            "password_hash": [password_hash] * students,
+            "name": [f"Load Student {i}" for i in range(students)],
+            "role": [UserRole.STUDENT] * students,
+            "department_id": [department_ids[d] for d in assignment.tolist()],
+            "created_at": [anchor - timedelta(days=d) for d in joined_days],
+        })
+
+        # Elections, candidates, queue entries and votes
+        election_cols = _columns(
+            "id", "title", "department_id", "status", "start_date", "end_date", "batch_size", "created_at",
+            "positions_issued",
+        )
+        candidate_cols = _columns("id", "election_id", "name", "role", "manifesto", "vote_count", "position")
+        queue_cols = _columns(
+            "id", "election_id", "user_id", "status", "voting_token",
+            "batch_number", "notified_at", "expires_at", "created_at"
+        )
+        vote_cols = _columns("id", "election_id", "user_id", "candidate_id", "voted_at")
+
+        status_choices = [ElectionStatus.FINISHED, ElectionStatus.ACTIVE, ElectionStatus.PLANNED]
+        picks = rng.choice(len(status_choices), size=elections, p=[0.5, 0.3, 0.2])
+        for e, status in enumerate(status_choices[p] for p in picks.tolist()):
+            election_id = uuid.UUID(bytes=rng.bytes(16), version=4)
+            # About a third of elections are open to every department
+            department = None if rng.random() < 0.3 else int(rng.integers(len(DEPARTMENTS)))
+            start, end = _election_window(rng, status, anchor)
+            for name, value in (
+                ("id", election_id), ("title", f"Load Election {e}"),
+                ("department_id", None if department is None else department_ids[department]),
+                ("status", status), ("start_date", start), ("end_date", end),
+                ("batch_size", batch_size), ("created_at", start - timedelta(days=7)),
+            ):
+                election_cols[name].append(value)
+
+            num_candidates = int(rng.integers(2, 7))
+            candidate_ids = _uuids(rng, num_candidates)
+            election_cols["positions_issued"].append(num_candidates)
+            vote_counts = [0] * num_candidates
+
+            if department is None:
+                eligible = np.arange(students)
+            else:
+                eligible = np.flatnonzero(assignment == department)
+
+            if status != ElectionStatus.PLANNED and eligible.size:
+                n = eligible.size
+                batches = np.arange(n) // batch_size + 1
+                if status == ElectionStatus.FINISHED:
+                    notified_batches = int(batches[-1])
+                    turnout = rng.beta(5, 4)
+                else:
+                    notified_batches = int(rng.integers(1, batches[-1] + 1))
+                    turnout = rng.beta(2, 6)
+                notified = batches <= notified_batches
+                voted = notified & (rng.random(n) < turnout)
+
+                # Index into QUEUE_STATUSES
+                queue_status = np.where(
+                    voted, 0, np.where(status == ElectionStatus.FINISHED, 1, np.where(notified, 2, 3))
+                )
+                members = [user_ids[i] for i in eligible.tolist()]
+                queue_cols["id"].extend(_uuids(rng, n))
+                queue_cols["election_id"].extend([election_id] * n)
+                queue_cols["user_id"].extend(members)
+                queue_cols["status"].extend(QUEUE_STATUSES[s] for s in queue_status.tolist())
+                queue_cols["voting_token"].extend(_tokens(rng, n))
+                queue_cols["batch_number"].extend(batches.tolist())
+                queue_cols["notified_at"].extend(start if flag else None for flag in notified.tolist())
+                queue_cols["expires_at"].extend([anchor + timedelta(hours=24)] * n)
+                queue_cols["created_at"].extend([start] * n)
+
+                # A few candidates attract most of the votes
+                popularity = rng.dirichlet(np.full(num_candidates, 0.7))
+                voter_index = np.flatnonzero(voted)
+                choices = rng.choice(num_candidates, size=voter_index.size, p=popularity)
+                vote_counts = np.bincount(choices, minlength=num_candidates).tolist()
+                # Most ballots arrive early in the voting window
+                window = (min(end, anchor) - start).total_seconds()
+                delays = np.minimum(rng.exponential(window / 4, size=voter_index.size), window).tolist()
+                vote_cols["id"].extend(_uuids(rng, voter_index.size))
+                vote_cols["election_id"].extend([election_id] * voter_index.size)
+                vote_cols["user_id"].extend(members[i] for i in voter_index.tolist())
+                vote_cols["candidate_id"].extend(candidate_ids[c] for c in choices.tolist())
+                vote_cols["voted_at"].extend(start + timedelta(seconds=d) for d in delays)
+
+            for c in range(num_candidates):
+                for name, value in (
+                    ("id", candidate_ids[c]), ("election_id", election_id),
+                    ("name", f"Candidate {e}-{c}"), ("role", ROLES[c % len(ROLES)]),
+                    ("manifesto", f"Manifesto of candidate {e}-{c}."),
+                    ("vote_count", vote_counts[c]), ("position", c),
+                ):
+                    candidate_cols[name].append(value)
+
+        counts["elections"] = _insert(conn, Election, election_cols)
+        counts["candidates"] = _insert(conn, Candidate, candidate_cols)
+        counts["voting_queue"] = _insert(conn, VotingQueue, queue_cols)
+        counts["votes"] = _insert(conn, Vote, vote_cols)
+
+        # Clubs with heavy-tailed sizes; member_count is set directly since bulk
+        # inserts bypass the ORM events that maintain it
+        sizes = np.minimum(rng.zipf(1.6, size=clubs) * 5, min(500, students)).tolist()
+        club_cols = _columns("id", "name", "category", "description", "status", "created_at", "member_count")
+        member_cols = _columns("id", "club_id", "user_id", "role", "joined_at")
+        club_ids = _uuids(rng, clubs)
+        for k, size in enumerate(sizes):
+            for name, value in (
+                ("id", club_ids[k]), ("name", f"Load Club {k}"),
+                ("category", CLUB_CATEGORIES[k % len(CLUB_CATEGORIES)]),
+                ("description", f"Synthetic club {k}"),
+                ("status", ClubStatus.INACTIVE if rng.random() < 0.1 else ClubStatus.ACTIVE),
+                ("created_at", anchor - timedelta(days=int(rng.integers(30, 1000)))),
+                ("member_count", size),
+            ):
+                club_cols[name].append(value)
+            members = rng.choice(students, size=size, replace=False).tolist()
+            joined = rng.integers(0, 1000, size=size).tolist()
+            member_cols["id"].extend(_uuids(rng, size))
+            member_cols["club_id"].extend([club_ids[k]] * size)
+            member_cols["user_id"].extend(user_ids[m] for m in members)
+            member_cols["role"].extend(CLUB_ROLES[r] if r < len(CLUB_ROLES) else MemberRole.MEMBER for r in range(size))
+            member_cols["joined_at"].extend(anchor - timedelta(days=d) for d in joined)
+        counts["clubs"] = _insert(conn, Club, club_cols)
+        counts["club_members"] = _insert(conn, ClubMember, member_cols)
+
+        # Invalidate cached listings, as an ORM flush would
+        conn.execute(
+            update(TableVersion).where(TableVersion.name.in_(TRACKED_TABLES))
+            .values(version=TableVersion.version + 1)
+        )
+
+    return counts
+
+
+if __name__ == "__main__":
+    from database import check_schema_version, engine
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=100_000)
+    parser.add_argument("--elections", type=int, default=10)
+    parser.add_argument("--clubs", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--anchor", type=datetime.fromisoformat, default=None,
+                        help="Reference date for generated timestamps (default: today, UTC)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    check_schema_version(engine)
+    start = time.perf_counter()
+    counts = generate(engine, args.students, args.elections, args.clubs, args.seed, args.anchor)
+    elapsed = time.perf_counter() - start
+    for table, count in counts.items():
+        logger.info(f"{table}: {count} rows")
+    logger.info(f"Generated {sum(counts.values())} rows in {elapsed:.1f}s")
@@ -0,0 +1,83 @@
+"""
+In-memory index of active elections by department, for /voting/active.
+
+The index maps each department with department-only active elections to the
+serialized list a student of that department sees (campus-wide elections
+plus their department's), with two extra buckets: ALL_DEPARTMENTS (every
+active election, for admins and students without a department) and
+CAMPUS_WIDE (for departments with nothing of their own). A request is then
+a dict lookup.
+
+The index is rebuilt from one query, never more than one build at a time
+(SingleFlight). Writes to elections, candidates or departments (status
+changes, new or removed candidates, renames) drop it, and the next request
+waits for a rebuild. Votes only move counters the index does not hold, so
+they bump no table version and never reach it (see COUNTER_COLUMNS in
+models/table_version.py).
+"""
+from typing import Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+from services.coalesce import SingleFlight
+from services.invalidation import invalidation_bus
+from services.serialization import dumps
+
+ALL_DEPARTMENTS = "all"
+CAMPUS_WIDE = "campus"
+
+# Writes to these tables drop the index
+INDEX_TABLES = {"elections", "candidates", "departments"}
+
+# (department_id or None for campus-wide, serialized-ready election dict), in display order
+Elections = List[Tuple[Optional[Hashable], dict]]
+
+
+def build_buckets(elections: Elections) -> Dict[Hashable, bytes]:
+    """Serialize the lists each department sees"""
+    department_ids = dict.fromkeys(d for d, _ in elections if d is not None)
+    buckets = {
+        ALL_DEPARTMENTS: dumps([item for _, item in elections]),
+        CAMPUS_WIDE: dumps([item for d, item in elections if d is None]),
+    }
+    for department_id in department_ids:
+        buckets[department_id] = dumps([item for d, item in elections if d is None or d == department_id])
+    return buckets
+
+
+class ActiveElectionIndex:
+    def __init__(self):
+        self._buckets: Optional[Dict[Hashable, bytes]] = None
+        # Bumped by writes; a build that raced with one isn't installed
+        self._generation = 0
+        self._builds = SingleFlight("active_elections")
+
+    def invalidate(self, tables: Set[str]) -> None:
+        self._generation += 1
+        self._buckets = None
+
+    async def get(self, department_id: Optional[Hashable], load: Callable[[], Elections]) -> bytes:
+        """
+        The serialized active elections for a student of `department_id`
+        (None: all of them). `load` queries the elections when a build is due.
+        """
+        buckets = self._buckets
+        if buckets is None:
+            buckets = await self._build(load)
+
+        if department_id is None:
+            return buckets[ALL_DEPARTMENTS]
+        return buckets.get(department_id, buckets[CAMPUS_WIDE])
+
+    async def _build(self, load: Callable[[], Elections]) -> Dict[Hashable, bytes]:
+        generation = self._generation
+        # Keyed by generation: after a write, don't join a build that started before it
+        buckets = await self._builds.do(generation, lambda: build_buckets(load()))
+        if generation == self._generation:
+            self._buckets = buckets
+        return buckets
+
+    def clear(self) -> None:
+        self.invalidate(INDEX_TABLES)
+
+
+active_election_index = ActiveElectionIndex()
+invalidation_bus.subscribe(INDEX_TABLES, active_election_index.invalidate)
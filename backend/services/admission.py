@@ -0,0 +1,199 @@
+"""
+Priority-aware admission control.
+
+Every request is sorted into a route class by path. All classes share one
+concurrency limit, but lower classes may only fill part of it, so under load
+dashboards and club browsing are turned away (503 + Retry-After) well before
+vote casting is:
+
+    critical    /voting/cast, /voting/ballot, /voting/validate   100% of the limit, queues
+    auth        /auth/*                                          80%, queues
+    default     everything else                                  60%, queues
+    background  /dashboard/*, /clubs*, /profiles*               40%, rejected at once
+
+Queued requests are admitted highest class first and give up after
+ADMISSION_QUEUE_TIMEOUT_MS.
+
+The limit adapts with AIMD on the latency of critical requests: +1/limit per
+request that finishes within ADMISSION_TARGET_LATENCY_MS, x0.9 (at most once
+per target interval) when one doesn't. It never exceeds the connection pool
+(DB_POOL_SIZE + DB_MAX_OVERFLOW by default): handlers run sync queries on the
+event loop, so a request blocked on an exhausted pool stalls the very loop
+that would return connections to it.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import metrics
+from config import settings
+from services.serialization import dumps
+
+CRITICAL, AUTH, DEFAULT, BACKGROUND = "critical", "auth", "default", "background"
+PRIORITY = [CRITICAL, AUTH, DEFAULT, BACKGROUND]
+
+# Share of the concurrency limit each class may fill
+CLASS_SHARES = {CRITICAL: 1.0, AUTH: 0.8, DEFAULT: 0.6, BACKGROUND: 0.4}
+# Classes that wait for a slot instead of being rejected straight away
+QUEUED_CLASSES = {CRITICAL, AUTH, DEFAULT}
+RETRY_AFTER = {CRITICAL: 1, AUTH: 2, DEFAULT: 2, BACKGROUND: 10}
+
+ROUTE_CLASSES = [
+    ("/voting/cast/", CRITICAL),
+    ("/voting/ballot/", CRITICAL),
+    ("/voting/validate/", CRITICAL),
+    ("/auth/", AUTH),
+    ("/dashboard/", BACKGROUND),
+    ("/clubs", BACKGROUND),
+    ("/profiles", BACKGROUND),
+]
+# Never counted or shed (/metrics must stay scrapable when the server is busiest)
+EXEMPT_PATHS = {"/", "/docs", "/redoc", "/openapi.json", "/metrics"}
+
+DECREASE_FACTOR = 0.9
+
+
+def route_class(path: str) -> str:
+    for prefix, cls in ROUTE_CLASSES:
+        if path.startswith(prefix):
+            return cls
+    return DEFAULT
+
+
+class AdmissionController:
+    def __init__(self, max_limit: int, min_limit: int, target_latency_ms: float, queue_timeout_ms: float):
+        self.max_limit = max_limit
+        self.min_limit = min(min_limit, max_limit)
+        self.limit = float(max_limit)
+        self.target_latency = target_latency_ms / 1000
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.in_flight = 0
+        self.in_flight_by_class: Dict[str, int] = {cls: 0 for cls in PRIORITY}
+        self._waiters: Dict[str, Deque[asyncio.Future]] = {cls: deque() for cls in PRIORITY}
+        self._last_decrease = 0.0
+
+    def _has_room(self, cls: str) -> bool:
+        cap = int(self.limit * CLASS_SHARES[cls])
+        if cls == CRITICAL:
+            cap = max(cap, 1)
+        return self.in_flight < cap
+
+    def _admit(self, cls: str) -> None:
+        self.in_flight += 1
+        self.in_flight_by_class[cls] += 1
+
+    def _waiting_ahead(self, cls: str) -> bool:
+        """Whether requests of this class or a higher one are already queued"""
+        for other in PRIORITY[:PRIORITY.index(cls) + 1]:
+            if self._waiters[other]:
+                return True
+        return False
+
+    async def acquire(self, cls: str) -> bool:
+        """Take a slot for a request of class `cls`; False if it should be rejected"""
+        if not self._waiting_ahead(cls) and self._has_room(cls):
+            self._admit(cls)
+            return True
+        if cls not in QUEUED_CLASSES:
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[cls].append(future)
+        try:
+            return await asyncio.wait_for(future, self.queue_timeout)
+        except asyncio.TimeoutError:
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Admitted just as the request was cancelled
+                self.release(cls)
+            raise
+        finally:
+            if future in self._waiters[cls]:
+                self._waiters[cls].remove(future)
+
+    def release(self, cls: str, latency: Optional[float] = None) -> None:
+        self.in_flight -= 1
+        self.in_flight_by_class[cls] -= 1
+        if latency is not None and cls == CRITICAL:
+            self._adjust(latency)
+        self._wake()
+
+    def _adjust(self, latency: float) -> None:
+        if latency > self.target_latency:
+            now = time.monotonic()
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(self.min_limit, self.limit * DECREASE_FACTOR)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _wake(self) -> None:
+        """Hand free slots to queued requests, highest class first"""
+        for cls in PRIORITY:
+            waiters = self._waiters[cls]
+            while waiters and self._has_room(cls):
+                future = waiters.popleft()
+                if not future.done():
+                    self._admit(cls)
+                    future.set_result(True)
+            if waiters:
+                # Lower classes wait behind this one
+                return
+
+    def stats(self):
+        return {(cls,): count for cls, count in self.in_flight_by_class.items()}
+
+
+admission = AdmissionController(
+    max_limit=settings.ADMISSION_MAX_CONCURRENCY or settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW,
+    min_limit=settings.ADMISSION_MIN_CONCURRENCY,
+    target_latency_ms=settings.ADMISSION_TARGET_LATENCY_MS,
+    queue_timeout_ms=settings.ADMISSION_QUEUE_TIMEOUT_MS,
+)
+metrics.admission_in_flight.set_function(admission.stats)
+metrics.admission_limit.set_function(lambda: {(): admission.limit})
+
+
+class AdmissionMiddleware:
+    """Admits, queues or sheds requests (no-op when ADMISSION_ENABLED is off)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not settings.ADMISSION_ENABLED or scope["type"] != "http"
+            or scope["method"] == "OPTIONS" or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        cls = route_class(scope["path"])
+        if not await admission.acquire(cls):
+            metrics.admission_rejected.inc(route_class=cls)
+            await reject(send, RETRY_AFTER[cls])
+            return
+
+        start = time.perf_counter()
+        latency = None
+        try:
+            await self.app(scope, receive, send)
+            latency = time.perf_counter() - start
+        finally:
+            admission.release(cls, latency)
+
+
+async def reject(send, retry_after: int) -> None:
+    body = dumps({"detail": "Server is busy, please retry shortly"})
+    await send({
+        "type": "http.response.start",
+        "status": 503,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,43 @@
+"""Club maintenance tasks"""
+import logging
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from models import Club, ClubMember
+
+logger = logging.getLogger(__name__)
+
+
+def repair_member_counts(db: Session) -> int:
+    """
+    Recompute the denormalized Club.member_count from club_members.
+    Only drifted rows are rewritten. Returns the number of clubs fixed.
+    """
+    actual = (
+        select(func.count(ClubMember.id))
+        .where(ClubMember.club_id == Club.id)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(Club)
+        .where(Club.member_count != actual)
+        .values(member_count=actual)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        logger.warning(f"Repaired member_count for {result.rowcount} clubs")
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    from database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        fixed = repair_member_counts(db)
+        print(f"Repaired member_count for {fixed} clubs")
+    finally:
+        db.close()
@@ -0,0 +1,60 @@
+"""
+Single-flight coalescing of identical concurrent loads.
+
+When an election opens, hundreds of voters ask for the same election within
+the same second. SingleFlight.do(key, load) runs `load` once per key at a
+time, in a worker thread so the event loop keeps accepting requests, and
+hands its result (or exception) to every caller that asked for that key
+meanwhile. Nothing is kept once the load finishes: callers after it start a
+new one, so results are never staler than a request would see anyway.
+
+Callers give up after COALESCE_TIMEOUT_MS with 503 + Retry-After; the load
+itself carries on for the others. Its SQL is counted against the request
+that started it.
+"""
+import asyncio
+import functools
+from typing import Callable, Dict, Hashable, Optional, TypeVar
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+import metrics
+from config import settings
+
+T = TypeVar("T")
+
+LEADER, FOLLOWER = "leader", "follower"
+
+
+class SingleFlight:
+    def __init__(self, name: str, timeout_ms: Optional[float] = None):
+        self.name = name
+        self.timeout = (timeout_ms or settings.COALESCE_TIMEOUT_MS) / 1000
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, load: Callable[[], T]) -> T:
+        """The result of `load()`, shared with concurrent callers for the same key"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(run_in_threadpool(load))
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+            metrics.coalesce_requests.inc(load=self.name, role=LEADER)
+        else:
+            metrics.coalesce_requests.inc(load=self.name, role=FOLLOWER)
+
+        try:
+            # Shielded: one caller timing out or disconnecting doesn't cancel the load for the rest
+            return await asyncio.wait_for(asyncio.shield(task), self.timeout)
+        except asyncio.TimeoutError:
+            metrics.coalesce_timeouts.inc(load=self.name)
+            raise HTTPException(status_code=503, detail="Request timed out, please retry",
+                                headers={"Retry-After": "1"})
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved even if every caller timed out
+            task.exception()
@@ -4,10 +4,9 @@ import logging
 from typing import List
 from datetime import datetime
 
-import resend
-
 from sqlalchemy.orm import joinedload
 
+import metrics
 from config import settings
 from database import SessionLocal
 from models import Election, VotingQueue, QueueStatus
@@ -82,8 +81,10 @@ def send_voting_emails_bg(election_id, batch_number: int):
                 entry.status = QueueStatus.NOTIFIED
                 entry.notified_at = datetime.utcnow()
                 sent_count += 1
+                metrics.emails_sent.inc()
 
             except Exception as e:
+                metrics.email_failures.inc()
                 logger.error(f"Failed to send email to {entry.user.email}: {e}")
 
         db.commit()
@@ -140,29 +141,11 @@ def send_voting_emails(db, queue_entries: List, election) -> int:
             entry.status = QueueStatus.NOTIFIED
             entry.notified_at = datetime.utcnow()
             sent_count += 1
+            metrics.emails_sent.inc()
 
         except Exception as e:
+            metrics.email_failures.inc()
             logger.error(f"Failed to send email to {entry.user.email}: {e}")
 
     db.commit()
     return sent_count
-
-
-def send_voting_emails_bg(queue_entry_ids: List[UUID], election_id: UUID):
-    """Background task to send voting emails"""
-    from models import VotingQueue, Election
-
-    db = SessionLocal()
-    try:
-        election = db.query(Election).filter(Election.id == election_id).first()
-        if not election:
-            logger.error(f"Election {election_id} not found in background task")
-            return
-
-        queue_entries = db.query(VotingQueue).filter(VotingQueue.id.in_(queue_entry_ids)).all()
-        logger.info(f"Processing background email task for {len(queue_entries)} entries")
-        send_voting_emails(db, queue_entries, election)
-    except Exception as e:
-        logger.error(f"Background email task failed: {e}")
-    finally:
-        db.close()
@@ -0,0 +1,50 @@
+"""Bounded worker pool for bcrypt so password checks don't block the event loop"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import metrics
+from config import settings
+
+
+class HashingPool:
+    """
+    Runs CPU-bound hashing on a fixed number of threads (bcrypt releases the GIL).
+    Tracks busy and queued jobs so saturation shows up in /metrics.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.busy = 0
+        self.queued = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _run(self, fn: Callable, *args):
+        with self._lock:
+            self.queued -= 1
+            self.busy += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self.busy -= 1
+
+    async def run(self, fn: Callable, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="bcrypt")
+        with self._lock:
+            self.queued += 1
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._run, fn, *args)
+
+    def stats(self):
+        return {
+            ("busy",): self.busy,
+            ("idle",): self.max_workers - self.busy,
+            ("queued",): self.queued,
+        }
+
+
+hashing_pool = HashingPool(settings.BCRYPT_WORKERS)
+metrics.bcrypt_workers.set_function(hashing_pool.stats)
@@ -0,0 +1,80 @@
+"""
+Idempotency-Key support for vote casting.
+
+A successful cast stores its response body under (voting token, key) in the
+same transaction as the vote, and in a bounded in-process LRU. A retry with
+the same key gets that body back, marked `Idempotent-Replayed: true`, without
+re-running validation or touching the votes table. Records older than
+IDEMPOTENCY_TTL_HOURS are ignored and pruned.
+"""
+import hashlib
+import random
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Response
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import IdempotencyRecord
+from services.response_cache import ResponseCache
+
+MAX_KEY_LENGTH = 255
+# Fraction of stores that also delete expired records
+PRUNE_PROBABILITY = 0.01
+
+
+def request_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class IdempotencyStore:
+    def __init__(self, max_entries: int):
+        # (token, key) -> (request_hash, status_code, body, created_at)
+        self.cache = ResponseCache(max_entries=max_entries)
+
+    def lookup(self, db: Session, token: str, key: str, body_hash: str) -> Optional[Response]:
+        """The stored response for a retry, or None if this key hasn't succeeded yet"""
+        if len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=422, detail="Idempotency-Key is too long")
+        entry = self.cache.get((token, key))
+        if entry is None:
+            record = db.get(IdempotencyRecord, (token, key))
+            if record is None:
+                return None
+            entry = (record.request_hash, record.status_code, record.body, record.created_at)
+            self.cache.set((token, key), entry)
+
+        stored_hash, status_code, body, created_at = entry
+        if created_at < datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS):
+            return None
+        if stored_hash != body_hash:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was used with a different request")
+        return Response(
+            content=body, status_code=status_code, media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def store(self, db: Session, token: str, key: str, body_hash: str, body: bytes,
+              status_code: int = 200) -> Tuple:
+        """Add the record to the session; call remember() once the transaction commits"""
+        record = IdempotencyRecord(
+            voting_token=token, key=key, request_hash=body_hash,
+            status_code=status_code, body=body, created_at=datetime.utcnow(),
+        )
+        db.add(record)
+        if random.random() < PRUNE_PROBABILITY:
+            prune_expired(db)
+        return (token, key), (body_hash, status_code, body, record.created_at)
+
+    def remember(self, cache_key: Tuple, entry: Tuple) -> None:
+        self.cache.set(cache_key, entry)
+
+
+def prune_expired(db: Session) -> int:
+    cutoff = datetime.utcnow() - timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+    return db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.created_at < cutoff)).rowcount
+
+
+idempotency_store = IdempotencyStore(settings.IDEMPOTENCY_CACHE_SIZE)
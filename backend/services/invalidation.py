@@ -0,0 +1,107 @@
+"""
+Cache invalidation across worker processes.
+
+Every write to a tracked table bumps its row in `table_versions` inside the
+writing transaction (see models/table_version.py). Each worker's bus:
+
+- notifies its own subscribers as soon as such a transaction commits, and
+- polls `table_versions` every CACHE_INVALIDATION_POLL_MS and notifies
+  subscribers of tables whose version moved, which picks up writes made by
+  other workers (or by scripts such as seed_load.py).
+
+Caches elsewhere in this process are therefore stale for at most one poll
+interval after a write in another worker. Polling a single small table works
+the same on SQLite and PostgreSQL and needs no extra connection per worker.
+"""
+import logging
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.table_version import TableVersion, TOUCHED_TABLES_KEY
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidationBus:
+    def __init__(self, poll_interval_ms: int):
+        self.poll_interval = poll_interval_ms / 1000
+        self._subscribers: List[Tuple[FrozenSet[str], Callable]] = []
+        self._versions: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, tables: Iterable[str], callback: Callable[[set], None]) -> None:
+        """Call `callback(changed_tables)` whenever any of `tables` is written"""
+        self._subscribers.append((frozenset(tables), callback))
+
+    def unsubscribe(self, callback: Callable[[set], None]) -> None:
+        self._subscribers = [(t, cb) for t, cb in self._subscribers if cb is not callback]
+
+    def publish(self, tables: Iterable[str]) -> None:
+        """Notify this process's subscribers that `tables` changed"""
+        tables = set(tables)
+        for watched, callback in self._subscribers:
+            changed = watched & tables
+            if changed:
+                try:
+                    callback(changed)
+                except Exception:
+                    logger.exception(f"Cache invalidation callback failed for {sorted(changed)}")
+
+    def poll(self, conn) -> set:
+        """Read table versions and publish the tables that moved since the last poll"""
+        versions = dict(conn.execute(select(TableVersion.name, TableVersion.version)).all())
+        with self._lock:
+            previous, self._versions = self._versions, versions
+        if previous is None:
+            # First poll only sets the baseline; nothing has been cached from older data yet
+            return set()
+        changed = {name for name, version in versions.items() if previous.get(name) != version}
+        if changed:
+            self.publish(changed)
+        return changed
+
+    def start(self, engine) -> None:
+        """Start polling `engine` in a daemon thread (no-op if the poll interval is 0)"""
+        if self.poll_interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(engine,), name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        self._versions = None
+
+    def _run(self, engine):
+        while not self._stop.is_set():
+            try:
+                with engine.connect() as conn:
+                    self.poll(conn)
+            except SQLAlchemyError as e:
+                logger.warning(f"Cache invalidation poll failed: {e}")
+            self._stop.wait(self.poll_interval)
+
+
+invalidation_bus = InvalidationBus(settings.CACHE_INVALIDATION_POLL_MS)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session):
+    touched = session.info.pop(TOUCHED_TABLES_KEY, None)
+    if touched:
+        invalidation_bus.publish(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(TOUCHED_TABLES_KEY, None)
@@ -0,0 +1,56 @@
+"""Keyset (cursor) pagination helpers"""
+import base64
+import json
+import uuid
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(*values) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor"""
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = 2) -> List[str]:
+    """Decode a cursor produced by encode_cursor from a `size`-column sort key"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size or not all(isinstance(v, str) for v in values):
+            raise ValueError
+        return values
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_after(columns, values, descending: bool = False):
+    """
+    WHERE clause selecting rows strictly after `values` in (columns...) order.
+    Expanded as (a > x) OR (a = x AND b > y) ... so it works on every backend.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        value = values[i]
+        step = column < value if descending else column > value
+        clauses.append(and_(*[columns[j] == values[j] for j in range(i)], step))
+    return or_(*clauses)
+
+
+def parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a datetime from a cursor"""
+    try:
+        return datetime.fromisoformat(value) if value is not None else None
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def parse_uuid(value: Optional[str]) -> Optional[uuid.UUID]:
+    """Parse a UUID from a cursor"""
+    try:
+        return uuid.UUID(value) if value is not None else None
+    except (AttributeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
@@ -0,0 +1,208 @@
+"""
+Opt-in sampling profiler for slow requests.
+
+While enabled, a background thread samples every thread's stack each
+PROFILER_INTERVAL_MS and adds it to the counters of all requests in flight.
+When a request finishes over PROFILER_SLOW_MS (or was picked by
+PROFILER_SAMPLE_RATE), its samples are written in collapsed-stack format
+("frame;frame;frame count", readable by flamegraph.pl and speedscope) to a
+bounded ring of files in PROFILER_DIR. Other requests' samples are dropped.
+
+Samples are process-wide, so a profile also shows whatever concurrent
+requests were doing; idle threads (waiting on a lock or in select) are skipped.
+"""
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# (file, function) of a thread's innermost frame when it is parked
+IDLE_FRAMES = {
+    ("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get"), ("thread.py", "_worker"),
+}
+
+PROFILE_SUFFIX = ".folded"
+# The route is stored escaped: bytes other than letters, digits, "." and "-" become _XX (hex)
+_NAME_PATTERN = re.compile(r"^(\d{13})_(\d+)ms_([A-Z]+)_((?:[A-Za-z0-9.-]|_[0-9A-F]{2})*)\.folded$")
+_SLUG_SAFE = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789.-")
+
+
+def collapse(frame) -> Optional[str]:
+    """Root-first "function (file:line)" frames joined by ';', or None for an idle thread"""
+    code = frame.f_code
+    if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+        return None
+    frames = []
+    while frame is not None:
+        code = frame.f_code
+        frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(frames))
+
+
+def profile_name(created: float, duration_ms: float, method: str, route: str) -> str:
+    slug = "".join(chr(b) if b in _SLUG_SAFE else f"_{b:02X}" for b in route.encode())
+    return f"{int(created * 1000):013d}_{int(duration_ms)}ms_{method}_{slug}{PROFILE_SUFFIX}"
+
+
+def parse_profile_name(name: str) -> Optional[Dict]:
+    match = _NAME_PATTERN.match(name)
+    if not match:
+        return None
+    created_ms, duration_ms, method, slug = match.groups()
+    try:
+        route = re.sub(rb"_([0-9A-F]{2})", lambda m: bytes([int(m.group(1), 16)]), slug.encode()).decode()
+    except UnicodeDecodeError:
+        return None
+    return {
+        "name": name,
+        "created_at": datetime.fromtimestamp(int(created_ms) / 1000, tz=timezone.utc),
+        "duration_ms": int(duration_ms),
+        "method": method,
+        "route": route,
+    }
+
+
+class SlowRequestProfiler:
+    def __init__(self, directory: str, slow_ms: float, sample_rate: float,
+                 interval_ms: float, max_profiles: int, enabled: bool = False):
+        self.enabled = enabled
+        self.directory = directory
+        self.slow_ms = slow_ms
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.max_profiles = max_profiles
+        self._active: Dict[int, Counter] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start_request(self) -> Counter:
+        """Begin collecting samples; returns the counter to pass to finish_request"""
+        stacks = Counter()
+        with self._lock:
+            self._active[id(stacks)] = stacks
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return stacks
+
+    def finish_request(self, stacks: Counter, method: str, route: str,
+                       duration_ms: float, sampled: bool = False) -> Optional[str]:
+        """Stop collecting; save the profile if the request was slow or sampled. Returns the file name."""
+        with self._lock:
+            self._active.pop(id(stacks), None)
+            if not self._active:
+                self._wake.clear()
+        if not stacks or (duration_ms < self.slow_ms and not sampled):
+            return None
+        try:
+            return self.save(stacks, method, route, duration_ms)
+        except OSError as e:
+            logger.warning(f"Could not save profile for {method} {route}: {e}")
+            return None
+
+    def should_sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _run(self):
+        own = threading.get_ident()
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                counters = list(self._active.values())
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = collapse(frame)
+                if stack is None:
+                    continue
+                stack = f"{names.get(ident, ident)};{stack}"
+                for counter in counters:
+                    counter[stack] += 1
+
+    def save(self, stacks: Counter, method: str, route: str, duration_ms: float) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        name = profile_name(time.time(), duration_ms, method, route)
+        path = os.path.join(self.directory, name)
+        with open(path + ".tmp", "w") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        os.replace(path + ".tmp", path)
+        self._trim()
+        return name
+
+    def _trim(self):
+        """Keep only the newest max_profiles files"""
+        names = sorted(n for n in os.listdir(self.directory) if parse_profile_name(n))
+        for name in names[:max(0, len(names) - self.max_profiles)]:
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+
+    def list_profiles(self) -> List[Dict]:
+        """Stored profiles, newest first"""
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            info = parse_profile_name(name)
+            if info:
+                info["size_bytes"] = os.path.getsize(os.path.join(self.directory, name))
+                profiles.append(info)
+        return profiles
+
+    def profile_path(self, name: str) -> Optional[str]:
+        """Path of a stored profile, or None (names are validated, so no path traversal)"""
+        if not parse_profile_name(name):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+profiler = SlowRequestProfiler(
+    directory=settings.PROFILER_DIR,
+    slow_ms=settings.PROFILER_SLOW_MS,
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    interval_ms=settings.PROFILER_INTERVAL_MS,
+    max_profiles=settings.PROFILER_MAX_PROFILES,
+    enabled=settings.PROFILER_ENABLED,
+)
+
+
+class ProfilerMiddleware:
+    """Profiles requests while profiler.enabled; otherwise a single attribute check"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if not profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        sampled = profiler.should_sample()
+        stacks = profiler.start_request()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            path = getattr(scope.get("route"), "path", None) or "<unmatched>"
+            profiler.finish_request(
+                stacks, scope.get("method", ""), path, (time.perf_counter() - start) * 1000, sampled
+            )
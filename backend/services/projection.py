@@ -0,0 +1,36 @@
+"""Field projection helpers for list endpoints"""
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str], default: Iterable[str]) -> List[str]:
+    """
+    Parse a comma-separated `fields=` parameter into a list of field names.
+    Nested fields use dotted names (e.g. "candidates.name"); "id" is always included.
+    """
+    if not fields:
+        return list(default)
+
+    allowed = set(allowed)
+    selected = ["id"]
+    for name in (f.strip() for f in fields.split(",")):
+        if not name or name in selected:
+            continue
+        if name not in allowed:
+            raise HTTPException(status_code=400, detail=f"Unknown field: {name}")
+        selected.append(name)
+    return selected
+
+
+def nested_fields(selected: List[str], prefix: str, default: Iterable[str]) -> Optional[List[str]]:
+    """
+    Fields selected for a nested object, or None if the object was not requested.
+    A bare prefix (e.g. "candidates") selects the nested object's default fields.
+    """
+    names = [f.split(".", 1)[1] for f in selected if f.startswith(prefix + ".")]
+    if names:
+        return ["id"] + [n for n in names if n != "id"]
+    if prefix in selected:
+        return list(default)
+    return None
@@ -0,0 +1,150 @@
+"""Per-request SQL statement counting and timing"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import settings
+
+# Statements longer than this are truncated in headers and metrics
+STATEMENT_PREVIEW = 200
+
+
+@dataclass
+class QueryStats:
+    """Statements executed while a request (or block) was being handled"""
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    starts = conn.info.get("query_start")
+    if stats is None or not starts:
+        return
+    stats.record(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Attribute statements executed in this context (and threads it spawns) to a QueryStats"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _preview(statement: Optional[str]) -> Optional[str]:
+    if statement is None:
+        return None
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= STATEMENT_PREVIEW else statement[:STATEMENT_PREVIEW] + "..."
+
+
+class RouteQueryMetrics:
+    """Query totals aggregated per route template"""
+
+    def __init__(self):
+        self._routes: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: QueryStats) -> None:
+        with self._lock:
+            entry = self._routes.get(route)
+            if entry is None:
+                entry = self._routes[route] = {
+                    "requests": 0, "queries": 0, "db_ms": 0.0,
+                    "max_queries": 0, "slowest_ms": 0.0, "slowest_statement": None,
+                }
+            entry["requests"] += 1
+            entry["queries"] += stats.count
+            entry["db_ms"] += stats.total_ms
+            entry["max_queries"] = max(entry["max_queries"], stats.count)
+            if stats.slowest_ms >= entry["slowest_ms"] and stats.slowest_statement:
+                entry["slowest_ms"] = stats.slowest_ms
+                entry["slowest_statement"] = _preview(stats.slowest_statement)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-route totals plus per-request averages"""
+        with self._lock:
+            return {
+                route: {
+                    **entry,
+                    "db_ms": round(entry["db_ms"], 3),
+                    "slowest_ms": round(entry["slowest_ms"], 3),
+                    "avg_queries": round(entry["queries"] / entry["requests"], 2),
+                    "avg_db_ms": round(entry["db_ms"] / entry["requests"], 3),
+                }
+                for route, entry in self._routes.items()
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+route_metrics = RouteQueryMetrics()
+
+
+def route_template(scope) -> str:
+    """Route path template ("/voting/cast/{token}") so metrics don't explode per token"""
+    path = getattr(scope.get("route"), "path", None) or "<unmatched>"
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryStatsMiddleware:
+    """
+    Tracks the statements each request runs. Totals are aggregated per route;
+    with settings.DEBUG the counts are also returned as X-DB-* response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+            async def send_with_headers(message):
+                if message["type"] == "http.response.start" and settings.DEBUG:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-query-count", str(stats.count).encode()))
+                    headers.append((b"x-db-query-time-ms", f"{stats.total_ms:.3f}".encode()))
+                    headers.append((b"x-db-slowest-ms", f"{stats.slowest_ms:.3f}".encode()))
+                    if stats.slowest_statement:
+                        headers.append((b"x-db-slowest-statement", _preview(stats.slowest_statement).encode("latin-1", "replace")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                route_metrics.record(route_template(scope), stats)
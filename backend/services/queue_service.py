@@ -1,10 +1,11 @@
 """Queue service for batch processing"""
 import secrets
 from datetime import datetime, timedelta
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import math
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 
 from config import settings
 from models import Election, User, VotingQueue, QueueStatus
@@ -83,7 +84,7 @@ def process_next_batch(db: Session, election_id) -> int:
     next_batch = pending.batch_number
     
     # Get all entries for this batch
-    batch_entries = db.query(VotingQueue).filter(
+    batch_entries = db.query(VotingQueue).options(joinedload(VotingQueue.user)).filter(
         VotingQueue.election_id == election_id,
         VotingQueue.batch_number == next_batch,
         VotingQueue.status == QueueStatus.PENDING
@@ -92,3 +93,11 @@ def process_next_batch(db: Session, election_id) -> int:
     election = db.query(Election).filter(Election.id == election_id).first()
     
     return send_voting_emails(db, batch_entries, election)
+
+
+def queue_depth_by_status(db: Session) -> Dict[QueueStatus, int]:
+    """Number of queue entries in each status (every status present, zero if empty)"""
+    counts = dict(
+        db.query(VotingQueue.status, func.count(VotingQueue.id)).group_by(VotingQueue.status).all()
+    )
+    return {status: counts.get(status, 0) for status in QueueStatus}
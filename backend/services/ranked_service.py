@@ -0,0 +1,165 @@
+"""Ranked-choice counting engine (IRV and STV)"""
+from typing import Dict, List, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from models import Ballot, Election
+from services.tally_service import BALLOT_DTYPE, BALLOT_ITEM_SIZE
+
+# Marks an empty rank (padding or a removed candidate)
+BLANK = -1
+
+
+def build_ballot_matrix(ballots: Sequence[bytes], positions: Sequence[int]) -> np.ndarray:
+    """
+    Build an (n_ballots, max_rank) int32 matrix of candidate indices from packed ballots.
+    Candidate positions are mapped to dense indices in the order given by `positions`;
+    unknown positions and padding become BLANK.
+    """
+    lengths = np.fromiter((len(b) // BALLOT_ITEM_SIZE for b in ballots), dtype=np.int64, count=len(ballots))
+    max_rank = int(lengths.max()) if len(ballots) else 0
+    flat = np.frombuffer(b"".join(ballots), dtype=BALLOT_DTYPE).astype(np.int64)
+
+    lookup = np.full(max(max(positions, default=-1), int(flat.max(initial=-1))) + 1, BLANK, dtype=np.int32)
+    lookup[np.asarray(positions, dtype=np.int64)] = np.arange(len(positions), dtype=np.int32)
+
+    matrix = np.full((len(ballots), max_rank), BLANK, dtype=np.int32)
+    matrix[np.arange(max_rank) < lengths[:, None]] = lookup[flat]
+    return matrix
+
+
+def _current_choices(matrix: np.ndarray, continuing: np.ndarray) -> np.ndarray:
+    """Index of each ballot's highest-ranked continuing candidate (BLANK if exhausted)"""
+    if matrix.shape[1] == 0:
+        return np.full(matrix.shape[0], BLANK, dtype=np.int32)
+    # Padding maps to the extra trailing slot, which is never continuing
+    live = np.append(continuing, False)[matrix]
+    first = live.argmax(axis=1)
+    choices = matrix[np.arange(matrix.shape[0]), first]
+    return np.where(live.any(axis=1), choices, BLANK)
+
+
+def _lowest(counts: np.ndarray, continuing: np.ndarray) -> int:
+    """Continuing candidate with the fewest votes; ties eliminate the last-listed candidate"""
+    masked = np.where(continuing, counts, np.inf)
+    return int(np.flatnonzero(masked == masked.min())[-1])
+
+
+def count_irv(matrix: np.ndarray, num_candidates: int) -> Dict:
+    """
+    Instant-runoff count: eliminate the weakest candidate each round until one
+    candidate holds a majority of the non-exhausted ballots.
+    """
+    continuing = np.ones(num_candidates, dtype=bool)
+    rounds = []
+    winners: List[int] = []
+    exhausted = matrix.shape[0]
+
+    while continuing.any():
+        choices = _current_choices(matrix, continuing)
+        active = choices[choices != BLANK]
+        exhausted = matrix.shape[0] - len(active)
+        if len(active) == 0:
+            break
+
+        counts = np.bincount(active, minlength=num_candidates).astype(np.float64)
+        round_info = {"counts": counts.tolist(), "elected": [], "eliminated": None}
+        rounds.append(round_info)
+
+        leader = int(np.argmax(np.where(continuing, counts, -1)))
+        if counts[leader] * 2 > len(active) or continuing.sum() == 1:
+            winners.append(leader)
+            round_info["elected"].append(leader)
+            break
+
+        loser = _lowest(counts, continuing)
+        continuing[loser] = False
+        round_info["eliminated"] = loser
+
+    return {"winners": winners, "rounds": rounds, "exhausted": exhausted}
+
+
+def count_stv(matrix: np.ndarray, num_candidates: int, seats: int) -> Dict:
+    """
+    Single transferable vote with a Droop quota and fractional (Gregory) surplus transfers.
+    Ballot weights are carried as a float vector so each round is one weighted bincount.
+    """
+    seats = min(seats, num_candidates)
+    weights = np.ones(matrix.shape[0], dtype=np.float64)
+    quota = np.floor(matrix.shape[0] / (seats + 1)) + 1
+    continuing = np.ones(num_candidates, dtype=bool)
+    winners: List[int] = []
+    rounds = []
+
+    while len(winners) < seats and continuing.any() and matrix.shape[0]:
+        choices = _current_choices(matrix, continuing)
+        has_choice = choices != BLANK
+        counts = np.bincount(choices[has_choice], weights=weights[has_choice], minlength=num_candidates)
+        round_info = {"counts": counts.tolist(), "elected": [], "eliminated": None}
+        rounds.append(round_info)
+
+        # Remaining candidates fill the remaining seats
+        if continuing.sum() <= seats - len(winners):
+            remaining = np.flatnonzero(continuing)
+            remaining = remaining[np.argsort(-counts[remaining], kind="stable")]
+            winners.extend(int(c) for c in remaining)
+            round_info["elected"].extend(int(c) for c in remaining)
+            break
+
+        standing = np.where(continuing, counts, -1)
+        leader = int(np.argmax(standing))
+        if standing[leader] >= quota:
+            winners.append(leader)
+            round_info["elected"].append(leader)
+            continuing[leader] = False
+            surplus = counts[leader] - quota
+            # Ballots held by the winner carry the surplus fraction onward
+            weights[choices == leader] *= surplus / counts[leader]
+            continue
+
+        loser = _lowest(counts, continuing)
+        continuing[loser] = False
+        round_info["eliminated"] = loser
+
+    choices = _current_choices(matrix, continuing)
+    return {
+        "winners": winners,
+        "rounds": rounds,
+        "exhausted": int((choices == BLANK).sum()),
+    }
+
+
+def count_ranked_election(db: Session, election: Election, seats: int = 1) -> Dict:
+    """Load an election's ranked ballots and count them (IRV for one seat, STV otherwise)"""
+    candidates = sorted(
+        (c for c in election.candidates if c.position is not None),
+        key=lambda c: c.position
+    )
+    ballots = db.execute(
+        select(Ballot.choices).where(Ballot.election_id == election.id)
+    ).scalars().all()
+
+    matrix = build_ballot_matrix(ballots, [c.position for c in candidates])
+    if seats == 1:
+        result = count_irv(matrix, len(candidates))
+    else:
+        result = count_stv(matrix, len(candidates), seats)
+
+    ids = [c.id for c in candidates]
+    return {
+        "election_id": election.id,
+        "seats": seats,
+        "total_ballots": len(ballots),
+        "exhausted": result["exhausted"],
+        "winners": [ids[i] for i in result["winners"]],
+        "rounds": [
+            {
+                "counts": {ids[i]: count for i, count in enumerate(r["counts"])},
+                "elected": [ids[i] for i in r["elected"]],
+                "eliminated": None if r["eliminated"] is None else ids[r["eliminated"]],
+            }
+            for r in result["rounds"]
+        ],
+    }
@@ -0,0 +1,160 @@
+"""
+Token-bucket rate limiting for login and voting endpoints.
+
+Limits are strings like "10/minute" (a burst of 10, refilled evenly over a
+minute). Buckets are keyed by what a request is made for (client IP, student
+ID, voting token). The default backend keeps them in this process, with LRU
+eviction beyond RATE_LIMIT_MAX_KEYS; with several workers each one enforces
+the limits separately unless RATE_LIMIT_REDIS_URL points them at a shared
+Redis (requires the `redis` package).
+"""
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Callable, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+
+import metrics
+from config import settings
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@lru_cache(maxsize=64)
+def parse_limit(limit: str) -> Tuple[int, float]:
+    """'10/minute' -> (10, 60.0)"""
+    count, _, period = limit.partition("/")
+    period = period.strip().lower().rstrip("s")
+    if period not in PERIODS or not count.strip().isdigit():
+        raise ValueError(f"Invalid rate limit {limit!r}, expected e.g. '10/minute'")
+    return int(count), float(PERIODS[period])
+
+
+class MemoryBackend:
+    """Per-process buckets: [tokens, last refill time] per key, least recently used evicted first"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def hit(self, key: str, burst: int, period: float) -> float:
+        """Take a token; returns 0 if allowed, else seconds until one is available"""
+        return self.take(key, burst, period, time.monotonic())
+
+    def take(self, key: str, burst: int, period: float, now: float) -> float:
+        rate = burst / period
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] >= 1:
+                bucket[0] -= 1
+                return 0.0
+            return (1 - bucket[0]) / rate
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Same bucket as MemoryBackend.take, atomically in Redis on the server's clock
+_REDIS_TAKE = """
+local burst = tonumber(ARGV[1])
+local rate = burst / tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[2])) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBackend:
+    """Buckets shared by every worker; keys expire once their bucket would be full again"""
+
+    def __init__(self, url: str, prefix: str = "campusvote:ratelimit:"):
+        import redis.asyncio as redis
+
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    async def hit(self, key: str, burst: int, period: float) -> float:
+        return float(await self._take(keys=[self.prefix + key], args=[burst, period]))
+
+    def clear(self) -> None:
+        pass
+
+
+class RateLimiter:
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def check(self, key: str, limit: str) -> None:
+        """Raise 429 with Retry-After once `key` has used up `limit`"""
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        burst, period = parse_limit(limit)
+        wait = await self.backend.hit(key, burst, period)
+        if wait > 0:
+            metrics.rate_limited.inc(limit=key.split(":", 1)[0])
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many requests, try again later",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+
+def _backend():
+    if settings.RATE_LIMIT_REDIS_URL:
+        return RedisBackend(settings.RATE_LIMIT_REDIS_URL)
+    return MemoryBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(_backend())
+
+
+def client_ip(request: Request) -> str:
+    """Peer address (run uvicorn with --proxy-headers behind a reverse proxy)"""
+    return request.client.host if request.client else "unknown"
+
+
+def path_param(name: str) -> Callable[[Request], str]:
+    return lambda request: request.path_params[name]
+
+
+def rate_limit(name: str, setting: str, key: Optional[Callable[[Request], str]] = None):
+    """
+    Dependency enforcing the limit in `settings.<setting>` per `key(request)`
+    (client IP by default). Declare it before the database dependency so
+    rejected requests never take a connection or the write lock.
+    """
+    key = key or client_ip
+
+    async def dependency(request: Request) -> None:
+        await rate_limiter.check(f"{name}:{key(request)}", getattr(settings, setting))
+
+    return dependency
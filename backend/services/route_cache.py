@@ -0,0 +1,148 @@
+"""
+Stale-while-revalidate caching for route functions.
+
+    @router.get("/stats", response_model=DashboardStats)
+    @cached_route(ttl=10, stale=60)
+    async def get_dashboard_stats(db: Session = Depends(get_read_db), ...):
+
+For `ttl` seconds after a response is computed, requests get the cached body.
+For `stale` seconds after that they still get it at once while a background
+task recomputes it; later, or with nothing cached, the request computes it.
+Only one computation per key is ever in flight: concurrent requests wait for
+the same one, so any number of viewers cost one aggregation per window.
+Responses carry `Age` (whole seconds since the body was computed) and
+`X-Cache: hit|stale|miss`.
+
+The key is the route plus its plain path/query arguments, so only cache
+routes whose result doesn't depend on who asks. Background refreshes open
+their own session through the route's session dependency (honouring
+app.dependency_overrides), as the request's session closes with it.
+"""
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+import metrics
+from database import dependency_session, get_read_db
+from services.invalidation import invalidation_bus
+from services.response_cache import ResponseCache
+from services.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+HIT, STALE, MISS = "hit", "stale", "miss"
+REQUEST_PARAM = "_route_cache_request"
+PLAIN_TYPES = (str, int, float, bool, type(None))
+
+
+class RouteCache:
+    def __init__(self, name: str, ttl: float, stale: float, max_entries: int = 64):
+        self.name = name
+        self.ttl = ttl
+        self.stale = stale
+        # key -> (body, computed_at)
+        self.entries = ResponseCache(max_entries=max_entries)
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.builds = 0
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    async def get(self, key: Hashable, compute: Callable, refresh: Callable) -> Tuple[bytes, float, str]:
+        """
+        The body for `key`, its age and how it was served. `compute` builds it
+        with the request's own session; `refresh` does so in the background.
+        """
+        entry = self.entries.get(key)
+        if entry is not None:
+            body, computed_at = entry
+            age = time.monotonic() - computed_at
+            if age < self.ttl:
+                return body, age, HIT
+            if age < self.ttl + self.stale:
+                if key not in self._inflight:
+                    self._start(key, refresh)
+                return body, age, STALE
+
+        task = self._inflight.get(key) or self._start(key, compute)
+        body, computed_at = await asyncio.shield(task)
+        return body, time.monotonic() - computed_at, MISS
+
+    def _start(self, key: Hashable, build: Callable) -> asyncio.Task:
+        task = asyncio.ensure_future(self._build(key, build))
+        self._inflight[key] = task
+        task.add_done_callback(functools.partial(self._finished, key))
+        return task
+
+    async def _build(self, key: Hashable, build: Callable) -> Tuple[bytes, float]:
+        self.builds += 1
+        generation = self.entries.generation
+        computed_at = time.monotonic()
+        body = dumps(jsonable_encoder(await build()))
+        self.entries.set(key, (body, computed_at), generation)
+        return body, computed_at
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Waiting requests see the error; a failed refresh keeps serving the old body
+            logger.warning("Computing %s failed: %r", self.name, task.exception())
+
+
+route_caches: List[RouteCache] = []
+
+
+def clear_route_caches() -> None:
+    for cache in route_caches:
+        cache.clear()
+
+
+def cached_route(
+    ttl: float,
+    stale: float,
+    invalidate_on: Iterable[str] = (),
+    session_dependency: Callable = get_read_db,
+    session_arg: str = "db",
+):
+    """
+    Cache a route function's JSON response with stale-while-revalidate.
+    `invalidate_on` names tables whose writes (from any worker) drop the cache.
+    """
+    def decorator(func):
+        cache = RouteCache(func.__name__, ttl, stale)
+        route_caches.append(cache)
+        if invalidate_on:
+            invalidation_bus.subscribe(set(invalidate_on), lambda tables: cache.clear())
+
+        @functools.wraps(func)
+        async def wrapper(**kwargs):
+            request: Request = kwargs.pop(REQUEST_PARAM)
+            key = tuple(sorted((name, value) for name, value in kwargs.items() if isinstance(value, PLAIN_TYPES)))
+
+            async def refresh():
+                with dependency_session(session_dependency, request.app.dependency_overrides) as db:
+                    return await func(**{**kwargs, session_arg: db})
+
+            body, age, result = await cache.get(key, lambda: func(**kwargs), refresh)
+            metrics.route_cache_requests.inc(route=cache.name, result=result)
+            return Response(
+                content=body, media_type="application/json",
+                headers={"Age": str(int(age)), "X-Cache": result},
+            )
+
+        signature = inspect.signature(func)
+        wrapper.__signature__ = signature.replace(parameters=[
+            *signature.parameters.values(),
+            inspect.Parameter(REQUEST_PARAM, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+        ])
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
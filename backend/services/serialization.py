@@ -0,0 +1,23 @@
+"""Fast JSON encoding for responses built without Pydantic models"""
+from typing import Any, Dict, Iterable, Optional
+
+import orjson
+from fastapi import Response
+
+# UUIDs, datetimes and enums are encoded natively by orjson, in the same
+# format FastAPI's encoder produces (str(uuid), isoformat(), enum value)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(payload: Any) -> bytes:
+    return orjson.dumps(payload, option=ORJSON_OPTIONS)
+
+
+def json_response(payload: Any, headers: Optional[Dict[str, str]] = None, status_code: int = 200) -> Response:
+    """Response for a payload of plain dicts/lists/rows, skipping response_model validation"""
+    return Response(content=dumps(payload), media_type="application/json", headers=headers, status_code=status_code)
+
+
+def project(obj, names: Iterable[str]) -> Dict[str, Any]:
+    """Selected attributes of an ORM object or Core row as a dict"""
+    return {name: getattr(obj, name) for name in names}
@@ -0,0 +1,99 @@
+"""Tally service for packed multi-role ballots"""
+import struct
+from typing import TYPE_CHECKING, Dict, Iterable, List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from models import Ballot, Candidate, Election, Vote
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Candidate positions are stored as little-endian uint16 (numpy dtype string;
+# numpy is only imported by the counting functions, keeping it out of startup)
+BALLOT_DTYPE = "<u2"
+BALLOT_ITEM_SIZE = 2
+
+
+def encode_choices(positions: Sequence[int]) -> bytes:
+    """Pack candidate positions into the compact ballot format"""
+    return struct.pack(f"<{len(positions)}H", *positions)
+
+
+def decode_choices(choices: bytes) -> List[int]:
+    """Unpack a stored ballot into candidate positions"""
+    return list(struct.unpack(f"<{len(choices) // BALLOT_ITEM_SIZE}H", choices))
+
+
+def count_positions(ballots: Iterable[bytes], num_positions: int) -> "np.ndarray":
+    """
+    Count selections per candidate position across all ballots.
+    All roles are aggregated in a single bincount over the concatenated ballots.
+    """
+    import numpy as np
+
+    packed = np.frombuffer(b"".join(ballots), dtype=BALLOT_DTYPE)
+    if num_positions <= 0:
+        return np.zeros(0, dtype=np.int64)
+    # Ignore positions of candidates that were removed after ballots were cast
+    packed = packed[packed < num_positions]
+    return np.bincount(packed, minlength=num_positions)
+
+
+def next_candidate_position(db: Session, election: Election) -> int:
+    """
+    Issue the next ballot position for a candidate in an election.
+    Positions are never reused: ballots cast for a removed candidate still
+    hold its position. Lock the election row (SELECT ... FOR UPDATE) first.
+    """
+    current = db.query(func.max(Candidate.position)).filter(
+        Candidate.election_id == election.id
+    ).scalar()
+    position = max(election.positions_issued or 0, 0 if current is None else current + 1)
+    election.positions_issued = position + 1
+    return position
+
+
+def tally_election(db: Session, election: Election) -> Dict:
+    """
+    Tally an election per role.
+    Packed ballots are counted in one vectorized pass; single-choice votes
+    are added from one GROUP BY over the votes table.
+    """
+    candidates = sorted(
+        election.candidates,
+        key=lambda c: (c.position is None, c.position or 0, c.name)
+    )
+    positioned = [c for c in candidates if c.position is not None]
+    num_positions = max((c.position for c in positioned), default=-1) + 1
+
+    ballots = db.execute(
+        select(Ballot.choices).where(Ballot.election_id == election.id)
+    ).scalars().all()
+    position_counts = count_positions(ballots, num_positions)
+
+    vote_counts = dict(
+        db.query(Vote.candidate_id, func.count(Vote.id))
+        .filter(Vote.election_id == election.id)
+        .group_by(Vote.candidate_id)
+        .all()
+    )
+
+    roles: Dict[str, Dict] = {}
+    for candidate in candidates:
+        votes = vote_counts.get(candidate.id, 0)
+        if candidate.position is not None:
+            votes += int(position_counts[candidate.position])
+        role = roles.setdefault(candidate.role, {"role": candidate.role, "total": 0, "candidates": []})
+        role["candidates"].append({"id": candidate.id, "name": candidate.name, "votes": votes})
+        role["total"] += votes
+
+    for role in roles.values():
+        role["candidates"].sort(key=lambda c: c["votes"], reverse=True)
+
+    return {
+        "election_id": election.id,
+        "total_ballots": len(ballots) + sum(vote_counts.values()),
+        "roles": list(roles.values()),
+    }
@@ -10,7 +10,8 @@ import os
 # Add backend directory to sys.path so we can import modules
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from database import Base, get_db
+from database import Base, get_db, get_read_db, get_write_db
+import main
 from main import app
 from models import User, UserRole
 
@@ -34,18 +35,59 @@ def db_session():
         Base.metadata.drop_all(bind=engine)
 
 @pytest.fixture(autouse=True)
-def mock_seed_data():
-    with patch('main.seed_demo_data') as mock:
+def mock_schema_check():
+    # Neither the schema check nor the invalidation poller should touch the dev database
+    with patch('main.check_schema_version') as mock, patch.object(main.invalidation_bus, 'start'):
         yield mock
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    # Every test client shares one address, so buckets would carry over between tests
+    from services.rate_limit import rate_limiter
+    rate_limiter.backend.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_route_caches():
+    # Dashboard responses would otherwise outlive the test database they were built from
+    from services.route_cache import clear_route_caches
+    clear_route_caches()
+
+
+@pytest.fixture(autouse=True)
+def reset_active_election_index():
+    # Tables are dropped between tests without a commit the index would notice
+    from services.active_elections import active_election_index
+    active_election_index.clear()
+
+
 @pytest.fixture(scope="function")
-def client(db_session, mock_seed_data):
+def client(db_session, mock_schema_check):
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_write_db] = override_get_db
     with TestClient(app) as c:
         yield c
     app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def query_budget():
+    """Assert a response ran at most `max_queries` SQL statements (reads the debug X-DB-* headers)"""
+    from config import settings
+
+    def check(response, max_queries):
+        count = int(response.headers["X-DB-Query-Count"])
+        assert count <= max_queries, (
+            f"{response.request.method} {response.request.url.path} ran {count} queries "
+            f"(budget {max_queries}); slowest: {response.headers.get('X-DB-Slowest-Statement')}"
+        )
+        return count
+
+    with patch.object(settings, "DEBUG", True):
+        yield check
@@ -0,0 +1,102 @@
+-- Schema of a database created by create_all before migrations (GUIDs as CHAR(36))
+
+CREATE TABLE departments (
+	id CHAR(36) NOT NULL,
+	code VARCHAR(20) NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	total_students INTEGER,
+	PRIMARY KEY (id),
+	UNIQUE (code)
+);
+
+CREATE TABLE clubs (
+	id CHAR(36) NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	category VARCHAR(100),
+	description TEXT,
+	status VARCHAR(8),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	UNIQUE (name)
+);
+
+CREATE TABLE users (
+	id CHAR(36) NOT NULL,
+	student_id VARCHAR(50) NOT NULL,
+	email VARCHAR(255) NOT NULL,
+	password_hash VARCHAR(255) NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	role VARCHAR(7),
+	department_id CHAR(36),
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	UNIQUE (email),
+	FOREIGN KEY(department_id) REFERENCES departments (id)
+);
+
+CREATE UNIQUE INDEX ix_users_student_id ON users (student_id);
+
+CREATE TABLE elections (
+	id CHAR(36) NOT NULL,
+	title VARCHAR(255) NOT NULL,
+	department_id CHAR(36),
+	status VARCHAR(8),
+	start_date DATETIME NOT NULL,
+	end_date DATETIME NOT NULL,
+	batch_size INTEGER,
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(department_id) REFERENCES departments (id)
+);
+
+CREATE TABLE candidates (
+	id CHAR(36) NOT NULL,
+	election_id CHAR(36) NOT NULL,
+	name VARCHAR(255) NOT NULL,
+	role VARCHAR(100) NOT NULL,
+	photo_url VARCHAR(500),
+	manifesto TEXT,
+	vote_count INTEGER,
+	PRIMARY KEY (id),
+	FOREIGN KEY(election_id) REFERENCES elections (id)
+);
+
+CREATE TABLE voting_queue (
+	id CHAR(36) NOT NULL,
+	election_id CHAR(36) NOT NULL,
+	user_id CHAR(36) NOT NULL,
+	status VARCHAR(8),
+	voting_token VARCHAR(255) NOT NULL,
+	batch_number INTEGER,
+	notified_at DATETIME,
+	expires_at DATETIME,
+	created_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(election_id) REFERENCES elections (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	UNIQUE (voting_token)
+);
+
+CREATE TABLE club_members (
+	id CHAR(36) NOT NULL,
+	club_id CHAR(36) NOT NULL,
+	user_id CHAR(36) NOT NULL,
+	role VARCHAR(14),
+	joined_at DATETIME,
+	PRIMARY KEY (id),
+	FOREIGN KEY(club_id) REFERENCES clubs (id),
+	FOREIGN KEY(user_id) REFERENCES users (id)
+);
+
+CREATE TABLE votes (
+	id CHAR(36) NOT NULL,
+	election_id CHAR(36) NOT NULL,
+	user_id CHAR(36) NOT NULL,
+	candidate_id CHAR(36) NOT NULL,
+	voted_at DATETIME,
+	PRIMARY KEY (id),
+	CONSTRAINT uq_election_user_vote UNIQUE (election_id, user_id),
+	FOREIGN KEY(election_id) REFERENCES elections (id),
+	FOREIGN KEY(user_id) REFERENCES users (id),
+	FOREIGN KEY(candidate_id) REFERENCES candidates (id)
+);
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from models import Candidate, Department, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue
+from routers.auth import create_access_token
+from services.active_elections import ActiveElectionIndex, active_election_index, build_buckets
+
+
+def _election(title, department=None):
+    return Election(
+        title=title, status=ElectionStatus.ACTIVE, department_id=department.id if department else None,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+
+
+def _headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+def _setup(db_session):
+    departments = [Department(code=code, name=code) for code in ("A", "B", "C")]
+    db_session.add_all(departments)
+    db_session.flush()
+    campus, a_only, b_only = _election("Campus"), _election("A only", departments[0]), _election("B only", departments[1])
+    db_session.add_all([campus, a_only, b_only])
+    db_session.flush()
+    db_session.add(Candidate(election_id=campus.id, name="Ada", role="President", position=0))
+    users = {
+        dept.code: User(student_id=f"S{dept.code}", email=f"{dept.code}@test.com", password_hash="hash",
+                        name=dept.code, role=UserRole.STUDENT, department_id=dept.id)
+        for dept in departments
+    }
+    users["admin"] = User(student_id="ADM", email="adm@test.com", password_hash="hash", name="Admin",
+                          role=UserRole.ADMIN)
+    db_session.add_all(users.values())
+    db_session.commit()
+    return users, campus
+
+
+def _titles(client, user):
+    response = client.get("/voting/active", headers=_headers(user))
+    assert response.status_code == 200
+    return [e["title"] for e in response.json()]
+
+
+def test_students_see_campus_wide_and_their_department(client, db_session, query_budget):
+    users, _ = _setup(db_session)
+    assert _titles(client, users["A"]) == ["Campus", "A only"]
+    assert _titles(client, users["B"]) == ["Campus", "B only"]
+    assert _titles(client, users["C"]) == ["Campus"]
+    assert _titles(client, users["admin"]) == ["Campus", "A only", "B only"]
+
+    # Once built, a page view doesn't query elections
+    response = client.get("/voting/active", headers=_headers(users["A"]))
+    query_budget(response, 1)
+    assert "elections" not in response.headers.get("X-DB-Slowest-Statement", "")
+    assert response.json()[0]["candidates"][0]["name"] == "Ada"
+    assert "manifesto" not in response.json()[0]["candidates"][0]
+
+
+def test_election_writes_rebuild_the_index(client, db_session):
+    users, campus = _setup(db_session)
+    assert _titles(client, users["A"]) == ["Campus", "A only"]
+
+    campus.status = ElectionStatus.FINISHED
+    db_session.commit()
+    assert _titles(client, users["A"]) == ["A only"]
+
+    db_session.delete(db_session.query(Election).filter_by(title="A only").one())
+    db_session.commit()
+    assert _titles(client, users["A"]) == []
+
+
+def test_candidate_writes_rebuild_the_index(client, db_session):
+    users, campus = _setup(db_session)
+    client.get("/voting/active", headers=_headers(users["A"]))
+
+    candidate = db_session.query(Candidate).one()
+    candidate.name = "Renamed"
+    db_session.commit()
+
+    response = client.get("/voting/active", headers=_headers(users["A"]))
+    assert response.json()[0]["candidates"][0]["name"] == "Renamed"
+
+
+def test_votes_keep_the_index_and_listing_cache(client, db_session):
+    from routers.elections import election_list_cache
+
+    users, campus = _setup(db_session)
+    token = _headers(users["A"])
+    client.get("/voting/active", headers=token)
+    etag = client.get("/elections/", headers=token).headers["ETag"]
+    generation = election_list_cache.generation
+    db_session.add(VotingQueue(election_id=campus.id, user_id=users["A"].id, voting_token="vote-token",
+                               status=QueueStatus.NOTIFIED))
+    db_session.commit()
+    candidate = db_session.query(Candidate).one()
+
+    response = client.post("/voting/cast/vote-token",
+                           json={"election_id": str(campus.id), "candidate_id": str(candidate.id)})
+    assert response.status_code == 200
+    assert active_election_index._buckets is not None
+    assert election_list_cache.generation == generation
+    assert client.get("/elections/", headers=token).headers["ETag"] == etag
+
+
+def test_build_racing_a_structural_write_is_not_installed():
+    index = ActiveElectionIndex()
+    loads = []
+
+    def load():
+        loads.append(1)
+        if len(loads) == 1:
+            # An election is closed while the first build is querying
+            index.invalidate({"elections"})
+        return [(None, {"title": f"build {len(loads)}"})]
+
+    async def run():
+        assert await index.get(None, load) == b'[{"title":"build 1"}]'
+        assert await index.get(None, load) == b'[{"title":"build 2"}]'
+        assert await index.get(None, load) == b'[{"title":"build 2"}]'
+        assert len(loads) == 2
+
+    asyncio.run(run())
+
+
+def test_buckets_keep_display_order():
+    buckets = build_buckets([("a", {"n": 1}), (None, {"n": 2}), ("b", {"n": 3}), ("a", {"n": 4})])
+    assert buckets["a"] == b'[{"n":1},{"n":2},{"n":4}]'
+    assert buckets["b"] == b'[{"n":2},{"n":3}]'
+    assert buckets["campus"] == b'[{"n":2}]'
+    assert buckets["all"] == b'[{"n":1},{"n":2},{"n":3},{"n":4}]'
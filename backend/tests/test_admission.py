@@ -0,0 +1,113 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from config import Settings, settings
+from services.admission import (
+    AUTH, BACKGROUND, CRITICAL, DEFAULT, AdmissionController, admission, route_class,
+)
+
+
+def _controller(limit=10, **kwargs):
+    options = dict(max_limit=limit, min_limit=2, target_latency_ms=100, queue_timeout_ms=200)
+    options.update(kwargs)
+    return AdmissionController(**options)
+
+
+def test_route_classes():
+    assert route_class("/voting/cast/abc") == CRITICAL
+    assert route_class("/voting/validate/abc") == CRITICAL
+    assert route_class("/auth/login") == AUTH
+    assert route_class("/elections/") == DEFAULT
+    assert route_class("/voting/active") == DEFAULT
+    assert route_class("/dashboard/stats") == BACKGROUND
+    assert route_class("/clubs/") == BACKGROUND
+
+
+def test_lower_classes_fill_less_of_the_limit():
+    async def run():
+        controller = _controller(limit=10)
+        admitted = [await controller.acquire(BACKGROUND) for _ in range(5)]
+        assert admitted == [True] * 4 + [False]
+        # Critical requests still find room up to the full limit
+        assert all([await controller.acquire(CRITICAL) for _ in range(6)])
+        assert controller.in_flight == 10
+
+    asyncio.run(run())
+
+
+def test_queued_requests_admitted_by_priority_and_time_out():
+    async def run():
+        controller = _controller(limit=2, queue_timeout_ms=500)
+        for _ in range(2):
+            assert await controller.acquire(CRITICAL)
+        order = []
+
+        async def wait(cls):
+            admitted = await controller.acquire(cls)
+            order.append((cls, admitted))
+
+        tasks = [asyncio.create_task(wait(DEFAULT)), asyncio.create_task(wait(CRITICAL))]
+        await asyncio.sleep(0.01)
+        controller.release(CRITICAL, 0.01)  # one slot: the critical request goes first
+        await asyncio.sleep(0.01)
+        assert order == [(CRITICAL, True)]
+        await asyncio.gather(*tasks)
+        # Default requests may use 60% of 2 slots, i.e. one, which stays taken
+        assert order == [(CRITICAL, True), (DEFAULT, False)]
+
+    asyncio.run(run())
+
+
+def test_limit_adapts_to_critical_latency():
+    controller = _controller(limit=20, target_latency_ms=0)
+    controller.in_flight_by_class[CRITICAL] = 100
+    controller.in_flight = 100
+    for _ in range(60):
+        controller._last_decrease = 0
+        controller.release(CRITICAL, latency=1.0)
+    assert controller.limit == 2
+
+    controller.target_latency = 1.0
+    for _ in range(40):
+        controller.release(CRITICAL, latency=0.01)
+    assert 2 < controller.limit < 20
+    # Background latency doesn't move the limit
+    before = controller.limit
+    controller.in_flight_by_class[BACKGROUND] = 1
+    controller.release(BACKGROUND, latency=5.0)
+    assert controller.limit == before
+
+
+@pytest.fixture
+def enabled():
+    with patch.object(settings, "ADMISSION_ENABLED", True):
+        yield
+
+
+def test_disabled_by_default(client):
+    assert Settings.model_fields["ADMISSION_ENABLED"].default is False
+    with patch.object(settings, "ADMISSION_ENABLED", False), patch.object(admission, "limit", 0.0):
+        assert client.get("/clubs").status_code != 503
+
+
+def test_shed_requests_get_503_with_retry_after(client, enabled):
+    with patch.object(admission, "limit", 2.0):
+        response = client.get("/dashboard/stats", headers={"Origin": "http://localhost:5173"})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "10"
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+
+        # Vote casting still gets through
+        assert client.get("/voting/validate/unknown").status_code == 404
+    assert admission.in_flight == 0
+
+
+def test_metrics_scrape_is_never_shed(client, enabled):
+    async def shed(cls):
+        return False
+
+    with patch.object(admission, "acquire", shed):
+        assert client.get("/voting/active").status_code == 503
+        assert client.get("/metrics").status_code == 200
@@ -0,0 +1,172 @@
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import pytest
+from sqlalchemy import update
+
+from models import User, UserRole, Election, ElectionStatus, Candidate, VotingQueue, QueueStatus, Ballot, Vote
+from routers.auth import get_admin_user
+from services.tally_service import encode_choices, decode_choices, count_positions
+
+
+def _setup_election(db_session, voters=2):
+    election = Election(
+        title="Office Bearers",
+        status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(),
+        end_date=datetime.utcnow() + timedelta(days=1),
+        positions_issued=3,
+    )
+    db_session.add(election)
+    db_session.flush()
+
+    candidates = [
+        Candidate(election_id=election.id, name="P1", role="President", position=0),
+        Candidate(election_id=election.id, name="P2", role="President", position=1),
+        Candidate(election_id=election.id, name="S1", role="Secretary", position=2),
+    ]
+    db_session.add_all(candidates)
+
+    tokens = []
+    for i in range(voters):
+        user = User(student_id=f"s{i}", email=f"s{i}@test.com", password_hash="hash", name=f"S{i}", role=UserRole.STUDENT)
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(VotingQueue(
+            election_id=election.id,
+            user_id=user.id,
+            status=QueueStatus.NOTIFIED,
+            voting_token=f"token-{i}",
+        ))
+        tokens.append(f"token-{i}")
+    db_session.commit()
+    return election, candidates, tokens
+
+
+def test_encode_decode_roundtrip():
+    assert decode_choices(encode_choices([3, 0, 65000])) == [3, 0, 65000]
+
+
+def test_count_positions_ignores_removed_candidates():
+    counts = count_positions([encode_choices([0, 2]), encode_choices([1, 2]), encode_choices([7])], 3)
+    assert counts.tolist() == [1, 1, 2]
+
+
+def test_cast_ballot_and_results(client, db_session):
+    from main import app
+    app.dependency_overrides[get_admin_user] = lambda: User(id="admin_id", role=UserRole.ADMIN, name="Admin")
+
+    election, (p1, p2, s1), tokens = _setup_election(db_session)
+
+    response = client.post(f"/voting/ballot/{tokens[0]}", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(p1.id), str(s1.id)],
+    })
+    assert response.status_code == 200
+    assert db_session.query(Ballot).count() == 1
+
+    response = client.post(f"/voting/ballot/{tokens[1]}", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(p1.id)],
+    })
+    assert response.status_code == 200
+
+    # Token cannot be reused
+    response = client.post(f"/voting/ballot/{tokens[0]}", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(p2.id)],
+    })
+    assert response.status_code == 400
+
+    response = client.get(f"/elections/{election.id}/results")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_ballots"] == 2
+    roles = {r["role"]: r for r in data["roles"]}
+    assert roles["President"]["total"] == 2
+    assert roles["President"]["candidates"][0] == {"id": str(p1.id), "name": "P1", "votes": 2}
+    assert roles["Secretary"]["total"] == 1
+
+
+def test_cast_ballot_rejects_two_choices_for_one_role(client, db_session):
+    election, (p1, p2, s1), tokens = _setup_election(db_session, voters=1)
+
+    response = client.post(f"/voting/ballot/{tokens[0]}", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(p1.id), str(p2.id)],
+    })
+    assert response.status_code == 400
+    assert db_session.query(Ballot).count() == 0
+
+
+def test_removed_candidate_position_is_not_reused(client, db_session):
+    from main import app
+    app.dependency_overrides[get_admin_user] = lambda: User(id="admin_id", role=UserRole.ADMIN, name="Admin")
+
+    election, (p1, p2, s1), tokens = _setup_election(db_session, voters=1)
+    response = client.post(f"/voting/ballot/{tokens[0]}", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(p1.id), str(s1.id)],
+    })
+    assert response.status_code == 200
+
+    # Remove the candidate holding the top position, then add a new one
+    assert client.delete(f"/elections/{election.id}/candidates/{s1.id}").status_code == 200
+    response = client.post(f"/elections/{election.id}/candidates", json={"name": "S2", "role": "Secretary"})
+    assert response.status_code == 200
+    s2 = db_session.get(Candidate, UUID(response.json()["id"]))
+    assert s2.position == 3
+
+    roles = {r["role"]: r for r in client.get(f"/elections/{election.id}/results").json()["roles"]}
+    assert roles["Secretary"]["candidates"] == [{"id": str(s2.id), "name": "S2", "votes": 0}]
+
+
+def test_dashboard_turnout_counts_ballots(client, db_session):
+    from main import app
+    app.dependency_overrides[get_admin_user] = lambda: User(id="admin_id", role=UserRole.ADMIN, name="Admin")
+
+    election, (p1, p2, s1), tokens = _setup_election(db_session, voters=2)
+    response = client.post(f"/voting/ballot/{tokens[0]}", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(p1.id), str(s1.id)],
+    })
+    assert response.status_code == 200
+
+    # One of two students has voted
+    assert client.get("/dashboard/stats").json()["voter_turnout"] == 50.0
+
+
+@pytest.mark.parametrize("path,choice", [("cast", "candidate_id"), ("ballot", "candidate_ids")])
+def test_token_claimed_concurrently_is_rejected(client, db_session, path, choice):
+    election, (p1, p2, s1), tokens = _setup_election(db_session, voters=1)
+
+    # This request reads the entry as unused, then a concurrent cast on the same token commits
+    entry = db_session.query(VotingQueue).one()
+    assert entry.status == QueueStatus.NOTIFIED
+    db_session.execute(
+        update(VotingQueue).values(status=QueueStatus.VOTED),
+        execution_options={"synchronize_session": False},
+    )
+
+    response = client.post(f"/voting/{path}/{tokens[0]}", json={
+        "election_id": str(election.id),
+        choice: str(p1.id) if path == "cast" else [str(p1.id)],
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Vote already cast"
+    assert db_session.query(Ballot).count() == 0
+    assert db_session.query(Vote).count() == 0
+    assert db_session.get(Candidate, p1.id).vote_count == 0
+
+
+def test_cast_after_ballot_is_rejected(client, db_session):
+    election, (p1, p2, s1), tokens = _setup_election(db_session, voters=1)
+    entry = db_session.query(VotingQueue).one()
+    db_session.add(Ballot(election_id=election.id, user_id=entry.user_id, choices=encode_choices([0])))
+    db_session.commit()
+
+    response = client.post(f"/voting/cast/{tokens[0]}", json={
+        "election_id": str(election.id), "candidate_id": str(p2.id),
+    })
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Already voted in this election"
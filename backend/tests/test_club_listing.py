@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from models import User, UserRole, Club, ClubMember
+from routers.auth import get_current_user
+
+
+def _setup(db_session, clubs=3, members=3):
+    from main import app
+    app.dependency_overrides[get_current_user] = lambda: User(id="user_id", role=UserRole.STUDENT, name="Student")
+
+    users = [
+        User(student_id=f"s{i}", email=f"s{i}@test.com", password_hash="hash", name=f"Student {i}")
+        for i in range(members)
+    ]
+    db_session.add_all(users)
+    created = []
+    for c in range(clubs):
+        club = Club(name=f"Club {c}", category="tech", description="A long description")
+        db_session.add(club)
+        db_session.flush()
+        created.append(club)
+    now = datetime.utcnow()
+    for i, user in enumerate(users):
+        db_session.add(ClubMember(club_id=created[0].id, user_id=user.id, joined_at=now + timedelta(minutes=i)))
+    db_session.commit()
+    return created, users
+
+
+def test_get_clubs_paginated_and_projected(client, db_session):
+    _setup(db_session)
+
+    response = client.get("/clubs/", params={"limit": 2, "fields": "name,member_count"})
+    assert response.status_code == 200
+    page = response.json()
+    assert [c["name"] for c in page] == ["Club 0", "Club 1"]
+    assert set(page[0]) == {"id", "name", "member_count"}
+    assert page[0]["member_count"] == 3
+
+    response = client.get("/clubs/", params={"limit": 2, "cursor": response.headers["x-next-cursor"]})
+    assert [c["name"] for c in response.json()] == ["Club 2"]
+    assert "x-next-cursor" not in response.headers
+
+
+def test_get_clubs_default_fields(client, db_session):
+    _setup(db_session, clubs=1, members=1)
+    club = client.get("/clubs/").json()[0]
+    assert set(club) == {"id", "name", "category", "description", "status", "member_count"}
+
+
+def test_get_club_members_paginated(client, db_session):
+    clubs, users = _setup(db_session)
+
+    response = client.get(f"/clubs/{clubs[0].id}", params={"limit": 2, "fields": "role,user.name"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["member_count"] == 3
+    assert [m["user"]["name"] for m in data["members"]] == ["Student 0", "Student 1"]
+    assert set(data["members"][0]) == {"id", "role", "user"}
+    assert set(data["members"][0]["user"]) == {"id", "name"}
+
+    response = client.get(f"/clubs/{clubs[0].id}", params={"limit": 2, "cursor": response.headers["x-next-cursor"]})
+    assert [m["user"]["name"] for m in response.json()["members"]] == ["Student 2"]
+
+
+def test_unknown_field_rejected(client, db_session):
+    _setup(db_session, clubs=1, members=0)
+    response = client.get("/clubs/", params={"fields": "password_hash"})
+    assert response.status_code == 400
@@ -0,0 +1,47 @@
+from models import User, UserRole, Club, ClubMember
+from routers.auth import get_admin_user, get_current_user
+from services.club_service import repair_member_counts
+
+
+def _admin():
+    from main import app
+    admin = User(id="admin_id", role=UserRole.ADMIN, name="Admin")
+    app.dependency_overrides[get_admin_user] = lambda: admin
+    app.dependency_overrides[get_current_user] = lambda: admin
+
+
+def test_member_count_follows_add_and_remove(client, db_session):
+    _admin()
+    club = Club(name="Chess")
+    users = [User(student_id=f"s{i}", email=f"s{i}@test.com", password_hash="hash", name=f"S{i}") for i in range(2)]
+    db_session.add_all([club] + users)
+    db_session.commit()
+
+    for user in users:
+        assert client.post(f"/clubs/{club.id}/members/{user.id}").status_code == 200
+    db_session.expire_all()
+    assert db_session.get(Club, club.id).member_count == 2
+
+    assert client.delete(f"/clubs/{club.id}/members/{users[0].id}").status_code == 200
+    db_session.expire_all()
+    assert db_session.get(Club, club.id).member_count == 1
+    assert client.get("/clubs/").json()[0]["member_count"] == 1
+    assert client.get(f"/clubs/{club.id}").json()["member_count"] == 1
+
+
+def test_repair_member_counts(db_session):
+    club = Club(name="Drama")
+    user = User(student_id="s1", email="s1@test.com", password_hash="hash", name="S1")
+    db_session.add_all([club, user])
+    db_session.flush()
+    db_session.add(ClubMember(club_id=club.id, user_id=user.id))
+    db_session.commit()
+
+    # Simulate drift from a write that bypassed the ORM
+    db_session.query(Club).update({Club.member_count: 7})
+    db_session.commit()
+
+    assert repair_member_counts(db_session) == 1
+    db_session.expire_all()
+    assert db_session.get(Club, club.id).member_count == 1
+    assert repair_member_counts(db_session) == 0
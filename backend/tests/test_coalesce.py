@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+import metrics
+from main import app
+from models import Candidate, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue
+from routers import voting
+from services.coalesce import SingleFlight
+
+
+def _counting_load(result, delay=0.05):
+    calls = []
+
+    def load():
+        calls.append(threading.get_ident())
+        time.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return load, calls
+
+
+def test_concurrent_callers_share_one_load():
+    flight = SingleFlight("test-share", timeout_ms=1000)
+    load, calls = _counting_load(b"body")
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+        assert results == [b"body"] * 10
+        assert len(calls) == 1
+        # Other keys load separately, and nothing is kept once a load finishes
+        await asyncio.gather(flight.do("other", load), flight.do("key", load))
+        assert len(calls) == 3
+
+    asyncio.run(run())
+    assert metrics.coalesce_requests.value(load="test-share", role="leader") == 3
+    assert metrics.coalesce_requests.value(load="test-share", role="follower") == 9
+
+
+def test_errors_reach_every_caller():
+    flight = SingleFlight("test-error", timeout_ms=1000)
+    load, calls = _counting_load(RuntimeError("database went away"))
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("key", load) for _ in range(5)), return_exceptions=True)
+        assert len(calls) == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        with pytest.raises(RuntimeError):
+            await flight.do("key", load)
+
+    asyncio.run(run())
+
+
+def test_callers_time_out_without_cancelling_the_load():
+    flight = SingleFlight("test-timeout", timeout_ms=20)
+    load, calls = _counting_load(b"slow", delay=0.1)
+
+    async def run():
+        with pytest.raises(HTTPException) as error:
+            await flight.do("key", load)
+        assert error.value.status_code == 503
+        assert error.value.headers["Retry-After"] == "1"
+        # A caller arriving now still joins the load already running
+        flight.timeout = 1
+        assert await flight.do("key", load) == b"slow"
+        assert len(calls) == 1
+
+    asyncio.run(run())
+    assert metrics.coalesce_timeouts.value(load="test-timeout") == 1
+
+
+def test_concurrent_validations_load_the_election_once(client, db_session):
+    election = Election(
+        title="Council", status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db_session.add(election)
+    db_session.flush()
+    db_session.add(Candidate(election_id=election.id, name="Ada", role="President", position=0))
+    for i in range(8):
+        user = User(student_id=f"C{i}", email=f"c{i}@test.com", password_hash="hash", name=f"C{i}", role=UserRole.STUDENT)
+        db_session.add(user)
+        db_session.flush()
+        db_session.add(VotingQueue(
+            election_id=election.id, user_id=user.id, voting_token=f"coalesce-{i}", status=QueueStatus.NOTIFIED,
+        ))
+    db_session.commit()
+
+    original = voting._load_election
+    loads = []
+
+    def slow_load(*args):
+        loads.append(args[0])
+        time.sleep(0.05)
+        return original(*args)
+
+    async def run():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+            return await asyncio.gather(*(c.get(f"/voting/validate/coalesce-{i}") for i in range(8)))
+
+    with patch.object(voting, "_load_election", slow_load):
+        responses = asyncio.run(run())
+    assert len(loads) == 1
+    assert {r.status_code for r in responses} == {200}
+    assert len({r.content for r in responses}) == 1
+    assert responses[0].json()["election"]["candidates"][0]["name"] == "Ada"
+
+
+def test_validation_reads_the_queue_from_the_primary(client, db_session):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from database import Base, get_read_db
+
+    election = Election(
+        title="Council", status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db_session.add(election)
+    db_session.flush()
+    user = User(student_id="P1", email="p1@test.com", password_hash="hash", name="P1", role=UserRole.STUDENT)
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(VotingQueue(
+        election_id=election.id, user_id=user.id, voting_token="just-queued", status=QueueStatus.NOTIFIED,
+    ))
+    db_session.commit()
+
+    # A replica that has the election but not yet the queue entry
+    replica = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=replica)
+    with sessionmaker(bind=replica)() as lagging:
+        lagging.merge(Election(
+            id=election.id, title="Council", status=ElectionStatus.ACTIVE,
+            start_date=election.start_date, end_date=election.end_date,
+        ))
+        lagging.commit()
+
+    def replica_db():
+        with sessionmaker(bind=replica)() as db:
+            yield db
+
+    app.dependency_overrides[get_read_db] = replica_db
+    response = client.get("/voting/validate/just-queued")
+    assert response.status_code == 200
+    assert response.json()["election"]["title"] == "Council"
+    replica.dispose()
@@ -0,0 +1,129 @@
+import gzip
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import Candidate, Election, ElectionStatus, User, UserRole
+from routers.auth import get_current_user
+from routers.elections import election_list_cache
+from services.compression import choose_encoding
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    election_list_cache.clear()
+
+
+def _add_election(db_session, candidates, manifesto="We will extend library hours. " * 20):
+    election = Election(
+        title="Council", status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db_session.add(election)
+    db_session.commit()
+    for i in range(candidates):
+        db_session.add(Candidate(
+            election_id=election.id, name=f"Candidate {i}", role="President",
+            manifesto=manifesto, position=i,
+        ))
+    db_session.commit()
+    return election
+
+
+def _login():
+    from main import app
+    app.dependency_overrides[get_current_user] = lambda: User(id="user_id", role=UserRole.STUDENT)
+
+
+def test_choose_encoding():
+    assert choose_encoding(None) is None
+    assert choose_encoding("identity") is None
+    assert choose_encoding("gzip, deflate") == "gzip"
+    assert choose_encoding("gzip;q=0, deflate") is None
+    assert choose_encoding("*") == "gzip"
+
+
+def test_large_response_is_gzipped_with_weak_etag(client, db_session):
+    _login()
+    _add_election(db_session, candidates=40)
+
+    response = client.get("/elections/", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == response.num_bytes_downloaded
+    assert response.num_bytes_downloaded < len(response.content)
+    assert len(response.json()[0]["candidates"]) == 40
+
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"elections-')
+    response = client.get("/elections/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_small_and_unaccepted_responses_are_not_compressed(client, db_session):
+    _login()
+    _add_election(db_session, candidates=1, manifesto="Short")
+
+    response = client.get("/elections/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert not response.headers["etag"].startswith("W/")
+
+    _add_election(db_session, candidates=40)
+    response = client.get("/elections/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert int(response.headers["content-length"]) == len(response.content)
+
+
+def test_brotli_preferred_when_installed(client, db_session):
+    pytest.importorskip("brotli")
+    _login()
+    _add_election(db_session, candidates=40)
+
+    response = client.get("/elections/", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()[0]["candidates"]) == 40
+
+
+def test_listings_leave_out_manifestos(client, db_session):
+    _login()
+    _add_election(db_session, candidates=2)
+
+    for path in ("/elections/", "/voting/active"):
+        candidate = client.get(path).json()[0]["candidates"][0]
+        assert "manifesto" not in candidate
+        assert candidate["name"].startswith("Candidate")
+
+
+def test_manifesto_endpoint_is_cacheable(client, db_session):
+    election = _add_election(db_session, candidates=1, manifesto="Free coffee")
+    candidate_id = election.candidates[0].id
+
+    response = client.get(f"/elections/candidates/{candidate_id}/manifesto")
+    assert response.status_code == 200
+    assert response.json() == {"id": str(candidate_id), "manifesto": "Free coffee"}
+    assert response.headers["cache-control"].startswith("public, max-age=")
+
+    etag = response.headers["etag"]
+    response = client.get(f"/elections/candidates/{candidate_id}/manifesto", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    candidate = election.candidates[0]
+    candidate.manifesto = "Free tea"
+    db_session.commit()
+    response = client.get(f"/elections/candidates/{candidate_id}/manifesto", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    response = client.get("/elections/candidates/00000000-0000-0000-0000-000000000000/manifesto")
+    assert response.status_code == 404
+
+
+def test_gzip_body_round_trips(client, db_session):
+    _login()
+    _add_election(db_session, candidates=40)
+
+    with client.stream("GET", "/elections/", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == client.get("/elections/", headers={"Accept-Encoding": "identity"}).content
@@ -11,7 +11,7 @@ from sqlalchemy.pool import StaticPool
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from main import app
-from database import Base, get_db
+from database import Base, get_db, get_read_db
 from models import User, UserRole, Election, ElectionStatus, Department, Vote, Candidate
 from routers.auth import get_admin_user
 
@@ -43,6 +43,7 @@ class TestDashboardStats(unittest.TestCase):
              return u
 
         app.dependency_overrides[get_db] = override_get_db
+        app.dependency_overrides[get_read_db] = override_get_db
         app.dependency_overrides[get_admin_user] = override_get_admin_user
         self.client = TestClient(app)
 
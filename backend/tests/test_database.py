@@ -0,0 +1,188 @@
+import pytest
+
+from database import create_db_engine, sqlite_pragmas
+
+
+def _pragma(engine, name):
+    with engine.connect() as conn:
+        return conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+
+
+def test_tuned_profile_applies_pragmas(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tuned.db'}", sqlite_profile="tuned")
+    assert _pragma(engine, "journal_mode") == "wal"
+    assert _pragma(engine, "busy_timeout") == 5000
+    assert _pragma(engine, "synchronous") == 1  # NORMAL
+    assert _pragma(engine, "temp_store") == 2  # MEMORY
+    engine.dispose()
+
+
+def test_default_profile_leaves_sqlite_defaults(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'default.db'}", sqlite_profile="default")
+    assert _pragma(engine, "journal_mode") == "delete"
+    engine.dispose()
+
+
+def test_unknown_profile_rejected():
+    with pytest.raises(ValueError):
+        sqlite_pragmas("fastest")
+
+
+def _routing_session(tmp_path):
+    from sqlalchemy.orm import sessionmaker
+    from database import Base, RoutingSession
+
+    primary = create_db_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    Base.metadata.create_all(bind=primary)
+    Base.metadata.create_all(bind=replica)
+    factory = sessionmaker(class_=RoutingSession, primary=primary, replica=replica)
+    return factory(), primary, replica
+
+
+def test_routing_session_reads_replica_writes_primary(tmp_path):
+    from models import Department
+
+    db, primary, replica = _routing_session(tmp_path)
+    with replica.begin() as conn:
+        conn.execute(Department.__table__.insert().values(code="REP", name="Replica Only"))
+
+    # Reads go to the replica until the session writes
+    assert [d.code for d in db.query(Department).all()] == ["REP"]
+
+    db.add(Department(code="PRI", name="Primary"))
+    db.commit()
+
+    # After a write the session sticks to the primary (read-your-writes)
+    assert [d.code for d in db.query(Department).all()] == ["PRI"]
+    with replica.connect() as conn:
+        assert conn.exec_driver_sql("SELECT code FROM departments").scalars().all() == ["REP"]
+    db.close()
+    primary.dispose()
+    replica.dispose()
+
+
+def test_pool_options_skip_sizing_for_memory_sqlite():
+    from database import pool_options
+
+    assert "pool_size" not in pool_options("sqlite:///:memory:")
+    options = pool_options("sqlite:///./campusvote.db")
+    assert options["pool_size"] == 5 and options["max_overflow"] == 10
+    assert options["pool_pre_ping"] is True
+
+
+def test_reader_engine_is_read_only_and_sees_commits(tmp_path):
+    from sqlalchemy.exc import OperationalError
+    from database import create_reader_engine
+
+    url = f"sqlite:///{tmp_path / 'split.db'}"
+    writer = create_db_engine(url, sqlite_profile="tuned")
+    with writer.begin() as conn:
+        conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+
+    reader = create_reader_engine(url, sqlite_profile="tuned")
+    with reader.connect() as conn:
+        assert conn.exec_driver_sql("SELECT count(*) FROM t").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("INSERT INTO t VALUES (2)")
+    reader.dispose()
+    writer.dispose()
+
+
+def test_write_db_serializes_writers():
+    import asyncio
+    from database import get_write_db
+
+    order = []
+
+    async def writer(name):
+        dependency = get_write_db()
+        await dependency.__anext__()
+        order.append(f"{name} start")
+        await asyncio.sleep(0.01)
+        order.append(f"{name} end")
+        await dependency.aclose()
+
+    async def main():
+        await asyncio.gather(writer("a"), writer("b"))
+
+    asyncio.run(main())
+    assert order == ["a start", "a end", "b start", "b end"]
+
+
+def test_write_db_does_not_lock_off_sqlite():
+    import asyncio
+    from unittest.mock import patch
+
+    import database
+
+    order = []
+
+    async def writer(name):
+        dependency = database.get_write_db()
+        await dependency.__anext__()
+        order.append(f"{name} start")
+        await asyncio.sleep(0.01)
+        order.append(f"{name} end")
+        await dependency.aclose()
+
+    async def main():
+        await asyncio.gather(writer("a"), writer("b"))
+
+    with patch.object(database, "SERIALIZE_WRITES", False):
+        asyncio.run(main())
+    assert order == ["a start", "b start", "a end", "b end"]
+
+
+def test_write_endpoint_holds_lock_through_real_dependency(client, db_session):
+    from datetime import datetime, timedelta
+    from unittest.mock import patch
+
+    from sqlalchemy.orm import sessionmaker
+
+    import database
+    from main import app
+    from models import Election, User, UserRole
+    from routers import elections
+    from routers.auth import get_admin_user
+
+    election = Election(title="Council", start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1))
+    db_session.add(election)
+    db_session.commit()
+
+    held = []
+    original = elections.next_candidate_position
+
+    def spy(db, election):
+        held.append(database.write_lock.locked())
+        return original(db, election)
+
+    app.dependency_overrides[get_admin_user] = lambda: User(id="admin_id", role=UserRole.ADMIN, name="Admin")
+    del app.dependency_overrides[database.get_write_db]
+    with patch.object(database, "SessionLocal", sessionmaker(bind=db_session.get_bind())), \
+            patch.object(elections, "next_candidate_position", spy):
+        response = client.post(f"/elections/{election.id}/candidates", json={"name": "Ada", "role": "President"})
+    assert response.status_code == 200
+    assert held == [True]
+    assert not database.write_lock.locked()
+
+
+def test_register_hashes_outside_write_lock(client):
+    from unittest.mock import patch
+
+    import database
+    from routers import auth
+
+    held = []
+
+    async def run(fn, *args):
+        held.append(database.write_lock.locked())
+        return fn(*args)
+
+    with patch.object(auth.hashing_pool, "run", run):
+        response = client.post("/auth/register", json={
+            "student_id": "S100", "email": "s100@test.com", "password": "secret123", "name": "New Student",
+        })
+    assert response.status_code == 200
+    assert held == [False]
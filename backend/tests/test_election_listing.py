@@ -0,0 +1,148 @@
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+
+from models import User, UserRole, Election, ElectionStatus, Candidate
+from routers.auth import get_current_user
+from routers.elections import election_list_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Versions restart at zero for every fresh test database
+    election_list_cache.clear()
+
+
+def _login(db_session):
+    from main import app
+    app.dependency_overrides[get_current_user] = lambda: User(id="user_id", role=UserRole.STUDENT, name="Student")
+
+
+def _add_elections(db_session, count):
+    now = datetime.utcnow()
+    for i in range(count):
+        db_session.add(Election(
+            title=f"Election {i}",
+            status=ElectionStatus.ACTIVE,
+            start_date=now,
+            end_date=now + timedelta(days=1),
+            created_at=now - timedelta(minutes=i),
+        ))
+    db_session.commit()
+
+
+def test_elections_etag_and_not_modified(client, db_session):
+    _login(db_session)
+    _add_elections(db_session, 2)
+
+    response = client.get("/elections/")
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    etag = response.headers["etag"]
+
+    response = client.get("/elections/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # Any write to an election table changes the ETag
+    election = db_session.query(Election).first()
+    db_session.add(Candidate(election_id=election.id, name="New", role="President", position=0))
+    db_session.commit()
+
+    response = client.get("/elections/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert sum(len(e["candidates"]) for e in response.json()) == 1
+
+
+
+def test_elections_etag_depends_on_query(client, db_session):
+    _login(db_session)
+    _add_elections(db_session, 2)
+
+    etag = client.get("/elections/").headers["etag"]
+    for params in ("?status=planned", "?limit=1", "?fields=title"):
+        response = client.get(f"/elections/{params}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+
+def test_elections_cursor_pagination(client, db_session):
+    _login(db_session)
+    _add_elections(db_session, 5)
+
+    titles = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/elections/", params=params)
+        assert response.status_code == 200
+        titles.extend(e["title"] for e in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert titles == [f"Election {i}" for i in range(5)]
+
+
+def test_elections_invalid_cursor(client, db_session):
+    _login(db_session)
+    response = client.get("/elections/", params={"limit": 2, "cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+    # Well-formed JSON with the wrong value types is rejected too
+    for values in ("[1, 2]", "[null, null]", '[["a"], {"b": 1}]'):
+        cursor = base64.urlsafe_b64encode(values.encode()).decode()
+        for path in ("/elections/", "/clubs/"):
+            response = client.get(path, params={"limit": 2, "cursor": cursor})
+            assert response.status_code == 400, (path, values)
+
+
+def test_elections_field_projection(client, db_session):
+    _login(db_session)
+    _add_elections(db_session, 1)
+    election = db_session.query(Election).first()
+    db_session.add(Candidate(election_id=election.id, name="C", role="President", manifesto="Long text", position=0))
+    db_session.commit()
+
+    # Manifestos are left out of listings by default
+    candidate = client.get("/elections/").json()[0]["candidates"][0]
+    assert "manifesto" not in candidate
+
+    response = client.get("/elections/", params={"fields": "title,candidates.name,candidates.manifesto"})
+    assert response.status_code == 200
+    item = response.json()[0]
+    assert set(item) == {"id", "title", "candidates"}
+    assert item["candidates"][0] == {"id": str(candidate["id"]), "name": "C", "manifesto": "Long text"}
+
+
+def test_elections_match_pydantic_serialization(client, db_session):
+    """Core rows + orjson produce the same JSON as the response models would"""
+    from fastapi.encoders import jsonable_encoder
+    from models import Department
+    from schemas import ElectionWithCandidates
+
+    _login(db_session)
+    dept = Department(code="CS", name="Computer Science", total_students=10)
+    db_session.add(dept)
+    db_session.commit()
+    _add_elections(db_session, 2)
+    election = db_session.query(Election).order_by(Election.created_at.desc()).first()
+    election.department_id = dept.id
+    db_session.add(Candidate(
+        election_id=election.id, name="Ada", role="President", photo_url="http://x/a.png",
+        manifesto="Long manifesto", vote_count=3, position=0,
+    ))
+    db_session.commit()
+
+    expected = []
+    for e in db_session.query(Election).order_by(Election.created_at.desc()).all():
+        item = jsonable_encoder(ElectionWithCandidates.model_validate(e))
+        for candidate in item["candidates"]:
+            del candidate["manifesto"]  # left out of listings by default
+            del candidate["vote_count"]  # never listed
+        expected.append(item)
+
+    assert client.get("/elections/").json() == expected
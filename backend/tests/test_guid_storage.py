@@ -0,0 +1,51 @@
+import uuid
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from models import User, Department
+from migrate_guids import migrate_guids, needs_migration
+
+
+def test_guid_stored_as_16_bytes(db_session):
+    user = User(student_id="S1", email="s1@test.com", password_hash="hash", name="S1")
+    db_session.add(user)
+    db_session.commit()
+
+    stored = db_session.execute(text("SELECT typeof(id), length(id) FROM users")).one()
+    assert tuple(stored) == ("blob", 16)
+    assert db_session.query(User).filter(User.id == str(user.id)).one().id == user.id
+
+
+def test_migrate_legacy_char36_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    dept_id, user_id = uuid.uuid4(), uuid.uuid4()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE departments (id CHAR(36) PRIMARY KEY, code VARCHAR(20) UNIQUE NOT NULL, "
+            "name VARCHAR(255) NOT NULL, total_students INTEGER)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE users (id CHAR(36) PRIMARY KEY, student_id VARCHAR(50) NOT NULL, "
+            "email VARCHAR(255) NOT NULL, password_hash VARCHAR(255) NOT NULL, name VARCHAR(255) NOT NULL, "
+            "role VARCHAR(7), department_id CHAR(36) REFERENCES departments(id), created_at DATETIME)"
+        )
+        conn.exec_driver_sql("CREATE UNIQUE INDEX ix_users_student_id ON users (student_id)")
+        conn.exec_driver_sql("INSERT INTO departments VALUES (?, 'CSE', 'Computer Science', 10)", (str(dept_id),))
+        conn.exec_driver_sql(
+            "INSERT INTO users VALUES (?, 'S1', 's1@test.com', 'hash', 'S1', 'STUDENT', ?, '2026-01-01 00:00:00')",
+            (str(user_id), str(dept_id)),
+        )
+
+    assert needs_migration(engine)
+    assert migrate_guids(engine)
+    assert not needs_migration(engine)
+    assert not migrate_guids(engine)
+
+    db = sessionmaker(bind=engine)()
+    user = db.query(User).one()
+    assert user.id == user_id
+    assert user.department.id == dept_id
+    assert db.query(Department).one().code == "CSE"
+    db.close()
+    engine.dispose()
@@ -0,0 +1,145 @@
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert
+
+from models import (
+    Candidate, Election, ElectionStatus, IdempotencyRecord, QueueStatus, User, UserRole, Vote, VotingQueue,
+)
+from schemas import VoteCreate
+from services.idempotency import idempotency_store, request_hash
+
+
+@pytest.fixture(autouse=True)
+def clear_store():
+    idempotency_store.cache.clear()
+
+
+def _setup(db_session):
+    election = Election(
+        title="Council", status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    user = User(student_id="I1", email="i1@test.com", password_hash="hash", name="I1", role=UserRole.STUDENT)
+    db_session.add_all([election, user])
+    db_session.flush()
+    candidates = [
+        Candidate(election_id=election.id, name=name, role="President", position=i)
+        for i, name in enumerate(["Ada", "Grace"])
+    ]
+    db_session.add_all(candidates)
+    db_session.add(VotingQueue(
+        election_id=election.id, user_id=user.id, status=QueueStatus.NOTIFIED, voting_token="idem-token",
+    ))
+    db_session.commit()
+    return election, candidates
+
+
+def _vote(election, candidate):
+    return {"election_id": str(election.id), "candidate_id": str(candidate.id)}
+
+
+def test_retry_returns_original_response_without_votes_queries(client, db_session, query_budget):
+    election, (ada, _) = _setup(db_session)
+    headers = {"Idempotency-Key": "attempt-1"}
+
+    first = client.post("/voting/cast/idem-token", json=_vote(election, ada), headers=headers)
+    assert first.status_code == 200
+    assert "idempotent-replayed" not in first.headers
+    assert first.json()["candidate_id"] == str(ada.id)
+
+    retry = client.post("/voting/cast/idem-token", json=_vote(election, ada), headers=headers)
+    assert retry.status_code == 200
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.content == first.content
+    query_budget(retry, 0)
+
+    # Another worker (empty cache) finds it in the database, still without reading votes
+    idempotency_store.cache.clear()
+    retry = client.post("/voting/cast/idem-token", json=_vote(election, ada), headers=headers)
+    assert retry.content == first.content
+    query_budget(retry, 1)
+    assert "votes" not in retry.headers["X-DB-Slowest-Statement"]
+
+    assert db_session.query(Vote).count() == 1
+    assert db_session.get(Candidate, ada.id).vote_count == 1
+
+
+def test_key_reused_for_a_different_vote_is_rejected(client, db_session):
+    election, (ada, grace) = _setup(db_session)
+    headers = {"Idempotency-Key": "attempt-1"}
+
+    assert client.post("/voting/cast/idem-token", json=_vote(election, ada), headers=headers).status_code == 200
+    response = client.post("/voting/cast/idem-token", json=_vote(election, grace), headers=headers)
+    assert response.status_code == 422
+    # A new key is a new attempt, which the usual checks turn down
+    response = client.post("/voting/cast/idem-token", json=_vote(election, grace),
+                           headers={"Idempotency-Key": "attempt-2"})
+    assert response.status_code == 400
+
+
+def test_keys_are_scoped_to_the_voting_token(client, db_session):
+    election, (ada, _) = _setup(db_session)
+    assert client.post("/voting/cast/idem-token", json=_vote(election, ada),
+                       headers={"Idempotency-Key": "shared"}).status_code == 200
+    response = client.post("/voting/cast/other-token", json=_vote(election, ada),
+                           headers={"Idempotency-Key": "shared"})
+    assert response.status_code == 404
+
+
+def test_expired_records_are_not_replayed(client, db_session):
+    election, (ada, _) = _setup(db_session)
+    headers = {"Idempotency-Key": "attempt-1"}
+    assert client.post("/voting/cast/idem-token", json=_vote(election, ada), headers=headers).status_code == 200
+
+    idempotency_store.cache.clear()
+    record = db_session.query(IdempotencyRecord).one()
+    record.created_at = datetime.utcnow() - timedelta(days=2)
+    db_session.commit()
+    response = client.post("/voting/cast/idem-token", json=_vote(election, ada), headers=headers)
+    assert response.status_code == 400
+
+
+def test_ballot_retry_is_replayed(client, db_session):
+    election, (ada, _) = _setup(db_session)
+    ballot = {"election_id": str(election.id), "candidate_ids": [str(ada.id)]}
+    headers = {"Idempotency-Key": "ballot-1"}
+
+    first = client.post("/voting/ballot/idem-token", json=ballot, headers=headers)
+    assert first.status_code == 200
+    retry = client.post("/voting/ballot/idem-token", json=ballot, headers=headers)
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+
+
+@pytest.mark.parametrize("winner_is_retry", [True, False])
+def test_concurrent_duplicate_is_replayed_or_rejected(client, db_session, winner_is_retry):
+    election, (ada, grace) = _setup(db_session)
+    user_id = db_session.query(VotingQueue.user_id).scalar()
+    body_hash = request_hash(VoteCreate(**_vote(election, ada)).model_dump_json().encode())
+
+    def concurrent_cast(session, flush_context, instances):
+        # Another request for the same voter commits between our checks and our flush
+        if not any(isinstance(obj, Vote) for obj in session.new):
+            return
+        session.connection().execute(insert(Vote.__table__).values(
+            id=uuid.uuid4(), election_id=election.id, user_id=user_id, candidate_id=ada.id,
+        ))
+        if winner_is_retry:
+            idempotency_store.remember(("idem-token", "attempt-1"), (body_hash, 200, b'{"first": true}', datetime.utcnow()))
+
+    event.listen(db_session, "before_flush", concurrent_cast)
+    try:
+        response = client.post("/voting/cast/idem-token", json=_vote(election, ada),
+                               headers={"Idempotency-Key": "attempt-1"})
+    finally:
+        event.remove(db_session, "before_flush", concurrent_cast)
+
+    if winner_is_retry:
+        assert response.status_code == 200
+        assert response.headers["idempotent-replayed"] == "true"
+        assert response.json() == {"first": True}
+    else:
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Already voted in this election"
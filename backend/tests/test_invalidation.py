@@ -0,0 +1,139 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, create_db_engine
+from models import Election, ElectionStatus, User, UserRole
+from routers.auth import create_access_token, principal_cache
+from services.invalidation import InvalidationBus, invalidation_bus
+from services.response_cache import ResponseCache
+
+
+def _election(title="Council"):
+    return Election(
+        title=title, status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+
+
+def test_commit_notifies_local_subscribers(db_session):
+    seen = []
+    callback = seen.append
+    invalidation_bus.subscribe({"elections"}, callback)
+    try:
+        db_session.add(_election())
+        db_session.rollback()
+        assert seen == []
+
+        db_session.add(_election())
+        db_session.commit()
+        assert seen == [{"elections"}]
+    finally:
+        invalidation_bus.unsubscribe(callback)
+
+
+def test_cache_set_after_clear_is_dropped():
+    cache = ResponseCache()
+    generation = cache.generation
+    cache.clear()  # an invalidation lands while the value is being loaded
+    cache.set("key", "stale", generation)
+    assert cache.get("key") is None
+    cache.set("key", "fresh", cache.generation)
+    assert cache.get("key") == "fresh"
+
+
+def test_writes_reach_eight_workers(tmp_path):
+    """Eight buses polling one database, as eight uvicorn workers would"""
+    url = f"sqlite:///{tmp_path / 'bus.db'}"
+    writer = create_db_engine(url)
+    Base.metadata.create_all(bind=writer)
+
+    workers = []
+    for _ in range(8):
+        bus = InvalidationBus(poll_interval_ms=10)
+        received = threading.Event()
+        bus.subscribe({"elections"}, lambda tables, received=received: received.set())
+        bus.subscribe({"users"}, lambda tables: None)
+        engine = create_db_engine(url)
+        workers.append((bus, received, engine))
+        bus.start(engine)
+    try:
+        time.sleep(0.1)  # let every bus take its baseline
+        session = sessionmaker(bind=writer)()
+        session.add(_election())
+        start = time.perf_counter()
+        session.commit()
+        session.close()
+
+        for bus, received, engine in workers:
+            assert received.wait(timeout=2)
+        latency = time.perf_counter() - start
+        assert latency < 2
+    finally:
+        for bus, received, engine in workers:
+            bus.stop()
+            engine.dispose()
+        writer.dispose()
+
+
+def test_principal_cache_skips_users_query_until_users_change(client, db_session, query_budget):
+    principal_cache.clear()
+    user = User(student_id="P1", email="p1@test.com", password_hash="hash", name="Before", role=UserRole.STUDENT)
+    db_session.add(user)
+    db_session.commit()
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+    assert client.get("/auth/me", headers=headers).json()["name"] == "Before"
+    # Only the department lookup is left
+    query_budget(client.get("/auth/me", headers=headers), 1)
+
+    user.name = "After"
+    db_session.commit()
+    assert client.get("/auth/me", headers=headers).json()["name"] == "After"
+
+
+def test_recent_elections_cache_cleared_on_write(client, db_session):
+    from main import app
+    from routers.auth import get_admin_user
+    app.dependency_overrides[get_admin_user] = lambda: User(id="admin_id", role=UserRole.ADMIN)
+
+    db_session.add(_election("First"))
+    db_session.commit()
+    assert [e["title"] for e in client.get("/dashboard/recent-elections").json()] == ["First"]
+
+    db_session.add(_election("Second"))
+    db_session.commit()
+    assert len(client.get("/dashboard/recent-elections").json()) == 2
+
+
+def test_counter_only_writes_leave_versions_alone(db_session):
+    from models import Candidate, TableVersion, get_versions
+
+    assert db_session.query(TableVersion).count() == 4  # seeded when the table is created
+    election = _election()
+    db_session.add(election)
+    db_session.flush()
+    candidate = Candidate(election_id=election.id, name="Ada", role="President", position=0)
+    db_session.add(candidate)
+    db_session.commit()
+    before = get_versions(db_session, ("elections", "candidates"))
+
+    seen = []
+    callback = seen.append
+    invalidation_bus.subscribe({"elections", "candidates"}, callback)
+    try:
+        candidate.vote_count = Candidate.vote_count + 1
+        election.positions_issued = 1
+        db_session.commit()
+        assert get_versions(db_session, ("elections", "candidates")) == before
+        assert seen == []
+
+        candidate.name = "Ada L."
+        candidate.vote_count = Candidate.vote_count + 1
+        db_session.commit()
+        assert get_versions(db_session, ("elections", "candidates")) == (before[0], before[1] + 1)
+        assert seen == [{"candidates"}]
+    finally:
+        invalidation_bus.unsubscribe(callback)
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+import metrics
+from database import create_db_engine, pool_options
+from models import Candidate, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue
+from routers.auth import get_password_hash
+from services.hashing_pool import HashingPool
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("test_latency_seconds", "Test latency", ["route"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.1, route="/a")
+    histogram.observe(5, route="/a")
+
+    lines = histogram.render().splitlines()
+    assert lines[:2] == ["# HELP test_latency_seconds Test latency", "# TYPE test_latency_seconds histogram"]
+    assert 'test_latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+    assert 'test_latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_latency_seconds_count{route="/a"} 3' in lines
+    assert 'test_latency_seconds_sum{route="/a"} 5.15' in lines
+
+
+def test_label_values_are_escaped():
+    counter = metrics.Counter("test_total", "Test", ["name"])
+    counter.inc(name='say "hi"\n')
+    assert 'test_total{name="say \\"hi\\"\\n"} 1' in counter.render()
+
+
+def test_metrics_endpoint_reports_votes_queue_and_latency(client, db_session):
+    election = Election(
+        title="Metrics Election", status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    user = User(student_id="M1", email="m1@test.com", password_hash="hash", name="M1", role=UserRole.STUDENT)
+    db_session.add_all([election, user])
+    db_session.commit()
+    candidate = Candidate(election_id=election.id, name="C", role="President")
+    db_session.add_all([
+        candidate,
+        VotingQueue(election_id=election.id, user_id=user.id, voting_token="metrics-token",
+                    status=QueueStatus.NOTIFIED, batch_number=1),
+    ])
+    db_session.commit()
+    before = metrics.votes_cast.value(election_id=election.id)
+
+    response = client.post(
+        "/voting/cast/metrics-token",
+        json={"election_id": str(election.id), "candidate_id": str(candidate.id)},
+    )
+    assert response.status_code == 200
+    assert metrics.votes_cast.value(election_id=election.id) == before + 1
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert f'campusvote_votes_cast_total{{election_id="{election.id}"}}' in body
+    assert 'campusvote_voting_queue_depth{status="voted"} 1' in body
+    assert 'campusvote_voting_queue_depth{status="pending"} 0' in body
+    assert 'campusvote_http_request_duration_seconds_count{method="POST",route="/voting/cast/{token}",status="200"}' in body
+    assert "campusvote_http_requests_in_flight 1" in body  # the scrape itself
+    assert 'campusvote_bcrypt_pool_workers{state="busy"}' in body
+
+
+def test_hashing_pool_tracks_saturation():
+    pool = HashingPool(max_workers=1)
+    release = threading.Event()
+
+    def job(value):
+        release.wait(5)
+        return value * 2
+
+    async def run():
+        tasks = [asyncio.ensure_future(pool.run(job, i)) for i in range(3)]
+        while pool.stats()[("queued",)] != 2:
+            await asyncio.sleep(0.001)
+        # One job holds the single worker, the other two wait
+        saturated = pool.stats()
+        release.set()
+        return saturated, await asyncio.gather(*tasks)
+
+    saturated, results = asyncio.run(run())
+    assert saturated == {("busy",): 1, ("idle",): 0, ("queued",): 2}
+    assert results == [0, 2, 4]
+    assert pool.stats() == {("busy",): 0, ("idle",): 1, ("queued",): 0}
+
+
+def test_login_hashes_on_pool(client, db_session):
+    db_session.add(User(
+        student_id="P1", email="p1@test.com", password_hash=get_password_hash("pw"),
+        name="P1", role=UserRole.STUDENT,
+    ))
+    db_session.commit()
+    assert client.post("/auth/login", json={"student_id": "P1", "password": "pw"}).status_code == 200
+    assert client.post("/auth/login", json={"student_id": "P1", "password": "nope"}).status_code == 401
+
+
+def test_pool_checkout_wait_is_recorded(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    engine = create_db_engine(url, **pool_options(url, "test-pool"))
+    before = metrics.pool_checkout_wait.count(pool="test-pool")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+    engine.dispose()
+    assert metrics.pool_checkout_wait.count(pool="test-pool") == before + 1
@@ -0,0 +1,109 @@
+import uuid
+from pathlib import Path
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.orm import Session
+
+from database import Base, SCHEMA_VERSION, check_schema_version, create_db_engine
+from migrate import alembic_config, run_migrations
+from models import Candidate, Club, Election, TableVersion, TRACKED_TABLES, Vote
+
+BASELINE_SCHEMA = Path(__file__).parent / "fixtures" / "baseline_schema.sql"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+    yield engine
+    engine.dispose()
+
+
+def test_schema_version_matches_head():
+    assert ScriptDirectory.from_config(alembic_config()).get_current_head() == SCHEMA_VERSION
+
+
+def test_migrations_build_model_schema(engine):
+    run_migrations(engine)
+    check_schema_version(engine)
+
+    with engine.connect() as conn:
+        diff = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+    assert diff == []
+
+    with Session(engine) as db:
+        assert {v.name: v.version for v in db.query(TableVersion)} == dict.fromkeys(TRACKED_TABLES, 0)
+
+
+def test_unmigrated_database_fails_check(engine):
+    with pytest.raises(RuntimeError, match="migrate.py"):
+        check_schema_version(engine)
+
+
+def test_legacy_create_all_database_is_adopted(engine):
+    # A database as the pre-migration code left it: CHAR(36) GUIDs, no positions or counters
+    dept, user, other, club, election, first, second = (str(uuid.uuid4()) for _ in range(7))
+    with engine.begin() as conn:
+        for statement in BASELINE_SCHEMA.read_text().split(";"):
+            if statement.strip():
+                conn.exec_driver_sql(statement)
+        conn.exec_driver_sql("INSERT INTO departments VALUES (?, 'CSE', 'Computer Science', 10)", (dept,))
+        for user_id, student_id in ((user, "S1"), (other, "S2")):
+            conn.exec_driver_sql(
+                "INSERT INTO users VALUES (?, ?, ?, 'hash', 'Student', 'STUDENT', ?, '2026-01-01 00:00:00')",
+                (user_id, student_id, f"{student_id}@test.com", dept),
+            )
+        conn.exec_driver_sql("INSERT INTO clubs VALUES (?, 'Space club', 'Science', '', 'ACTIVE', NULL)", (club,))
+        conn.exec_driver_sql("INSERT INTO club_members VALUES (?, ?, ?, 'MEMBER', NULL)", (str(uuid.uuid4()), club, user))
+        conn.exec_driver_sql(
+            "INSERT INTO elections VALUES (?, 'Council', NULL, 'ACTIVE', '2026-01-01 00:00:00', "
+            "'2026-01-02 00:00:00', 60, '2026-01-01 00:00:00')",
+            (election,),
+        )
+        # Inserted with the later-sorting id first: positions follow insertion order
+        first, second = sorted((first, second), reverse=True)
+        for candidate_id, name in ((first, "Ada"), (second, "Grace")):
+            conn.exec_driver_sql(
+                "INSERT INTO candidates VALUES (?, ?, ?, 'President', NULL, NULL, 0)", (candidate_id, election, name)
+            )
+        conn.exec_driver_sql(
+            "INSERT INTO votes VALUES (?, ?, ?, ?, NULL)", (str(uuid.uuid4()), election, other, second)
+        )
+
+    run_migrations(engine)
+    check_schema_version(engine)
+
+    with Session(engine) as db:
+        assert db.get(Club, uuid.UUID(club)).member_count == 1
+        positions = {c.name: c.position for c in db.query(Candidate)}
+        assert positions == {"Ada": 0, "Grace": 1}
+        assert db.get(Election, uuid.UUID(election)).positions_issued == 2
+        assert db.query(Vote).one().candidate_id == uuid.UUID(second)
+
+
+def test_migrations_are_rerunnable(engine):
+    run_migrations(engine)
+    run_migrations(engine)
+    check_schema_version(engine)
+
+
+def test_positions_issued_backfill_counts_ballot_positions(engine):
+    run_migrations(engine, "0003")
+    election = uuid.uuid4()
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO elections (id, title, status, vote_type, start_date, end_date, batch_size) "
+            "VALUES (?, 'Council', 'ACTIVE', 'PLURALITY', '2026-01-01 00:00:00', '2026-01-02 00:00:00', 60)",
+            (election.bytes,),
+        )
+        # Positions 0 and 4 were voted for, then their candidates were removed
+        conn.exec_driver_sql(
+            "INSERT INTO ballots (id, election_id, user_id, choices) VALUES (?, ?, ?, ?)",
+            (uuid.uuid4().bytes, election.bytes, uuid.uuid4().bytes, bytes([4, 0, 0, 0])),
+        )
+
+    run_migrations(engine)
+    with Session(engine) as db:
+        assert db.get(Election, election).positions_issued == 5
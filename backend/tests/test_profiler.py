@@ -0,0 +1,110 @@
+import re
+import time
+from collections import Counter
+from unittest.mock import patch
+
+import pytest
+
+from main import app
+from models import User, UserRole
+from routers.auth import get_admin_user
+from services import profiler as profiler_module
+from services.profiler import SlowRequestProfiler, parse_profile_name, profile_name
+
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    instance = SlowRequestProfiler(
+        directory=str(tmp_path / "profiles"), slow_ms=50, sample_rate=0.0,
+        interval_ms=1, max_profiles=3, enabled=True,
+    )
+    with patch.object(profiler_module, "profiler", instance), patch("routers.profiles.profiler", instance):
+        yield instance
+
+
+def test_profile_names_round_trip():
+    name = profile_name(1700000000.123, 1234.5, "POST", "/voting/send-links")
+    info = parse_profile_name(name)
+    assert info["method"] == "POST"
+    assert info["route"] == "/voting/send-links"
+    assert info["duration_ms"] == 1234
+    assert parse_profile_name("../../etc/passwd") is None
+
+    # Underscores, braces and slashes all survive
+    for route in ("/voting/queue-status/{election_id}", "/dashboard/query_stats", "/", "<unmatched>"):
+        name = profile_name(1700000000.123, 10, "GET", route)
+        assert re.fullmatch(r"[\w.-]+", name)
+        assert parse_profile_name(name)["route"] == route
+
+
+def test_slow_request_is_saved_in_collapsed_format(profiler):
+    stacks = profiler.start_request()
+    busy_loop(0.1)
+    name = profiler.finish_request(stacks, "GET", "/dashboard/turnout", 100)
+
+    assert name is not None
+    with open(profiler.profile_path(name)) as f:
+        lines = f.read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert any("busy_loop (test_profiler.py:" in line for line in lines)
+
+
+def test_fast_requests_are_dropped_unless_sampled(profiler):
+    stacks = profiler.start_request()
+    busy_loop(0.02)
+    assert profiler.finish_request(stacks, "GET", "/voting/active", 20) is None
+
+    stacks = profiler.start_request()
+    busy_loop(0.02)
+    assert profiler.finish_request(stacks, "GET", "/voting/active", 20, sampled=True) is not None
+
+
+def test_ring_keeps_newest_profiles(profiler):
+    names = []
+    for i in range(5):
+        stacks = profiler.start_request()
+        busy_loop(0.01)
+        names.append(profiler.save(stacks or Counter({"main": 1}), "GET", f"/route{i}", 100))
+        time.sleep(0.002)  # distinct millisecond timestamps
+    assert [p["name"] for p in profiler.list_profiles()] == names[:1:-1]
+
+
+def test_disabled_middleware_does_not_profile(client, db_session, profiler):
+    profiler.enabled = False
+    with patch.object(profiler, "start_request") as start:
+        client.get("/voting/validate/missing")
+    start.assert_not_called()
+
+
+def test_middleware_reports_route_template(client, db_session, profiler):
+    with patch.object(profiler, "finish_request") as finish:
+        client.get("/voting/validate/missing")
+    (stacks, method, route, duration_ms, sampled), _ = finish.call_args
+    assert (method, route) == ("GET", "/voting/validate/{token}")
+    assert duration_ms > 0
+
+
+def test_admin_can_list_and_download_profiles(client, db_session, profiler):
+    app.dependency_overrides[get_admin_user] = lambda: User(role=UserRole.ADMIN)
+    name = profiler.save(Counter({"main;handler": 3}), "GET", "/dashboard/turnout", 2500)
+
+    response = client.get("/profiles/")
+    assert response.status_code == 200
+    assert [(p["name"], p["route"], p["duration_ms"]) for p in response.json()] == [
+        (name, "/dashboard/turnout", 2500)
+    ]
+
+    response = client.get(f"/profiles/{name}")
+    assert response.status_code == 200
+    assert response.text == "main;handler 3\n"
+
+    assert client.get("/profiles/..%2Fconftest.py").status_code == 404
+    assert client.get("/profiles/missing.folded").status_code == 404
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from config import settings
+from main import app
+from models import (
+    Candidate, Department, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue,
+)
+from routers.auth import create_access_token, get_admin_user
+from services.query_stats import route_metrics, track_queries
+from services.queue_service import process_next_batch
+
+
+def _seed_voter(db_session, students=5):
+    dept = Department(code="CS", name="Computer Science")
+    db_session.add(dept)
+    db_session.commit()
+    users = [
+        User(student_id=f"S{i}", email=f"s{i}@test.com", password_hash="hash",
+             name=f"S{i}", role=UserRole.STUDENT, department_id=dept.id)
+        for i in range(students)
+    ]
+    election = Election(
+        title="Budget Election", department_id=dept.id, status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db_session.add_all(users + [election])
+    db_session.commit()
+    candidates = [Candidate(election_id=election.id, name=f"C{i}", role="President") for i in range(3)]
+    entry = VotingQueue(
+        election_id=election.id, user_id=users[0].id, voting_token="budget-token",
+        status=QueueStatus.NOTIFIED, batch_number=1,
+        expires_at=datetime.utcnow() + timedelta(hours=1),
+    )
+    db_session.add_all(candidates + [entry])
+    db_session.commit()
+    return users, election, candidates
+
+
+def test_track_queries_counts_statements(db_session):
+    with track_queries() as stats:
+        db_session.execute(text("SELECT 1"))
+        db_session.execute(text("SELECT 2"))
+    assert stats.count == 2
+    assert stats.total_ms >= stats.slowest_ms > 0
+    assert stats.slowest_statement in ("SELECT 1", "SELECT 2")
+
+    # Statements outside the block are not attributed
+    db_session.execute(text("SELECT 3"))
+    assert stats.count == 2
+
+
+def test_process_next_batch_loads_users_with_entries(db_session):
+    users, election, _ = _seed_voter(db_session, students=20)
+    db_session.add_all([
+        VotingQueue(election_id=election.id, user_id=u.id, voting_token=f"batch-{i}", batch_number=2)
+        for i, u in enumerate(users[1:])
+    ])
+    db_session.commit()
+    db_session.expire_all()
+
+    with track_queries() as stats:
+        assert process_next_batch(db_session, election.id) == 19
+    # pending lookup, batch with users, election, then the status updates and commit
+    assert stats.count <= 5
+
+
+def test_headers_only_in_debug_mode(client, db_session):
+    _seed_voter(db_session)
+    assert not settings.DEBUG
+    response = client.get("/voting/validate/budget-token")
+    assert response.status_code == 200
+    assert "X-DB-Query-Count" not in response.headers
+
+
+def test_voting_query_budgets(client, db_session, query_budget):
+    _, election, candidates = _seed_voter(db_session)
+
+    response = client.get("/voting/validate/budget-token")
+    assert response.status_code == 200
+    query_budget(response, 2)
+    assert float(response.headers["X-DB-Query-Time-Ms"]) >= float(response.headers["X-DB-Slowest-Ms"])
+
+    response = client.post(
+        "/voting/cast/budget-token",
+        json={"election_id": str(election.id), "candidate_id": str(candidates[0].id)},
+    )
+    assert response.status_code == 200
+    query_budget(response, 8)
+
+
+def test_user_query_budgets(client, db_session, query_budget):
+    users, _, _ = _seed_voter(db_session, students=20)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(users[0].id)})}"}
+
+    # The user plus their department
+    query_budget(client.get("/auth/me", headers=headers), 2)
+    # One query for the user, one for elections with candidates; independent of student count
+    query_budget(client.get("/voting/active", headers=headers), 2)
+
+
+def test_dashboard_query_budgets(client, db_session, query_budget):
+    _seed_voter(db_session, students=20)
+    app.dependency_overrides[get_admin_user] = lambda: User(role=UserRole.ADMIN)
+
+    query_budget(client.get("/dashboard/stats"), 4)
+    query_budget(client.get("/dashboard/turnout"), 3)
+    query_budget(client.get("/dashboard/recent-elections"), 1)
+
+
+def test_metrics_aggregate_per_route_template(client, db_session):
+    _seed_voter(db_session)
+    app.dependency_overrides[get_admin_user] = lambda: User(role=UserRole.ADMIN)
+    route_metrics.clear()
+
+    client.get("/voting/validate/budget-token")
+    client.get("/voting/validate/unknown-token")
+
+    response = client.get("/dashboard/query-stats")
+    assert response.status_code == 200
+    stats = {s["route"]: s for s in response.json()}
+    validate = stats["GET /voting/validate/{token}"]
+    assert validate["requests"] == 2
+    assert validate["queries"] == 3
+    assert validate["max_queries"] == 2
+    assert validate["slowest_statement"].startswith("SELECT")
@@ -0,0 +1,80 @@
+import numpy as np
+from datetime import datetime, timedelta
+
+from models import User, UserRole, Election, ElectionStatus, VoteType, Candidate, VotingQueue, QueueStatus
+from routers.auth import get_admin_user
+from services.tally_service import encode_choices
+from services.ranked_service import BLANK, build_ballot_matrix, count_irv, count_stv
+
+
+def test_build_ballot_matrix_pads_and_maps_positions():
+    ballots = [encode_choices([2, 0]), encode_choices([5]), encode_choices([0, 5, 2])]
+    # Position 5 belongs to a removed candidate
+    matrix = build_ballot_matrix(ballots, [0, 2])
+    assert matrix.tolist() == [[1, 0, BLANK], [BLANK, BLANK, BLANK], [0, BLANK, 1]]
+
+
+def test_irv_transfers_eliminated_preferences():
+    # A: 4 first prefs, B: 3, C: 2 (C voters prefer B next)
+    rows = [[0, 1]] * 4 + [[1, 0]] * 3 + [[2, 1]] * 2
+    matrix = np.array(rows, dtype=np.int32)
+    result = count_irv(matrix, 3)
+    assert result["winners"] == [1]
+    assert result["rounds"][0]["eliminated"] == 2
+    assert result["rounds"][1]["counts"] == [4.0, 5.0, 0.0]
+    assert result["exhausted"] == 0
+
+
+def test_irv_counts_exhausted_ballots():
+    matrix = np.array([[0, BLANK]] * 3 + [[1, BLANK]] * 2 + [[2, BLANK]] * 2, dtype=np.int32)
+    result = count_irv(matrix, 3)
+    assert result["winners"] == [0]
+    assert result["exhausted"] == 2
+
+
+def test_stv_elects_with_surplus_transfer():
+    # 9 ballots, 2 seats -> Droop quota 4; A's surplus of 2 flows to C
+    rows = [[0, 2]] * 6 + [[1]] * 2 + [[2]] * 1
+    matrix = build_ballot_matrix([encode_choices(r) for r in rows], [0, 1, 2])
+    result = count_stv(matrix, 3, seats=2)
+    assert result["winners"] == [0, 2]
+
+
+def test_ranked_ballot_endpoint(client, db_session):
+    from main import app
+    app.dependency_overrides[get_admin_user] = lambda: User(id="admin_id", role=UserRole.ADMIN, name="Admin")
+
+    election = Election(
+        title="Officer Election",
+        status=ElectionStatus.ACTIVE,
+        vote_type=VoteType.RANKED,
+        start_date=datetime.utcnow(),
+        end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db_session.add(election)
+    db_session.flush()
+    a = Candidate(election_id=election.id, name="A", role="Officer", position=0)
+    b = Candidate(election_id=election.id, name="B", role="Officer", position=1)
+    db_session.add_all([a, b])
+    user = User(student_id="s1", email="s1@test.com", password_hash="hash", name="S1", role=UserRole.STUDENT)
+    db_session.add(user)
+    db_session.flush()
+    db_session.add(VotingQueue(election_id=election.id, user_id=user.id, status=QueueStatus.NOTIFIED, voting_token="tok"))
+    db_session.commit()
+
+    # Plurality casting is rejected for ranked elections
+    response = client.post("/voting/cast/tok", json={"election_id": str(election.id), "candidate_id": str(a.id)})
+    assert response.status_code == 400
+
+    response = client.post("/voting/ballot/tok", json={
+        "election_id": str(election.id),
+        "candidate_ids": [str(b.id), str(a.id)],
+    })
+    assert response.status_code == 200
+    assert response.json()["candidate_ids"] == [str(b.id), str(a.id)]
+
+    response = client.get(f"/elections/{election.id}/ranked-results")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["winners"] == [str(b.id)]
+    assert data["total_ballots"] == 1
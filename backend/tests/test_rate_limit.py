@@ -0,0 +1,77 @@
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from services.rate_limit import MemoryBackend, parse_limit
+
+
+def test_parse_limit():
+    assert parse_limit("10/minute") == (10, 60.0)
+    assert parse_limit("5 / seconds") == (5, 1.0)
+    with pytest.raises(ValueError):
+        parse_limit("ten/minute")
+
+
+def test_token_bucket_refills_and_evicts():
+    backend = MemoryBackend(max_keys=2)
+    assert backend.take("a", 2, 60, now=0) == 0
+    assert backend.take("a", 2, 60, now=0) == 0
+    assert backend.take("a", 2, 60, now=0) == pytest.approx(30)
+    # One token back after half the period
+    assert backend.take("a", 2, 60, now=30) == 0
+    assert backend.take("a", 2, 60, now=30) > 0
+
+    backend.take("b", 2, 60, now=30)
+    backend.take("c", 2, 60, now=30)
+    assert len(backend) == 2
+    # "a" was least recently used, so it starts over with a full bucket
+    assert backend.take("a", 2, 60, now=30) == 0
+
+
+def test_login_limited_per_student(client):
+    with patch.object(settings, "RATE_LIMIT_LOGIN_PER_STUDENT", "2/minute"):
+        for _ in range(2):
+            assert client.post("/auth/login", json={"student_id": "S1", "password": "x"}).status_code == 401
+        response = client.post("/auth/login", json={"student_id": "s1", "password": "x"})
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) == 30
+        # Other accounts are unaffected
+        assert client.post("/auth/login", json={"student_id": "S2", "password": "x"}).status_code == 401
+
+
+def test_login_limited_per_ip(client):
+    from main import app
+
+    with patch.object(settings, "RATE_LIMIT_LOGIN_PER_IP", "3/minute"):
+        for i in range(3):
+            assert client.post("/auth/login", json={"student_id": f"S{i}", "password": "x"}).status_code == 401
+        assert client.post("/auth/login", json={"student_id": "S9", "password": "x"}).status_code == 429
+        other = TestClient(app, client=("10.0.0.2", 50000))
+        assert other.post("/auth/login", json={"student_id": "S9", "password": "x"}).status_code == 401
+
+
+def test_rejected_token_requests_skip_the_database(client, query_budget):
+    with patch.object(settings, "RATE_LIMIT_VALIDATE_PER_TOKEN", "1/minute"), \
+         patch.object(settings, "RATE_LIMIT_CAST_PER_TOKEN", "1/minute"):
+        assert client.get("/voting/validate/flood-token").status_code == 404
+        response = client.get("/voting/validate/flood-token")
+        assert response.status_code == 429
+        query_budget(response, 0)
+
+        vote = {"election_id": "00000000-0000-0000-0000-000000000000",
+                "candidate_id": "00000000-0000-0000-0000-000000000000"}
+        assert client.post("/voting/cast/flood-token", json=vote).status_code == 404
+        response = client.post("/voting/cast/flood-token", json=vote)
+        assert response.status_code == 429
+        query_budget(response, 0)
+        # Ballots draw on the same per-token bucket as single votes
+        assert client.post("/voting/ballot/flood-token", json={"election_id": vote["election_id"]}).status_code == 429
+
+
+def test_limits_can_be_disabled(client):
+    with patch.object(settings, "RATE_LIMIT_VALIDATE_PER_TOKEN", "1/minute"), \
+         patch.object(settings, "RATE_LIMIT_ENABLED", False):
+        for _ in range(3):
+            assert client.get("/voting/validate/any-token").status_code == 404
@@ -0,0 +1,94 @@
+import asyncio
+import time
+from unittest.mock import patch
+
+import pytest
+
+from main import app
+from models import User, UserRole
+from routers.auth import get_admin_user
+from routers.dashboard import get_dashboard_stats
+from services.route_cache import RouteCache
+
+
+@pytest.fixture
+def admin():
+    app.dependency_overrides[get_admin_user] = lambda: User(role=UserRole.ADMIN)
+
+
+def _add_student(db_session, n):
+    db_session.add(User(student_id=f"S{n}", email=f"s{n}@test.com", password_hash="hash", name=f"S{n}"))
+    db_session.commit()
+
+
+def test_fresh_responses_served_from_cache(client, db_session, admin, query_budget):
+    _add_student(db_session, 1)
+    first = client.get("/dashboard/stats")
+    assert first.headers["x-cache"] == "miss"
+    assert first.headers["age"] == "0"
+    assert first.json()["total_students"] == 1
+
+    _add_student(db_session, 2)
+    second = client.get("/dashboard/stats")
+    assert second.headers["x-cache"] == "hit"
+    assert second.content == first.content
+    query_budget(second, 0)
+
+
+def test_stale_response_served_while_one_refresh_runs(client, db_session, admin):
+    _add_student(db_session, 1)
+    client.get("/dashboard/stats")
+    _add_student(db_session, 2)
+
+    with patch.object(get_dashboard_stats.cache, "ttl", 0):
+        stale = client.get("/dashboard/stats")
+        assert stale.headers["x-cache"] == "stale"
+        assert stale.json()["total_students"] == 1
+
+        # The background refresh replaces the body
+        deadline = time.monotonic() + 2
+        while client.get("/dashboard/stats").json()["total_students"] != 2:
+            assert time.monotonic() < deadline, "background refresh never landed"
+            time.sleep(0.01)
+
+    with patch.object(get_dashboard_stats.cache, "ttl", 0), patch.object(get_dashboard_stats.cache, "stale", 0):
+        assert client.get("/dashboard/stats").headers["x-cache"] == "miss"
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = RouteCache("test", ttl=60, stale=60)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"value": len(calls)}
+
+    async def run():
+        results = await asyncio.gather(*(cache.get("key", compute, compute) for _ in range(20)))
+        assert len(calls) == 1
+        assert {body for body, _, _ in results} == {b'{"value":1}'}
+        assert [result for _, _, result in results] == ["miss"] * 20
+        assert (await cache.get("key", compute, compute))[2] == "hit"
+
+    asyncio.run(run())
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = RouteCache("test", ttl=60, stale=60)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("database went away")
+
+    async def run():
+        results = await asyncio.gather(*(cache.get("key", failing, failing) for _ in range(5)), return_exceptions=True)
+        assert len(calls) == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        with pytest.raises(RuntimeError):
+            await cache.get("key", failing, failing)
+        assert len(calls) == 2
+
+    asyncio.run(run())
@@ -0,0 +1,60 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from database import create_db_engine
+from migrate import run_migrations
+from models import Candidate, Club, ClubMember, QueueStatus, User, Vote, VotingQueue
+from seed_load import generate
+
+ANCHOR = datetime(2026, 1, 15)
+
+
+def _load(tmp_path, name, seed):
+    engine = create_db_engine(f"sqlite:///{tmp_path / name}")
+    run_migrations(engine)
+    counts = generate(engine, students=600, elections=8, clubs=6, seed=seed, anchor=ANCHOR)
+    return engine, counts
+
+
+def _snapshot(engine):
+    with engine.connect() as conn:
+        return (
+            conn.execute(select(User.id, User.student_id).order_by(User.student_id)).all(),
+            conn.execute(select(Vote.user_id, Vote.candidate_id, Vote.voted_at).order_by(Vote.id)).all(),
+            conn.execute(select(ClubMember.user_id).order_by(ClubMember.id)).all(),
+        )
+
+
+def test_generates_consistent_data(tmp_path):
+    engine, counts = _load(tmp_path, "load.db", seed=7)
+    with engine.connect() as conn:
+        assert conn.execute(select(func.count(User.id))).scalar() == 600 == counts["users"]
+        assert conn.execute(select(func.count(Vote.id))).scalar() == counts["votes"] > 0
+
+        # Candidate vote counters match the votes table
+        tallies = dict(conn.execute(select(Vote.candidate_id, func.count(Vote.id)).group_by(Vote.candidate_id)).all())
+        for candidate_id, vote_count in conn.execute(select(Candidate.id, Candidate.vote_count)).all():
+            assert vote_count == tallies.get(candidate_id, 0)
+
+        # Every vote has a matching VOTED queue entry
+        voted = conn.execute(
+            select(func.count(VotingQueue.id)).where(VotingQueue.status == QueueStatus.VOTED)
+        ).scalar()
+        assert voted == counts["votes"]
+
+        # Denormalized member counts are set correctly
+        members = dict(conn.execute(select(ClubMember.club_id, func.count(ClubMember.id)).group_by(ClubMember.club_id)).all())
+        for club_id, member_count in conn.execute(select(Club.id, Club.member_count)).all():
+            assert member_count == members[club_id]
+    engine.dispose()
+
+
+def test_same_seed_reproduces_data(tmp_path):
+    first, _ = _load(tmp_path, "a.db", seed=3)
+    second, _ = _load(tmp_path, "b.db", seed=3)
+    other, _ = _load(tmp_path, "c.db", seed=4)
+    assert _snapshot(first) == _snapshot(second)
+    assert _snapshot(first) != _snapshot(other)
+    for engine in (first, second, other):
+        engine.dispose()
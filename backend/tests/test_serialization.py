@@ -0,0 +1,48 @@
+import json
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from models import (
+    Candidate, Department, Election, ElectionStatus, QueueStatus, User, UserRole, VotingQueue,
+)
+from schemas import TokenValidationResponse
+from services.serialization import dumps
+
+
+def test_dumps_matches_fastapi_encoder():
+    payload = {
+        "id": uuid.uuid4(),
+        "at": datetime(2024, 5, 1, 12, 30, 15, 123456),
+        "status": ElectionStatus.ACTIVE,
+        "nested": [{"n": 1, "x": None}],
+    }
+    assert json.loads(dumps(payload)) == jsonable_encoder(payload)
+
+
+def test_validate_matches_response_model(client, db_session):
+    dept = Department(code="CS", name="Computer Science", total_students=5)
+    db_session.add(dept)
+    db_session.commit()
+    user = User(student_id="V1", email="v1@test.com", password_hash="hash", name="V1",
+                role=UserRole.STUDENT, department_id=dept.id)
+    election = Election(
+        title="Validate", department_id=dept.id, status=ElectionStatus.ACTIVE,
+        start_date=datetime.utcnow(), end_date=datetime.utcnow() + timedelta(days=1),
+    )
+    db_session.add_all([user, election])
+    db_session.commit()
+    db_session.add_all([
+        Candidate(election_id=election.id, name="Ada", role="President", manifesto="Vote Ada", position=0),
+        VotingQueue(election_id=election.id, user_id=user.id, voting_token="parity-token",
+                    status=QueueStatus.NOTIFIED, batch_number=1),
+    ])
+    db_session.commit()
+
+    response = client.get("/voting/validate/parity-token")
+    assert response.status_code == 200
+    db_session.refresh(election)
+    expected = jsonable_encoder(TokenValidationResponse(election=election, valid=True))
+    assert response.json() == expected
+    assert response.json()["election"]["candidates"][0]["manifesto"] == "Vote Ada"
@@ -20,7 +20,7 @@ os.environ["DATABASE_URL"] = TEST_DB_URL
 
 # Import app after setting env var
 from main import app
-from database import Base, get_db
+from database import Base, get_db, get_write_db
 from models import Election, Candidate, User, UserRole, VotingQueue, QueueStatus, Vote
 
 # Setup database
@@ -35,6 +35,7 @@ def override_get_db():
         db.close()
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_write_db] = override_get_db
 
 client = TestClient(app)
 
@@ -11,7 +11,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from main import app
-from database import get_db, Base
+from database import get_db, Base, get_write_db
 from models import (
     User,
     UserRole,
@@ -40,11 +40,12 @@ def override_get_db():
         db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
-
-
 @pytest.fixture
 def client():
+    # Other modules' fixtures clear dependency_overrides, so install ours per test
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_write_db] = override_get_db
+
     # Reset DB
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
@@ -121,6 +121,8 @@ class ApiClient {
     async castVote(token, electionId, candidateId) {
         return this.request(`/voting/cast/${token}`, {
             method: 'POST',
+            // Same choice, same key: a resubmit after a dropped response returns the original vote
+            headers: { 'Idempotency-Key': `${electionId}:${candidateId}` },
             body: JSON.stringify({
                 election_id: electionId,
                 candidate_id: candidateId,